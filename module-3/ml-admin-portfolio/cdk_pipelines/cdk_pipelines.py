@@ -2,6 +2,7 @@ from aws_cdk import Stack, Stage
 from aws_cdk import aws_codeconnections as codeconnections
 from aws_cdk import pipelines as pipelines
 from common_infra.common_infra_stack import CommonInfraStack
+from common_infra.model_replica_stack import ModelReplicaStack
 from constructs import Construct
 from service_catalog.ml_admin_portfolio import ServiceCatalogMLAdmin
 
@@ -38,6 +39,19 @@ class MLCommonInfra(Stage):
         )
 
 
+class MLModelReplica(Stage):
+    def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        ml_deployment_org_path = self.node.try_get_context("MLDeploymentOrgPath")
+
+        _ = ModelReplicaStack(
+            self,
+            "ModelReplica",
+            ml_deployment_org_path=ml_deployment_org_path,
+        )
+
+
 class CdkPipelineStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -62,6 +76,18 @@ class CdkPipelineStack(Stack):
             ),
         )
 
+        # artifact buckets of the replica regions of the central model registry
+        if replica_regions := self.node.try_get_context("ModelSyncReplicaRegions"):
+            replica_wave = pipeline.add_wave("ModelReplicas")
+            for replica_region in replica_regions:
+                replica_wave.add_stage(
+                    MLModelReplica(
+                        self,
+                        f"ModelReplica-{replica_region}",
+                        env={"account": hub_account, "region": replica_region},
+                    )
+                )
+
         wave = pipeline.add_wave("HubAccount")
         wave.add_stage(
             MLCommonInfra(
@@ -0,0 +1,80 @@
+import aws_cdk as cdk
+from aws_cdk import aws_iam as iam
+from aws_cdk import aws_lambda as lambda_
+from constructs import Construct
+
+# the SageMaker project products reference the function by name
+APPROVED_MODEL_POINTER_FUNCTION_NAME = "mlops-approved-model-pointer"
+
+
+class ApprovedModelPointerConstruct(Construct):
+    """Pointer to the latest approved model package of each SageMaker deploy project.
+
+    The function is the target of the approval rule of the deploy projects
+    launched in the account. It updates the pointer of the project in SSM, then
+    starts its deploy pipeline.
+    """
+
+    def __init__(
+        self, scope: Construct, construct_id: str, role: iam.IRole, **kwargs
+    ) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        # the stack is deployed with a stack set, which cannot publish assets
+        with open("functions/approved_model_pointer/index.py", encoding="utf8") as fp:
+            handler_code = fp.read()
+
+        approved_model_pointer_function = lambda_.Function(
+            self,
+            "ApprovedModelPointerFunction",
+            function_name=APPROVED_MODEL_POINTER_FUNCTION_NAME,
+            description="To keep the latest approved model package of the deploy projects",
+            code=lambda_.Code.from_inline(handler_code),
+            handler="index.lambda_handler",
+            runtime=lambda_.Runtime.PYTHON_3_12,
+            timeout=cdk.Duration.seconds(30),
+            # state changes are applied one at a time, so the pointer never moves back
+            reserved_concurrent_executions=1,
+            role=role,
+        )
+
+        role.add_to_principal_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "ssm:GetParameter",
+                    "ssm:PutParameter",
+                    "ssm:DeleteParameter",
+                ],
+                resources=[
+                    f"arn:{cdk.Aws.PARTITION}:ssm:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:parameter/mlops/*"
+                ],
+            )
+        )
+        role.add_to_principal_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "sagemaker:ListModelPackages",
+                    "sagemaker:DescribeModelPackage",
+                ],
+                resources=[
+                    f"arn:{cdk.Aws.PARTITION}:sagemaker:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:model-package-group/*",
+                    f"arn:{cdk.Aws.PARTITION}:sagemaker:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:model-package/*",
+                ],
+            )
+        )
+        role.add_to_principal_policy(
+            iam.PolicyStatement(
+                actions=["codepipeline:StartPipelineExecution"],
+                resources=[
+                    f"arn:{cdk.Aws.PARTITION}:codepipeline:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:sagemaker-*"
+                ],
+            )
+        )
+
+        # the rules are created by the products, in their own stacks
+        approved_model_pointer_function.add_permission(
+            "ProjectRulesInvoke",
+            principal=iam.ServicePrincipal("events.amazonaws.com"),  # type: ignore
+            source_account=cdk.Aws.ACCOUNT_ID,
+            source_arn=f"arn:{cdk.Aws.PARTITION}:events:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:rule/*",
+        )
@@ -15,8 +15,12 @@ from cdk_stacksets import (
     StackSetTarget,
     StackSetTemplate,
 )
+from common_infra.approved_model_pointer_construct import (
+    ApprovedModelPointerConstruct,
+)
 from common_infra.model_sync_construct import ModelSyncConstruct
 from common_infra.sagemaker_service_catalog_roles_construct import SageMakerSCRoles
+from common_infra.seedcode_checkin_construct import SeedCodeCheckinConstruct
 from constructs import Construct
 
 central_account_id = os.getenv("CDK_DEFAULT_ACCOUNT", cdk.Aws.ACCOUNT_ID)
@@ -84,10 +88,20 @@ class DevSpokeInfra(StackSetStack):
         )
 
         # Roles for Sagemaker Projects
-        _ = SageMakerSCRoles(
+        sagemaker_sc_roles = SageMakerSCRoles(
             self, "SagemakerScRoles", pipeline_bucket_prefix="pipeline"
         )
 
+        # Seed code check-in shared by the Sagemaker Projects of the account
+        SeedCodeCheckinConstruct(
+            self, "SeedCodeCheckin", role=sagemaker_sc_roles.lambda_role
+        )
+
+        # Latest approved model package of the deploy Sagemaker Projects
+        ApprovedModelPointerConstruct(
+            self, "ApprovedModelPointer", role=sagemaker_sc_roles.lambda_role
+        )
+
         ## TODO: Needs to debug the rule pattern
         # powertools_layer = lambda_.LayerVersion.from_layer_version_arn(
         #     self,
@@ -113,7 +127,29 @@ class DevSpokeInfra(StackSetStack):
         #     initial_policy=[
         #         iam.PolicyStatement(actions=["sagemaker:*"], resources=["*"])
         #     ],  # TODO restrict access
-        #     environment={"CENTRAL_ACCOUNT_ID": central_account_id},
+        #     environment={
+        #         "CENTRAL_ACCOUNT_ID": central_account_id,
+        #         "POLICY_CONCURRENCY": "4",
+        #     },
+        # )
+
+        # # buffer the creations of groups, so a burst of project provisioning is
+        # # coalesced and the policy of each group is put once per batch
+        # model_pkg_policy_queue = sqs.Queue(
+        #     self,
+        #     "ModelPackageGroupPolicyQueue",
+        #     encryption=sqs.QueueEncryption.SQS_MANAGED,
+        #     enforce_ssl=True,
+        #     visibility_timeout=cdk.Duration.minutes(6),
+        # )
+        # model_pkg_policy_fn.add_event_source(
+        #     lambda_event_sources.SqsEventSource(
+        #         model_pkg_policy_queue,
+        #         batch_size=100,
+        #         max_batching_window=cdk.Duration.seconds(20),
+        #         report_batch_item_failures=True,
+        #         max_concurrency=2,
+        #     )
         # )
 
         # events.Rule(
@@ -128,9 +164,12 @@ class DevSpokeInfra(StackSetStack):
         #             "eventName": ["CreateModelPackageGroup"],
         #         },
         #     ),
-        #     targets=[targets.LambdaFunction(model_pkg_policy_fn)],  # type: ignore
+        #     targets=[targets.SqsQueue(model_pkg_policy_queue)],  # type: ignore
         # )
 
+        # # invoke the function with {"action": "reconcile"} to re-apply the policy
+        # # of every existing group in one pass
+
 
 # TODO: class DeploySpokeInfra(StackSetStack):
 # role assumed by CodePipeline in central account for CFN deployment
@@ -180,6 +219,19 @@ class CommonInfraStack(cdk.Stack):
             ml_org_id=ml_workloads_ou_id,
             ml_deployment_org_path=ml_deployment_org_path,
             ml_central_event_bus=ml_central_event_bus,
+            buffer_events=str(
+                self.node.try_get_context("ModelSyncBufferEvents")
+            ).lower()
+            == "true",
+            replication_mode=self.node.try_get_context("ModelSyncReplicationMode")
+            or "eager",
+            bundle_dependencies=str(
+                self.node.try_get_context("ModelSyncBundleDependencies")
+            ).lower()
+            == "true",
+            artifact_key_layout=self.node.try_get_context("ModelSyncArtifactKeyLayout")
+            or "prefixed",
+            replica_regions=self.node.try_get_context("ModelSyncReplicaRegions"),
         )
 
         # Create stacksets
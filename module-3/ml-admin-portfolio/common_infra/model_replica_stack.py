@@ -0,0 +1,17 @@
+import aws_cdk as cdk
+from common_infra.model_sync_construct import artifacts_bucket
+from constructs import Construct
+
+
+class ModelReplicaStack(cdk.Stack):
+    def __init__(
+        self, scope: Construct, construct_id: str, ml_deployment_org_path: str, **kwargs
+    ) -> None:
+        """Artifact bucket of a replica region of the central model registry.
+
+        The sync function of the central region copies the artifacts of the synced
+        model packages to this bucket, and registers the regional model packages.
+        """
+        super().__init__(scope, construct_id, **kwargs)
+
+        artifacts_bucket(self, ml_deployment_org_path)
@@ -1,12 +1,93 @@
+import json
+from typing import List, Optional
+
 import aws_cdk as cdk
+from aws_cdk import aws_cloudwatch as cloudwatch
+from aws_cdk import aws_dynamodb as dynamodb
 from aws_cdk import aws_events as events
 from aws_cdk import aws_events_targets as targets
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as lambda_
+from aws_cdk import aws_lambda_event_sources as lambda_event_sources
 from aws_cdk import aws_s3 as s3
+from aws_cdk import aws_sqs as sqs
 from aws_cdk import aws_ssm as ssm
 from constructs import Construct
 
+METRICS_NAMESPACE = "MLOps/ModelSync"
+METRICS_SERVICE = "model-sync"
+# the ARN of each replica is recorded in the 50 metadata properties of a package
+MAX_REPLICA_REGIONS = 5
+
+
+def artifacts_bucket(scope: Construct, ml_deployment_org_path: str) -> s3.Bucket:
+    """Bucket of the artifacts of the model registry of a region.
+
+    The deployment accounts can read the artifacts, to create endpoints from the
+    model packages referencing them.
+    """
+
+    bucket = s3.Bucket(
+        scope,
+        "ArtifactsBucket",
+        encryption=s3.BucketEncryption.KMS,
+        block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+        enforce_ssl=True,
+        bucket_name=artifacts_bucket_name(cdk.Aws.REGION),
+        cors=[
+            s3.CorsRule(
+                allowed_methods=[s3.HttpMethods.GET],
+                allowed_headers=["*"],
+                allowed_origins=["*"],
+                exposed_headers=[],
+            )
+        ],
+    )
+
+    # Policy for access from workload OU
+    bucket.add_to_resource_policy(
+        iam.PolicyStatement(
+            actions=[
+                "s3:Get*",
+            ],
+            resources=[
+                bucket.arn_for_objects("*"),
+            ],
+            principals=[iam.AnyPrincipal()],
+            conditions={
+                "ForAnyValue:StringLike": {
+                    "aws:PrincipalOrgPaths": [ml_deployment_org_path]
+                },
+            },
+        )
+    )
+    if (key := bucket.encryption_key) is not None:
+        key.add_to_resource_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "kms:Encrypt",
+                    "kms:Decrypt",
+                    "kms:ReEncrypt*",
+                    "kms:GenerateDataKey*",
+                    "kms:DescribeKey",
+                ],
+                resources=[
+                    "*",
+                ],
+                principals=[iam.AnyPrincipal()],
+                conditions={
+                    "ForAnyValue:StringLike": {
+                        "aws:PrincipalOrgPaths": [ml_deployment_org_path]
+                    },
+                },
+            )
+        )
+    return bucket
+
+
+def artifacts_bucket_name(region: str) -> str:
+    return f"mlops-model-artifacts-{cdk.Aws.ACCOUNT_ID}-{region}"
+
 
 class ModelSyncConstruct(Construct):
     def __init__(
@@ -16,27 +97,60 @@ class ModelSyncConstruct(Construct):
         ml_central_event_bus: events.EventBus,
         ml_org_id: str,
         ml_deployment_org_path: str,
+        buffer_events: bool = False,
+        max_concurrency: int = 5,
+        batch_size: int = 10,
+        replication_mode: str = "eager",
+        bundle_dependencies: bool = False,
+        artifact_key_layout: str = "prefixed",
+        replica_regions: Optional[List[str]] = None,
         **kwargs,
     ) -> None:
+        """Central model registry sync.
+
+        Args:
+            buffer_events (bool): Buffer the approval events in an SQS queue instead of
+                invoking the sync function for each event, so bursts of approvals are
+                processed in batches with a capped concurrency.
+            max_concurrency (int): The maximum number of concurrent sync functions
+                polling the queue, at least 2. Only used when events are buffered.
+            batch_size (int): The maximum number of events per invocation. Only used
+                when events are buffered.
+            replication_mode (str): When the artifacts of a synced model package are
+                copied. `eager` copies them before the package is registered,
+                `background` registers the package first and copies them right
+                after, `on-demand` copies them when the package is approved in the
+                central registry.
+            bundle_dependencies (bool): Bundle the dependencies listed in the
+                requirements.txt of the function with its code instead of using the
+                Powertools layer. Requires Docker to synthesize.
+            artifact_key_layout (str): The layout of the keys of the copied artifacts.
+                `prefixed` copies them under the name of their model package group,
+                `hashed` prepends a shard derived from the key, to spread the
+                requests for a model package group across S3 partitions. Only
+                applies to artifacts copied after a change.
+            replica_regions (List[str], optional): The regions to replicate the
+                synced model packages and their artifacts to, each with the artifact
+                bucket of a `ModelReplicaStack`. Requires the eager replication mode.
+        """
         super().__init__(scope, id, **kwargs)
 
+        if replication_mode not in ("eager", "background", "on-demand"):
+            raise ValueError(f"Unknown replication mode {replication_mode}")
+        if artifact_key_layout not in ("prefixed", "hashed"):
+            raise ValueError(f"Unknown artifact key layout {artifact_key_layout}")
+        replica_regions = replica_regions or []
+        if replica_regions and replication_mode != "eager":
+            raise ValueError("Replica regions require the eager replication mode")
+        if len(replica_regions) > MAX_REPLICA_REGIONS:
+            raise ValueError(f"At most {MAX_REPLICA_REGIONS} replica regions")
+
         # Bucket for all model artifacts in the central model registry
-        model_artifacts_bucket = s3.Bucket(
-            self,
-            "ArtifactsBucket",
-            encryption=s3.BucketEncryption.KMS,
-            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
-            enforce_ssl=True,
-            bucket_name=f"mlops-model-artifacts-{cdk.Aws.ACCOUNT_ID}-{cdk.Aws.REGION}",
-            cors=[
-                s3.CorsRule(
-                    allowed_methods=[s3.HttpMethods.GET],
-                    allowed_headers=["*"],
-                    allowed_origins=["*"],
-                    exposed_headers=[],
-                )
-            ],
-        )
+        model_artifacts_bucket = artifacts_bucket(self, ml_deployment_org_path)
+
+        assert (
+            model_artifacts_bucket.encryption_key is not None
+        )  # resolve ambiguity in encryption key type
 
         sagemaker_domain_execution_role = iam.Role.from_role_arn(
             self,
@@ -49,24 +163,88 @@ class ModelSyncConstruct(Construct):
         )
         model_artifacts_bucket.grant_read_write(sagemaker_domain_execution_role)
 
-        ## lambda function to sync models from dev accounts to ML central account
-        powertools_layer = lambda_.LayerVersion.from_layer_version_arn(
+        # Index of the model packages already synced, maintained by the sync function
+        sync_index_table = dynamodb.Table(
+            self,
+            "SyncIndexTable",
+            partition_key=dynamodb.Attribute(
+                name="SourceModelPackageArn", type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            encryption=dynamodb.TableEncryption.AWS_MANAGED,
+            point_in_time_recovery=True,
+        )
+
+        # Outcome of each approval event, so repeated deliveries are not synced again
+        idempotency_table = dynamodb.Table(
             self,
-            id="lambda-powertools",
-            layer_version_arn=f"arn:aws:lambda:{cdk.Aws.REGION}:017000801446:layer:AWSLambdaPowertoolsPythonV2-Arm64:59",
+            "IdempotencyTable",
+            partition_key=dynamodb.Attribute(
+                name="id", type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            encryption=dynamodb.TableEncryption.AWS_MANAGED,
+            time_to_live_attribute="expiration",
         )
 
+        ## lambda function to sync models from dev accounts to ML central account
+        if bundle_dependencies:
+            # only the dependencies the function needs, boto3 comes with the runtime
+            sync_function_code = lambda_.Code.from_asset(
+                "functions/model_sync",
+                bundling=cdk.BundlingOptions(
+                    image=lambda_.Runtime.PYTHON_3_12.bundling_image,
+                    platform="linux/arm64",
+                    command=[
+                        "bash",
+                        "-c",
+                        "pip install --no-cache-dir -r requirements.txt -t /asset-output && cp -au . /asset-output",
+                    ],
+                ),
+            )
+            sync_function_layers = []
+        else:
+            sync_function_code = lambda_.Code.from_asset("functions/model_sync")
+            sync_function_layers = [
+                lambda_.LayerVersion.from_layer_version_arn(
+                    self,
+                    id="lambda-powertools",
+                    layer_version_arn=f"arn:aws:lambda:{cdk.Aws.REGION}:017000801446:layer:AWSLambdaPowertoolsPythonV2-Arm64:59",
+                )
+            ]
+
+        sync_function_environment = {
+            "ArtifactBucketName": model_artifacts_bucket.bucket_name,
+            "ArtifactBucketKmsKeyArn": model_artifacts_bucket.encryption_key.key_arn,
+            "CopyConcurrency": "8",
+            "MultipartThresholdMB": "256",
+            "MultipartPartSizeMB": "128",
+            "MultipartConcurrency": "10",
+            "SageMakerCallsPerSecond": "10",
+            "SyncIndexTableName": sync_index_table.table_name,
+            "IdempotencyTableName": idempotency_table.table_name,
+            "ContentDeduplication": "true",
+            "POWERTOOLS_METRICS_NAMESPACE": METRICS_NAMESPACE,
+            "POWERTOOLS_SERVICE_NAME": METRICS_SERVICE,
+            "ReplicationMode": replication_mode,
+            "ArtifactKeyLayout": artifact_key_layout,
+            "ReplicaBuckets": json.dumps(
+                {region: artifacts_bucket_name(region) for region in replica_regions}
+            ),
+        }
+
         sync_model_function = lambda_.Function(
             self,
             id="SyncModelFunction",
-            code=lambda_.Code.from_asset("functions/model_sync"),
+            code=sync_function_code,
             handler="index.lambda_handler",
             runtime=lambda_.Runtime.PYTHON_3_12,
             architecture=lambda_.Architecture.ARM_64,
-            layers=[powertools_layer],
-            environment={
-                "ArtifactBucketName": model_artifacts_bucket.bucket_name,
-            },
+            layers=sync_function_layers,
+            # multi-GB artifacts are copied in parts, allow for the largest models
+            timeout=cdk.Duration.minutes(15),
+            memory_size=1024,
+            environment=sync_function_environment,
             initial_policy=[
                 iam.PolicyStatement(
                     actions=[
@@ -114,44 +292,194 @@ class ModelSyncConstruct(Construct):
         )
 
         model_artifacts_bucket.grant_read_write(sync_model_function)
+        if replica_regions:
+            sync_model_function.add_to_role_policy(
+                iam.PolicyStatement(
+                    actions=[
+                        "sagemaker:CreateModelPackage",
+                        "sagemaker:CreateModelPackageGroup",
+                        "sagemaker:DescribeModelPackageGroup",
+                        "sagemaker:PutModelPackageGroupPolicy",
+                    ],
+                    resources=[
+                        f"arn:aws:sagemaker:{region}:{cdk.Aws.ACCOUNT_ID}:{resource}/*"
+                        for region in replica_regions
+                        for resource in ("model-package", "model-package-group")
+                    ],
+                )
+            )
+            sync_model_function.add_to_role_policy(
+                iam.PolicyStatement(
+                    actions=[
+                        "sagemaker:GetModelPackageGroupPolicy",
+                    ],
+                    resources=[
+                        f"arn:aws:sagemaker:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:model-package-group/*",
+                    ],
+                )
+            )
+            # the images of the regional model packages are checked in each region
+            sync_model_function.add_to_role_policy(
+                iam.PolicyStatement(
+                    actions=["ecr:DescribeImages"],
+                    resources=[
+                        f"arn:aws:ecr:{region}:*:repository/*"
+                        for region in replica_regions
+                    ],
+                )
+            )
+            sync_model_function.add_to_role_policy(
+                iam.PolicyStatement(
+                    actions=[
+                        "s3:AbortMultipartUpload",
+                        "s3:GetObject*",
+                        "s3:PutObject*",
+                    ],
+                    resources=[
+                        f"arn:aws:s3:::{artifacts_bucket_name(region)}/*"
+                        for region in replica_regions
+                    ],
+                )
+            )
+        sync_index_table.grant_read_write_data(sync_model_function)
+        idempotency_table.grant_read_write_data(sync_model_function)
 
-        # Policy for access from workload OU
-        model_artifacts_bucket_policy = iam.PolicyStatement(
-            actions=[
-                "s3:Get*",
-            ],
-            resources=[
-                model_artifacts_bucket.arn_for_objects("*"),
-            ],
-            principals=[iam.AnyPrincipal()],
-            conditions={
-                "ForAnyValue:StringLike": {
-                    "aws:PrincipalOrgPaths": [ml_deployment_org_path]
-                },
-            },
-        )
-        model_artifacts_bucket.add_to_resource_policy(model_artifacts_bucket_policy)
-        if (key := model_artifacts_bucket.encryption_key) is not None:
-            key.add_to_resource_policy(
+        # Dry run of the sync, to size the sync function before onboarding an account
+        plan_sync_function = lambda_.Function(
+            self,
+            id="PlanSyncFunction",
+            code=sync_function_code,
+            handler="planner.plan_handler",
+            runtime=lambda_.Runtime.PYTHON_3_12,
+            architecture=lambda_.Architecture.ARM_64,
+            layers=sync_function_layers,
+            timeout=cdk.Duration.minutes(15),
+            memory_size=512,
+            environment=sync_function_environment,
+            initial_policy=[
                 iam.PolicyStatement(
                     actions=[
-                        "kms:Encrypt",
-                        "kms:Decrypt",
-                        "kms:ReEncrypt*",
-                        "kms:GenerateDataKey*",
-                        "kms:DescribeKey",
+                        "sagemaker:DescribeModelPackage",
+                        "sagemaker:DescribeModelPackageGroup",
+                        "sagemaker:ListModelPackages",
                     ],
                     resources=[
-                        "*",
+                        f"arn:aws:sagemaker:{cdk.Aws.REGION}:*:model-package/*",
+                        f"arn:aws:sagemaker:{cdk.Aws.REGION}:*:model-package-group/*",
                     ],
-                    principals=[iam.AnyPrincipal()],
-                    conditions={
-                        "ForAnyValue:StringLike": {
-                            "aws:PrincipalOrgPaths": [ml_deployment_org_path]
+                ),
+                iam.PolicyStatement(
+                    actions=[
+                        "kms:Decrypt",
+                        "kms:DescribeKey",
+                        "s3:GetBucket*",
+                        "s3:GetObject*",
+                        "s3:List*",
+                    ],
+                    resources=["*"],
+                ),
+            ],
+        )
+
+        # read only, so planning never changes the central registry
+        model_artifacts_bucket.grant_read(plan_sync_function)
+        sync_index_table.grant_read_data(plan_sync_function)
+
+        # Events that could not be synced after retries
+        sync_dead_letter_queue = sqs.Queue(
+            self,
+            "SyncDeadLetterQueue",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+            retention_period=cdk.Duration.days(14),
+        )
+
+        if buffer_events:
+            sync_queue = sqs.Queue(
+                self,
+                "SyncQueue",
+                encryption=sqs.QueueEncryption.SQS_MANAGED,
+                enforce_ssl=True,
+                # AWS recommends at least 6 times the function timeout
+                visibility_timeout=cdk.Duration.minutes(90),
+                dead_letter_queue=sqs.DeadLetterQueue(
+                    max_receive_count=3, queue=sync_dead_letter_queue
+                ),
+            )
+            sync_model_function.add_event_source(
+                lambda_event_sources.SqsEventSource(
+                    sync_queue,
+                    batch_size=batch_size,
+                    max_batching_window=cdk.Duration.seconds(30),
+                    report_batch_item_failures=True,
+                    max_concurrency=max_concurrency,
+                )
+            )
+            sync_target = targets.SqsQueue(sync_queue)
+        else:
+            sync_target = targets.LambdaFunction(
+                handler=sync_model_function,  # type: ignore
+                dead_letter_queue=sync_dead_letter_queue,
+                retry_attempts=2,
+            )
+
+        if replication_mode != "eager":
+            # Central model packages whose artifacts are to be replicated
+            replication_queue = sqs.Queue(
+                self,
+                "ReplicationQueue",
+                encryption=sqs.QueueEncryption.SQS_MANAGED,
+                enforce_ssl=True,
+                visibility_timeout=cdk.Duration.minutes(90),
+                dead_letter_queue=sqs.DeadLetterQueue(
+                    max_receive_count=3, queue=sync_dead_letter_queue
+                ),
+            )
+            replication_queue.grant_send_messages(sync_model_function)
+            sync_model_function.add_environment(
+                "ReplicationQueueUrl", replication_queue.queue_url
+            )
+
+            replicate_artifacts_function = lambda_.Function(
+                self,
+                id="ReplicateArtifactsFunction",
+                code=sync_function_code,
+                handler="index.replication_handler",
+                runtime=lambda_.Runtime.PYTHON_3_12,
+                architecture=lambda_.Architecture.ARM_64,
+                layers=sync_function_layers,
+                timeout=cdk.Duration.minutes(15),
+                memory_size=1024,
+                environment=sync_function_environment,
+                role=sync_model_function.role,
+            )
+            replicate_artifacts_function.add_event_source(
+                lambda_event_sources.SqsEventSource(
+                    replication_queue,
+                    batch_size=1,
+                    report_batch_item_failures=True,
+                    max_concurrency=max_concurrency,
+                )
+            )
+
+            if replication_mode == "on-demand":
+                # Approval of a central model package for deployment
+                events.Rule(  # noqa: F841
+                    self,
+                    "ReplicationEventBridgeRule",
+                    description="Replicate the artifacts of a central model package when it is approved",
+                    event_pattern={
+                        "source": ["aws.sagemaker"],
+                        "detail_type": ["SageMaker Model Package State Change"],
+                        "detail": {
+                            "ModelApprovalStatus": ["Approved"],
+                            "CustomerMetadataProperties": {
+                                "ArtifactStatus": ["Pending"],
+                            },
                         },
                     },
+                    targets=[targets.SqsQueue(replication_queue)],
                 )
-            )
 
         # Rule to trigger the copy model Lambda Function
         events.Rule(  # noqa: F841
@@ -166,12 +494,85 @@ class ModelSyncConstruct(Construct):
                     "ModelApprovalStatus": ["Approved"],
                 },
             },
-            targets=[
-                targets.LambdaFunction(
-                    handler=sync_model_function,  # type: ignore
-                    # dead_letter_queue_enabled=True,
-                    retry_attempts=2,
-                )
-            ],
+            targets=[sync_target],
             event_bus=ml_central_event_bus,
         )
+
+        # Dashboard of the metrics emitted by the sync function
+        def sync_metric(metric_name: str, statistic: str = "Sum") -> cloudwatch.Metric:
+            return cloudwatch.Metric(
+                namespace=METRICS_NAMESPACE,
+                metric_name=metric_name,
+                dimensions_map={"service": METRICS_SERVICE},
+                statistic=statistic,
+                period=cdk.Duration.minutes(5),
+            )
+
+        phases = ["Describe", "DedupCheck", "ArtifactCopy", "CreateModelPackage"]
+        dashboard = cloudwatch.Dashboard(
+            self,
+            "SyncDashboard",
+            dashboard_name=f"mlops-model-sync-{cdk.Aws.REGION}",
+        )
+        dashboard.add_widgets(
+            cloudwatch.GraphWidget(
+                title="Sync phase duration (p50)",
+                left=[sync_metric(f"{phase}Time", "p50") for phase in phases],
+                stacked=True,
+                width=12,
+            ),
+            cloudwatch.GraphWidget(
+                title="Sync phase duration (p95)",
+                left=[sync_metric(f"{phase}Time", "p95") for phase in phases]
+                + [sync_metric("SyncTime", "p95")],
+                width=12,
+            ),
+        )
+        dashboard.add_widgets(
+            cloudwatch.GraphWidget(
+                title="Model packages",
+                left=[
+                    sync_metric("PackagesSynced"),
+                    sync_metric("PackagesAlreadySynced"),
+                ],
+                width=6,
+            ),
+            cloudwatch.GraphWidget(
+                title="Artifacts",
+                left=[
+                    sync_metric("ArtifactsCopied"),
+                    sync_metric("ArtifactsDeduplicated"),
+                ],
+                width=6,
+            ),
+            cloudwatch.GraphWidget(
+                title="Bytes",
+                left=[sync_metric("BytesCopied"), sync_metric("BytesDeduplicated")],
+                width=6,
+            ),
+            cloudwatch.GraphWidget(
+                title="AWS API calls",
+                left=[sync_metric("ApiCalls")],
+                right=[sync_metric("ApiRetries"), sync_metric("ApiThrottles")],
+                width=6,
+            ),
+        )
+        dashboard.add_widgets(
+            cloudwatch.GraphWidget(
+                title="Sync function",
+                left=[
+                    sync_model_function.metric_invocations(),
+                    sync_model_function.metric_errors(),
+                    sync_model_function.metric_throttles(),
+                ],
+                right=[sync_model_function.metric_duration(statistic="p95")],
+                width=12,
+            ),
+            cloudwatch.SingleValueWidget(
+                title="Events in the dead-letter queue",
+                metrics=[
+                    sync_dead_letter_queue.metric_approximate_number_of_messages_visible()
+                ],
+                width=12,
+            ),
+        )
@@ -0,0 +1,95 @@
+import aws_cdk as cdk
+from aws_cdk import aws_events as events
+from aws_cdk import aws_events_targets as targets
+from aws_cdk import aws_iam as iam
+from aws_cdk import aws_lambda as lambda_
+from constructs import Construct
+
+# the SageMaker project products reference the function by name
+SEEDCODE_CHECKIN_FUNCTION_NAME = "mlops-seedcode-checkin"
+# suffix of the name of the seed code check-in project of each product
+SEEDCODE_CHECKIN_PROJECT_SUFFIX = "-git-seedcodecheckin"
+
+
+class SeedCodeCheckinConstruct(Construct):
+    """Provider of the seed code check-in custom resource of the SageMaker projects.
+
+    The function is shared by the products launched in the account, instead of
+    a function per project, and responds to each custom resource request when
+    the CodeBuild project checking in the seed code completes.
+    """
+
+    def __init__(
+        self, scope: Construct, construct_id: str, role: iam.IRole, **kwargs
+    ) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        # the stack is deployed with a stack set, which cannot publish assets
+        with open("functions/seedcode_checkin/index.py", encoding="utf8") as fp:
+            handler_code = fp.read()
+
+        seedcode_checkin_function = lambda_.Function(
+            self,
+            "SeedCodeCheckinFunction",
+            function_name=SEEDCODE_CHECKIN_FUNCTION_NAME,
+            description="To trigger the codebuild project for the seedcode checkin",
+            code=lambda_.Code.from_inline(handler_code),
+            handler="index.lambda_handler",
+            runtime=lambda_.Runtime.PYTHON_3_12,
+            # the function only starts the build, see the rule on its state changes
+            timeout=cdk.Duration.seconds(60),
+            role=role,
+        )
+
+        # the pending requests, kept out of the build environment
+        role.add_to_principal_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "ssm:GetParameter",
+                    "ssm:PutParameter",
+                    "ssm:DeleteParameter",
+                ],
+                resources=[
+                    f"arn:{cdk.Aws.PARTITION}:ssm:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:parameter/mlops/seedcode-checkin/*"
+                ],
+            )
+        )
+
+        state_change_rule = events.Rule(
+            self,
+            "SeedCodeCheckinStateChangeRule",
+            description="To respond to the seedcode checkin custom resource when the codebuild completes",
+            event_pattern=events.EventPattern(
+                source=["aws.codebuild"],
+                detail_type=["CodeBuild Build State Change"],
+                detail={
+                    "project-name": [{"suffix": SEEDCODE_CHECKIN_PROJECT_SUFFIX}],
+                    "build-status": [
+                        "SUCCEEDED",
+                        "FAILED",
+                        "FAULT",
+                        "STOPPED",
+                        "TIMED_OUT",
+                    ],
+                },
+            ),
+            # targeted by name, so the function can depend on the rule
+            targets=[
+                targets.LambdaFunction(
+                    lambda_.Function.from_function_attributes(
+                        self,
+                        "SeedCodeCheckinFunctionTarget",
+                        function_arn=f"arn:{cdk.Aws.PARTITION}:lambda:{cdk.Aws.REGION}:{cdk.Aws.ACCOUNT_ID}:function:{SEEDCODE_CHECKIN_FUNCTION_NAME}",
+                        skip_permissions=True,
+                    )
+                )
+            ],  # type: ignore
+        )
+        seedcode_checkin_function.add_permission(
+            "StateChangeRuleInvoke",
+            principal=iam.ServicePrincipal("events.amazonaws.com"),  # type: ignore
+            source_arn=state_change_rule.rule_arn,
+        )
+        # a build started before the rule exists would never complete its request,
+        # so the products cannot invoke the function until the rule is created
+        seedcode_checkin_function.node.add_dependency(state_change_rule)
@@ -0,0 +1,172 @@
+"""Pointer to the latest approved model package of each SageMaker deploy project.
+
+The function is deployed once per account, and is the target of the approval
+rule of every deploy project. The rule passes the name of the project and of its
+deploy pipeline along with the detail of the state change event. The function
+keeps the latest approved model package of the group, with its artifacts,
+metrics, artifact status and regional replicas, in the
+`/mlops/{project}/model/latest_approved` SSM parameter, next to the accounts and
+regions of the project, then starts the deploy pipeline. The deploy stack reads
+the pointer in a single call, however many packages the group has, without
+describing the package, and the stages of a pipeline execution all deploy the
+same version.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import boto3
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+POINTER_NAME = "/mlops/{project_name}/model/latest_approved"
+# metadata properties of the packages synced to the central registry
+ARTIFACT_STATUS_KEY = "ArtifactStatus"
+REPLICA_ARN_PREFIX = "ReplicaArn."
+
+ssm_client = boto3.client("ssm")
+sagemaker_client = boto3.client("sagemaker")
+codepipeline_client = boto3.client("codepipeline")
+
+
+def pointer_name(project_name: str) -> str:
+    return POINTER_NAME.format(project_name=project_name)
+
+
+def artifact_uris(model_package: Dict[str, Any]) -> List[str]:
+    return [
+        container["ModelDataUrl"]
+        for container in model_package.get("InferenceSpecification", {}).get(
+            "Containers", []
+        )
+        if "ModelDataUrl" in container
+    ]
+
+
+def metric_uris(model_package: Dict[str, Any]) -> Dict[str, str]:
+    """S3 URIs of the metrics reports of a model package, keyed on their path."""
+
+    def walk(value: Any, path: str):
+        if isinstance(value, dict):
+            if "S3Uri" in value:
+                yield path, value["S3Uri"]
+            for key, child in value.items():
+                yield from walk(child, f"{path}.{key}" if path else key)
+
+    return dict(walk(model_package.get("ModelMetrics", {}), ""))
+
+
+def replica_arns(model_package: Dict[str, Any]) -> Dict[str, str]:
+    """ARNs of the replicas of a model package, keyed on their region."""
+
+    return {
+        key.removeprefix(REPLICA_ARN_PREFIX): value
+        for key, value in model_package.get("CustomerMetadataProperties", {}).items()
+        if key.startswith(REPLICA_ARN_PREFIX)
+    }
+
+
+def pointer_value(model_package: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = model_package.get("CustomerMetadataProperties", {})
+    return {
+        "ModelPackageArn": model_package["ModelPackageArn"],
+        "ModelPackageVersion": model_package["ModelPackageVersion"],
+        "ArtifactUris": artifact_uris(model_package),
+        "ModelMetrics": metric_uris(model_package),
+        # Pending until the deferred replication of the artifacts completes
+        "ArtifactStatus": metadata.get(ARTIFACT_STATUS_KEY, "Available"),
+        "ReplicaArns": replica_arns(model_package),
+    }
+
+
+def get_pointer(project_name: str) -> Optional[Dict[str, Any]]:
+    try:
+        parameter = ssm_client.get_parameter(Name=pointer_name(project_name))
+    except ssm_client.exceptions.ParameterNotFound:
+        return None
+    return json.loads(parameter["Parameter"]["Value"])
+
+
+def put_pointer(project_name: str, model_package: Optional[Dict[str, Any]]):
+    if model_package is None:
+        try:
+            ssm_client.delete_parameter(Name=pointer_name(project_name))
+        except ssm_client.exceptions.ParameterNotFound:
+            pass
+        logger.info(f"No approved model package left for {project_name}")
+        return
+
+    ssm_client.put_parameter(
+        Name=pointer_name(project_name),
+        Value=json.dumps(pointer_value(model_package)),
+        Type="String",
+        Overwrite=True,
+        # metrics of multi-container packages can exceed a standard parameter
+        Tier="Intelligent-Tiering",
+    )
+    logger.info(
+        f"Latest approved model package of {project_name} is {model_package['ModelPackageArn']}"
+    )
+
+
+def latest_approved_package(model_package_group_name: str) -> Optional[Dict[str, Any]]:
+    response = sagemaker_client.list_model_packages(
+        ModelPackageGroupName=model_package_group_name,
+        ModelApprovalStatus="Approved",
+        SortBy="CreationTime",
+        SortOrder="Descending",
+        MaxResults=1,
+    )
+    if not response["ModelPackageSummaryList"]:
+        return None
+    return sagemaker_client.describe_model_package(
+        ModelPackageName=response["ModelPackageSummaryList"][0]["ModelPackageArn"]
+    )
+
+
+def update_pointer(project_name: str, model_package: Dict[str, Any]) -> bool:
+    """Update the pointer of a project from the state change of a model package.
+
+    Events can be delivered late or out of order, so an approval only moves the
+    pointer forward, to a later version of the group. An update of the approved
+    package the pointer references, such as the end of the replication of its
+    artifacts, refreshes it. A rejection of the package the pointer references
+    moves it back to the latest approved package left.
+
+    Args:
+        project_name (str): The name of the SageMaker project.
+        model_package (Dict[str, Any]): The detail of the state change event, as
+            returned by DescribeModelPackage.
+
+    Returns:
+        bool: Whether the pointer changed.
+    """
+
+    pointer = get_pointer(project_name)
+    if model_package["ModelApprovalStatus"] == "Approved":
+        if pointer is not None and (
+            pointer["ModelPackageVersion"] > model_package["ModelPackageVersion"]
+            or pointer == pointer_value(model_package)
+        ):
+            return False
+        put_pointer(project_name, model_package)
+        return True
+
+    if (
+        pointer is None
+        or pointer["ModelPackageArn"] != model_package["ModelPackageArn"]
+    ):
+        return False
+    put_pointer(
+        project_name, latest_approved_package(model_package["ModelPackageGroupName"])
+    )
+    return True
+
+
+def lambda_handler(event: Dict[str, Any], context: Any):
+    project_name = event["ProjectName"]
+    update_pointer(project_name, event["detail"])
+    # started once the pointer is current, so the pipeline deploys this version
+    codepipeline_client.start_pipeline_execution(name=event["PipelineName"])
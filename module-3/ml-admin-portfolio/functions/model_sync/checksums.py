@@ -0,0 +1,264 @@
+"""Checksum verification of the artifacts copied to the central artifact bucket.
+
+The S3 additional checksum of an object is used when it covers the whole object.
+Otherwise the object is streamed in chunks and hashed with SHA-256, so the
+memory used does not depend on the size of the object.
+
+Copies are written with a SHA-256 checksum computed by S3, see
+`copy_engine.CHECKSUM_ALGORITHM`. Only the source is streamed when it has no
+checksum of the same algorithm. The copy of a multipart copy has a checksum of
+the checksums of its parts, the source is then streamed part by part to compute
+the same composite checksum.
+
+The checksum of each artifact of a synced model package is recorded in its
+`CustomerMetadataProperties`, under a key derived from the S3 URI of the
+artifact, see `metadata_key`.
+"""
+
+import base64
+import hashlib
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from content_index import CHECKSUM_ALGORITHMS
+
+STREAM_CHUNK_SIZE = 8 * 1024**2
+METADATA_PREFIX = "Checksum."
+
+
+class Crc32:
+    """hashlib style wrapper of zlib.crc32."""
+
+    def __init__(self):
+        self.value = 0
+
+    def update(self, data: bytes):
+        self.value = zlib.crc32(data, self.value)
+
+    def digest(self) -> bytes:
+        return self.value.to_bytes(4, "big")
+
+
+# algorithms that can be computed by streaming the object
+STREAMING_ALGORITHMS = {
+    "SHA256": hashlib.sha256,
+    "SHA1": hashlib.sha1,
+    "CRC32": Crc32,
+}
+# algorithms of the composite checksums of multipart objects that can be computed
+COMPOSITE_ALGORITHMS = ("SHA256", "SHA1")
+
+
+class ChecksumMismatchError(Exception):
+    pass
+
+
+def split_s3_uri(s3_uri: str) -> Tuple[str, str]:
+    bucket_name, key = s3_uri.removeprefix("s3://").split("/", 1)
+    return bucket_name, key
+
+
+def full_object_checksum(head: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Get the additional checksum of an object if it covers the whole object.
+
+    Objects uploaded in parts have a checksum of the checksums of their parts,
+    which can not be compared with the checksum of another object.
+
+    Args:
+        head (Dict[str, Any]): The HeadObject response of the object, requested
+            with `ChecksumMode="ENABLED"`.
+
+    Returns:
+        Tuple[str, str] | None: The algorithm and base64 encoded checksum, or None.
+    """
+
+    if head.get("ChecksumType", "FULL_OBJECT") != "FULL_OBJECT":
+        return None
+    for algorithm in CHECKSUM_ALGORITHMS:
+        if (value := head.get(algorithm)) and "-" not in value:
+            return algorithm.removeprefix("Checksum"), value
+    return None
+
+
+def composite_checksum(head: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Get the checksum of the checksums of the parts of a multipart object.
+
+    Args:
+        head (Dict[str, Any]): The HeadObject response of the object, requested
+            with `ChecksumMode="ENABLED"`.
+
+    Returns:
+        Tuple[str, str] | None: The algorithm and checksum, suffixed with the number
+            of parts, or None.
+    """
+
+    for algorithm in COMPOSITE_ALGORITHMS:
+        if (value := head.get(f"Checksum{algorithm}")) and "-" in value:
+            return algorithm, value
+    return None
+
+
+def part_sizes(s3_client: Any, bucket_name: str, key: str) -> List[int]:
+    """Get the size of each part of a multipart object, in order."""
+
+    sizes: List[int] = []
+    part_number_marker = 0
+    while True:
+        parts = s3_client.get_object_attributes(
+            Bucket=bucket_name,
+            Key=key,
+            ObjectAttributes=["ObjectParts"],
+            MaxParts=1000,
+            PartNumberMarker=part_number_marker,
+        )["ObjectParts"]
+        sizes.extend(part["Size"] for part in parts.get("Parts", []))
+        if not parts.get("IsTruncated"):
+            return sizes
+        part_number_marker = parts["NextPartNumberMarker"]
+
+
+def stream_composite_checksum(
+    s3_client: Any,
+    bucket_name: str,
+    key: str,
+    sizes: List[int],
+    algorithm: str = "SHA256",
+) -> str:
+    """Compute the composite checksum an object would have if uploaded in parts.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        bucket_name (str): The name of the bucket.
+        key (str): The key of the object.
+        sizes (List[int]): The size of each part.
+        algorithm (str): One of `COMPOSITE_ALGORITHMS`.
+
+    Returns:
+        str: The base64 encoded checksum, suffixed with the number of parts.
+    """
+
+    body = s3_client.get_object(Bucket=bucket_name, Key=key)["Body"]
+    digests = []
+    for size in sizes:
+        hasher = STREAMING_ALGORITHMS[algorithm]()
+        remaining = size
+        while remaining and (chunk := body.read(min(STREAM_CHUNK_SIZE, remaining))):
+            hasher.update(chunk)
+            remaining -= len(chunk)
+        digests.append(hasher.digest())
+    composite = STREAMING_ALGORITHMS[algorithm]()
+    composite.update(b"".join(digests))
+    return f"{base64.b64encode(composite.digest()).decode()}-{len(sizes)}"
+
+
+def stream_checksum(
+    s3_client: Any, bucket_name: str, key: str, algorithm: str = "SHA256"
+) -> str:
+    """Compute the checksum of an object by streaming it in chunks.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        bucket_name (str): The name of the bucket.
+        key (str): The key of the object.
+        algorithm (str): One of `STREAMING_ALGORITHMS`.
+
+    Returns:
+        str: The base64 encoded checksum, as S3 returns additional checksums.
+    """
+
+    hasher = STREAMING_ALGORITHMS[algorithm]()
+    body = s3_client.get_object(Bucket=bucket_name, Key=key)["Body"]
+    for chunk in body.iter_chunks(STREAM_CHUNK_SIZE):
+        hasher.update(chunk)
+    return base64.b64encode(hasher.digest()).decode()
+
+
+def verify_copy(
+    s3_client: Any, source_uri: str, destination_uri: str
+) -> Tuple[str, str]:
+    """Verify that a copy has the same content as its source.
+
+    The additional checksums of the objects are compared when both have one for
+    the same algorithm. Otherwise the object without a checksum for the algorithm
+    of the other one is streamed, and both are streamed with SHA-256 only when
+    neither has a checksum that can be computed.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        source_uri (str): The S3 URI of the source object.
+        destination_uri (str): The S3 URI of the copy.
+
+    Returns:
+        Tuple[str, str]: The algorithm and base64 encoded checksum of the copy.
+
+    Raises:
+        ChecksumMismatchError: If the content of the copy differs from the source.
+    """
+
+    heads = {}
+    for uri in (source_uri, destination_uri):
+        bucket_name, key = split_s3_uri(uri)
+        heads[uri] = s3_client.head_object(
+            Bucket=bucket_name, Key=key, ChecksumMode="ENABLED"
+        )
+    source_checksum = full_object_checksum(heads[source_uri])
+    destination_checksum = full_object_checksum(heads[destination_uri])
+
+    if (
+        not destination_checksum
+        and (destination_composite := composite_checksum(heads[destination_uri]))
+        and not (source_checksum and source_checksum[0] in STREAMING_ALGORITHMS)
+    ):
+        # multipart copy, stream the source with the part sizes of the copy
+        algorithm, value = destination_composite
+        source_value = stream_composite_checksum(
+            s3_client,
+            *split_s3_uri(source_uri),
+            part_sizes(s3_client, *split_s3_uri(destination_uri)),
+            algorithm,
+        )
+        if source_value != value:
+            raise ChecksumMismatchError(
+                f"{algorithm} checksum of {destination_uri} does not match {source_uri}"
+            )
+        return algorithm, value
+
+    checksums = {source_uri: source_checksum, destination_uri: destination_checksum}
+    if (
+        source_checksum
+        and destination_checksum
+        and source_checksum[0] == destination_checksum[0]
+    ):
+        algorithm = source_checksum[0]
+    elif destination_checksum and destination_checksum[0] in STREAMING_ALGORITHMS:
+        algorithm = destination_checksum[0]
+    elif source_checksum and source_checksum[0] in STREAMING_ALGORITHMS:
+        algorithm = source_checksum[0]
+    else:
+        algorithm = "SHA256"
+
+    values = {
+        uri: (
+            checksum[1]
+            if checksum and checksum[0] == algorithm
+            else stream_checksum(s3_client, *split_s3_uri(uri), algorithm)
+        )
+        for uri, checksum in checksums.items()
+    }
+    if values[source_uri] != values[destination_uri]:
+        raise ChecksumMismatchError(
+            f"{algorithm} checksum of {destination_uri} does not match {source_uri}"
+        )
+    return algorithm, values[destination_uri]
+
+
+def metadata_key(destination_uri: str) -> str:
+    """Key of the checksum of an artifact in the metadata properties of its model package."""
+
+    return (
+        f"{METADATA_PREFIX}{hashlib.sha256(destination_uri.encode()).hexdigest()[:32]}"
+    )
+
+
+def metadata_value(checksum: Tuple[str, str]) -> str:
+    return f"{checksum[0]}:{checksum[1]}"
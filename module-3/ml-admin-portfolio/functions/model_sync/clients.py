@@ -0,0 +1,250 @@
+"""Throttling aware boto3 clients for the sync function.
+
+The clients retry throttled and failed calls with the botocore adaptive retry
+mode, which backs off with jitter and rate limits the client once it sees
+throttling. On top of that:
+
+- calls can be rate limited per API with a token bucket, to stay under the
+  SageMaker API limits shared by all the concurrent sync functions,
+- the number of calls, retries, throttles and the latency of each API are
+  counted in `stats`,
+- S3 SlowDown responses can lower the limit of a `ConcurrencyLimiter`, to copy
+  fewer artifacts at the same time.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+THROTTLING_ERROR_CODES = {
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestThrottled",
+    "RequestThrottledException",
+}
+
+
+class TokenBucket:
+    """Thread safe token bucket limiting the rate of calls.
+
+    Args:
+        rate (float): The number of calls allowed per second.
+        burst (int, optional): The number of calls allowed at once, defaults to the rate.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a call is allowed."""
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            # a negative balance is the wait of this call behind the queued ones
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class ConcurrencyLimiter:
+    """Semaphore whose limit is lowered on throttling and slowly raised back.
+
+    The limit is halved when `decrease` is called and raised by one after
+    `increase_after` successful releases, up to the initial limit.
+
+    Args:
+        limit (int): The initial and maximum number of concurrent holders.
+        increase_after (int): The number of successes needed to raise the limit.
+    """
+
+    def __init__(self, limit: int, increase_after: int = 10):
+        self.max_limit = limit
+        self.limit = limit
+        self.increase_after = increase_after
+        self.active = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self.condition:
+            self.active -= 1
+            if exc_type is None and self.limit < self.max_limit:
+                self.successes += 1
+                if self.successes >= self.increase_after:
+                    self.limit += 1
+                    self.successes = 0
+            self.condition.notify_all()
+
+    def decrease(self):
+        with self.condition:
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+
+
+class CallStats:
+    """Thread safe counters of the calls made by the clients, per API."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.apis: Dict[str, Dict[str, float]] = defaultdict(
+                lambda: {"Calls": 0, "Retries": 0, "Throttles": 0, "LatencyMs": 0.0}
+            )
+
+    def add(self, api: str, **counts: float):
+        with self.lock:
+            for name, value in counts.items():
+                self.apis[api][name] += value
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
+        """Counters of each API, with the latency of the calls including retries.
+
+        Args:
+            reset (bool): Reset the counters after taking the snapshot.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The counters, keyed by `<service>.<operation>`.
+        """
+
+        with self.lock:
+            apis = {api: dict(counts) for api, counts in self.apis.items()}
+        if reset:
+            self.reset()
+        return apis
+
+
+stats = CallStats()
+
+
+def is_throttling(error: Exception) -> bool:
+    """Check if an error is a throttling error returned by an AWS API."""
+
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    )
+
+
+class LazyClient:
+    """Proxy creating a client on its first use.
+
+    Creating a client loads the model of its service, which takes a significant
+    part of a cold start for large services such as SageMaker. Clients that are
+    not needed by an invocation are never created.
+
+    Args:
+        factory (Callable[[], Any]): Creates the client.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return getattr(self._client, name)
+
+
+def lazy_client(service_name: str, **kwargs) -> Any:
+    """Create a client on its first use, see `client` for the arguments."""
+
+    return LazyClient(lambda: client(service_name, **kwargs))
+
+
+def client(
+    service_name: str,
+    calls_per_second: Optional[float] = None,
+    max_attempts: int = 10,
+    max_pool_connections: int = 10,
+    on_slow_down: Optional[Callable[[], None]] = None,
+    region_name: Optional[str] = None,
+) -> Any:
+    """Create a boto3 client with adaptive retries, rate limiting and call counters.
+
+    Args:
+        service_name (str): The name of the AWS service.
+        calls_per_second (float, optional): The maximum rate of calls to each API
+            of the service. Not limited when not set.
+        max_attempts (int): The maximum number of attempts of each call.
+        max_pool_connections (int): The maximum number of open connections.
+        on_slow_down (Callable, optional): Called when S3 asks to slow down.
+        region_name (str, optional): The region of the client, the region of the
+            function when not set.
+
+    Returns:
+        The boto3 client.
+    """
+
+    boto_client = boto3.client(
+        service_name,
+        region_name=region_name,
+        config=Config(
+            retries={"mode": "adaptive", "max_attempts": max_attempts},
+            max_pool_connections=max_pool_connections,
+        ),
+    )
+    service_id = boto_client.meta.service_model.service_id.hyphenize()
+    buckets: Dict[str, TokenBucket] = {}
+    buckets_lock = threading.Lock()
+
+    def before_call(model, context, **kwargs):
+        if calls_per_second:
+            with buckets_lock:
+                bucket = buckets.setdefault(model.name, TokenBucket(calls_per_second))
+            bucket.acquire()
+        context["StartTime"] = time.monotonic()
+
+    def after_call(parsed, model, context, **kwargs):
+        stats.add(
+            f"{service_name}.{model.name}",
+            Calls=1,
+            Retries=parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+            LatencyMs=(time.monotonic() - context.get("StartTime", time.monotonic()))
+            * 1000,
+        )
+
+    def needs_retry(response, operation, **kwargs):
+        if response is None:
+            return
+        code = response[1].get("Error", {}).get("Code")
+        if code in THROTTLING_ERROR_CODES:
+            stats.add(f"{service_name}.{operation.name}", Throttles=1)
+            if code == "SlowDown" and on_slow_down:
+                on_slow_down()
+
+    boto_client.meta.events.register(f"before-call.{service_id}", before_call)
+    boto_client.meta.events.register(f"after-call.{service_id}", after_call)
+    boto_client.meta.events.register(f"needs-retry.{service_id}", needs_retry)
+    return boto_client
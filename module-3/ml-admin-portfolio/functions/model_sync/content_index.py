@@ -0,0 +1,143 @@
+"""Content index of the artifacts copied to the central artifact bucket.
+
+For every copied artifact a small marker object is written under
+`content-index/` in the artifact bucket. The marker key is derived from the
+content of the source object (its SHA-256 or SHA-1 additional checksum, and its
+size) and the marker body holds the key of the copy. An artifact whose content
+was already copied is then referenced instead of being copied again.
+
+Only collision resistant checksums identify the content of an object. Objects
+with a CRC checksum, or none, are always copied: a collision would make a model
+package reference the artifact of another model.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+INDEX_PREFIX = "content-index"
+CHECKSUM_ALGORITHMS = (
+    "ChecksumSHA256",
+    "ChecksumSHA1",
+    "ChecksumCRC32C",
+    "ChecksumCRC32",
+)
+# checksums that identify the content of an object
+IDENTITY_ALGORITHMS = ("ChecksumSHA256", "ChecksumSHA1")
+
+
+def content_id(source: Dict[str, Any]) -> Optional[str]:
+    """Identify the content of an object from its HeadObject response.
+
+    Args:
+        source (Dict[str, Any]): The HeadObject response of the object, requested
+            with `ChecksumMode="ENABLED"` to use the additional checksums.
+
+    Returns:
+        str | None: An identifier that is the same for objects with the same
+            content, or None if the object has no SHA-256 or SHA-1 checksum.
+    """
+
+    fingerprint = next(
+        (
+            f"{algorithm}:{source[algorithm]}"
+            for algorithm in IDENTITY_ALGORITHMS
+            if source.get(algorithm)
+        ),
+        None,
+    )
+    if fingerprint is None:
+        return None
+    return hashlib.sha256(
+        f"{fingerprint}:{source['ContentLength']}".encode()
+    ).hexdigest()
+
+
+def marker_key(source: Dict[str, Any]) -> Optional[str]:
+    if (identifier := content_id(source)) is None:
+        return None
+    return f"{INDEX_PREFIX}/{identifier}.json"
+
+
+def find(s3_client: Any, bucket_name: str, source: Dict[str, Any]) -> Optional[str]:
+    """Find a copy of an object in the artifact bucket.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        bucket_name (str): The name of the artifact bucket.
+        source (Dict[str, Any]): The HeadObject response of the source object.
+
+    Returns:
+        str | None: The key of an existing copy of the object, or None.
+    """
+
+    if (marker_object_key := marker_key(source)) is None:
+        return None
+    try:
+        marker = s3_client.get_object(Bucket=bucket_name, Key=marker_object_key)
+        key = json.loads(marker["Body"].read())["Key"]
+        # the copy may have been removed since the marker was written
+        s3_client.head_object(Bucket=bucket_name, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return None
+        raise
+    return key
+
+
+def record(
+    s3_client: Any,
+    bucket_name: str,
+    source: Dict[str, Any],
+    key: str,
+    encryption_args: Optional[Dict[str, str]] = None,
+):
+    """Record the copy of an object in the content index.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        bucket_name (str): The name of the artifact bucket.
+        source (Dict[str, Any]): The HeadObject response of the source object.
+        key (str): The key of the copy in the artifact bucket.
+        encryption_args (Dict[str, str], optional): The server side encryption
+            arguments of the artifact bucket.
+    """
+
+    if (marker := marker_key(source)) is None:
+        return
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=marker,
+        Body=json.dumps(
+            {"Key": key, "ETag": source["ETag"], "Size": source["ContentLength"]}
+        ).encode(),
+        ContentType="application/json",
+        **(encryption_args or {}),
+    )
+
+
+def invalidate(s3_client: Any, bucket_name: str, source: Dict[str, Any], key: str):
+    """Remove a copy of an object from the content index, so it is not reused.
+
+    The copy itself is kept, model packages already registered may reference it.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        bucket_name (str): The name of the artifact bucket.
+        source (Dict[str, Any]): The HeadObject response of the source object.
+        key (str): The key of the copy in the artifact bucket.
+    """
+
+    if (marker_object_key := marker_key(source)) is None:
+        return
+    try:
+        marker = s3_client.get_object(Bucket=bucket_name, Key=marker_object_key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return
+        raise
+    # the marker may already reference a newer copy
+    if json.loads(marker["Body"].read())["Key"] == key:
+        s3_client.delete_object(Bucket=bucket_name, Key=marker_object_key)
@@ -0,0 +1,198 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+MiB = 1024**2
+GiB = 1024**3
+
+# Limits imposed by S3 on CopyObject and UploadPartCopy
+MAX_SINGLE_COPY_SIZE = 5 * GiB
+MIN_PART_SIZE = 5 * MiB
+MAX_PART_SIZE = 5 * GiB
+MAX_PARTS = 10000
+
+# S3 computes this additional checksum of every copy, so copies can be verified
+# without streaming them, see `checksums.verify_copy`
+CHECKSUM_ALGORITHM = "SHA256"
+
+
+def part_ranges(object_size: int, part_size: int) -> List[Tuple[int, int]]:
+    """Split an object into inclusive byte ranges suitable for UploadPartCopy.
+
+    The part size is raised when needed so the object fits in the maximum number
+    of parts allowed by S3, and clamped to the S3 part size limits.
+
+    Args:
+        object_size (int): The size of the object in bytes.
+        part_size (int): The preferred size of each part in bytes.
+
+    Returns:
+        List[Tuple[int, int]]: The (first byte, last byte) of each part.
+    """
+
+    part_size = max(part_size, math.ceil(object_size / MAX_PARTS), MIN_PART_SIZE)
+    part_size = min(part_size, MAX_PART_SIZE)
+    return [
+        (start, min(start + part_size, object_size) - 1)
+        for start in range(0, object_size, part_size)
+    ]
+
+
+def encryption_args(sse_kms_key_id: Optional[str]) -> Dict[str, str]:
+    """Build the server side encryption arguments for a write to the destination bucket.
+
+    Args:
+        sse_kms_key_id (str, optional): The KMS key used by the destination bucket.
+            When not set, the default encryption of the bucket applies.
+
+    Returns:
+        Dict[str, str]: The arguments to pass to CopyObject or CreateMultipartUpload.
+    """
+
+    if not sse_kms_key_id:
+        return {}
+    return {"ServerSideEncryption": "aws:kms", "SSEKMSKeyId": sse_kms_key_id}
+
+
+def copy_object(
+    s3_client: Any,
+    source_bucket: str,
+    source_key: str,
+    destination_bucket: str,
+    destination_key: str,
+    multipart_threshold: int = 256 * MiB,
+    part_size: int = 128 * MiB,
+    max_concurrency: int = 10,
+    sse_kms_key_id: Optional[str] = None,
+    source: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Server side copy of an S3 object, picking a strategy based on its size.
+
+    Objects up to the multipart threshold are copied with a single CopyObject call.
+    Larger objects are copied with a multipart upload whose parts are copied in
+    parallel with UploadPartCopy. S3 computes the `CHECKSUM_ALGORITHM` checksum of
+    the copy, of the whole object for a single copy and of each part otherwise.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        source_bucket (str): The name of the source bucket.
+        source_key (str): The key of the source object.
+        destination_bucket (str): The name of the destination bucket.
+        destination_key (str): The key of the destination object.
+        multipart_threshold (int): The size in bytes above which a multipart copy is used.
+        part_size (int): The preferred size in bytes of each part of a multipart copy.
+        max_concurrency (int): The maximum number of parts copied at the same time.
+        sse_kms_key_id (str, optional): The KMS key used to encrypt the destination object.
+        source (Dict[str, Any], optional): The HeadObject response of the source
+            object, when the caller already has it.
+
+    Returns:
+        int: The number of bytes copied.
+    """
+
+    if source is None:
+        source = s3_client.head_object(Bucket=source_bucket, Key=source_key)
+    object_size = source["ContentLength"]
+    copy_source = {"Bucket": source_bucket, "Key": source_key}
+
+    if object_size <= min(multipart_threshold, MAX_SINGLE_COPY_SIZE):
+        s3_client.copy_object(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            CopySource=copy_source,
+            ChecksumAlgorithm=CHECKSUM_ALGORITHM,
+            **encryption_args(sse_kms_key_id),
+        )
+    else:
+        multipart_copy(
+            s3_client,
+            source,
+            copy_source,
+            destination_bucket,
+            destination_key,
+            part_size,
+            max_concurrency,
+            sse_kms_key_id,
+        )
+    return object_size
+
+
+def multipart_copy(
+    s3_client: Any,
+    source: Dict[str, Any],
+    copy_source: Dict[str, str],
+    destination_bucket: str,
+    destination_key: str,
+    part_size: int,
+    max_concurrency: int,
+    sse_kms_key_id: Optional[str] = None,
+):
+    """Copy an object with a multipart upload, copying the parts in parallel.
+
+    The multipart upload is aborted if any part fails, so no partial object or
+    orphaned parts are left in the destination bucket.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        source (Dict[str, Any]): The HeadObject response of the source object.
+        copy_source (Dict[str, str]): The bucket and key of the source object.
+        destination_bucket (str): The name of the destination bucket.
+        destination_key (str): The key of the destination object.
+        part_size (int): The preferred size in bytes of each part.
+        max_concurrency (int): The maximum number of parts copied at the same time.
+        sse_kms_key_id (str, optional): The KMS key used to encrypt the destination object.
+    """
+
+    # CopyObject keeps the content type and user metadata, do the same here
+    object_attributes = {
+        k: source[k]
+        for k in ("ContentType", "ContentEncoding", "Metadata")
+        if source.get(k)
+    }
+    upload_id = s3_client.create_multipart_upload(
+        Bucket=destination_bucket,
+        Key=destination_key,
+        ChecksumAlgorithm=CHECKSUM_ALGORITHM,
+        **object_attributes,
+        **encryption_args(sse_kms_key_id),
+    )["UploadId"]
+
+    def copy_part(part: Tuple[int, Tuple[int, int]]) -> Dict[str, Any]:
+        part_number, (first_byte, last_byte) = part
+        response = s3_client.upload_part_copy(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            CopySource=copy_source,
+            CopySourceRange=f"bytes={first_byte}-{last_byte}",
+            # guard against the source changing while the parts are copied
+            CopySourceIfMatch=source["ETag"],
+        )
+        result = response["CopyPartResult"]
+        # the checksum of each part is required to complete the upload
+        checksum_key = f"Checksum{CHECKSUM_ALGORITHM}"
+        return {
+            "PartNumber": part_number,
+            "ETag": result["ETag"],
+            **({checksum_key: result[checksum_key]} if checksum_key in result else {}),
+        }
+
+    parts = list(enumerate(part_ranges(source["ContentLength"], part_size), start=1))
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_concurrency, len(parts)))
+        ) as executor:
+            completed_parts = list(executor.map(copy_part, parts))
+
+        s3_client.complete_multipart_upload(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": completed_parts},
+        )
+    except Exception:
+        s3_client.abort_multipart_upload(
+            Bucket=destination_bucket, Key=destination_key, UploadId=upload_id
+        )
+        raise
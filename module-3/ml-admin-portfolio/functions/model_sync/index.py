@@ -1,26 +1,223 @@
 import json
 import os
-from typing import Any, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
-import boto3
-from aws_lambda_powertools import Logger
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from botocore.exceptions import ClientError
 
-logger = Logger()
-sagemaker_client = boto3.client("sagemaker")
-s3_client = boto3.client("s3")
-paginator = sagemaker_client.get_paginator("list_model_packages")
+import checksums
+import clients
+import content_index
+import copy_engine
+import key_layout
+import replicas
+import replication
+import sync_index
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 
 destination_bucket_name = os.environ.get("ArtifactBucketName")
+destination_kms_key_id = os.environ.get("ArtifactBucketKmsKeyArn")
+sync_index_table_name = os.environ.get("SyncIndexTableName")
+idempotency_table_name = os.environ.get("IdempotencyTableName")
+content_deduplication = os.environ.get("ContentDeduplication", "true") == "true"
+copy_concurrency = int(os.environ.get("CopyConcurrency", "8"))
+multipart_threshold = (
+    int(os.environ.get("MultipartThresholdMB", "256")) * copy_engine.MiB
+)
+multipart_part_size = (
+    int(os.environ.get("MultipartPartSizeMB", "128")) * copy_engine.MiB
+)
+multipart_concurrency = int(os.environ.get("MultipartConcurrency", "10"))
+sagemaker_calls_per_second = float(os.environ.get("SageMakerCallsPerSecond", "10"))
+checksum_verification = os.environ.get("ChecksumVerification", "true") == "true"
+replication_mode = os.environ.get("ReplicationMode", replication.EAGER)
+replication_queue_url = os.environ.get("ReplicationQueueUrl")
+artifact_key_layout = os.environ.get("ArtifactKeyLayout", key_layout.PREFIXED)
+artifact_key_shard_width = int(
+    os.environ.get("ArtifactKeyShardWidth", str(key_layout.DEFAULT_SHARD_WIDTH))
+)
+# artifact bucket of each replica region, as a JSON object
+replica_buckets: Dict[str, str] = json.loads(os.environ.get("ReplicaBuckets", "{}"))
+central_region = os.environ.get("AWS_REGION")
+
+logger = Logger()
+metrics = Metrics()
+metrics_lock = threading.Lock()
+# artifacts copied at the same time, lowered when S3 asks to slow down
+copy_limiter = clients.ConcurrencyLimiter(copy_concurrency)
+# clients are created on their first use to keep cold starts short
+sagemaker_client = clients.lazy_client(
+    "sagemaker", calls_per_second=sagemaker_calls_per_second
+)
+dynamodb_client = clients.lazy_client("dynamodb")
+sqs_client = clients.lazy_client("sqs")
+s3_client = clients.lazy_client(
+    "s3",
+    # enough connections for every concurrent part copy of every artifact
+    max_pool_connections=copy_concurrency * multipart_concurrency,
+    on_slow_down=copy_limiter.decrease,
+)
+replica_s3_clients = {
+    region: clients.lazy_client(
+        "s3",
+        region_name=region,
+        max_pool_connections=copy_concurrency * multipart_concurrency,
+        on_slow_down=copy_limiter.decrease,
+    )
+    for region in replica_buckets
+}
+replica_sagemaker_clients = {
+    region: clients.lazy_client(
+        "sagemaker", region_name=region, calls_per_second=sagemaker_calls_per_second
+    )
+    for region in replica_buckets
+}
+replica_ecr_clients = {
+    region: clients.lazy_client("ecr", region_name=region) for region in replica_buckets
+}
+
+
+def add_metric(name: str, unit: MetricUnit, value: float):
+    """Add a metric value, safe to call from the copy threads."""
+
+    with metrics_lock:
+        metrics.add_metric(name=name, unit=unit, value=value)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the duration of a phase of the sync as the `<phase>Time` metric."""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_metric(
+            f"{phase}Time",
+            MetricUnit.Milliseconds,
+            (time.perf_counter() - start) * 1000,
+        )
+
+
+def split_s3_uri(s3_uri: str) -> Tuple[str, str]:
+    bucket_name, key = s3_uri.removeprefix("s3://").split("/", 1)
+    return bucket_name, key
+
+
+def head_artifact(source_object_arn: str) -> Dict[str, Any]:
+    source_bucket_name, source_object_key = split_s3_uri(source_object_arn)
+    return s3_client.head_object(
+        Bucket=source_bucket_name, Key=source_object_key, ChecksumMode="ENABLED"
+    )
+
+
+def find_artifact_copy(
+    source_object_arn: str, destination_bucket_name: str, source: Dict[str, Any]
+) -> Optional[str]:
+    """Find a copy of the content of an artifact in the destination bucket.
+
+    Args:
+        source_object_arn (str): The S3 URI of the source object.
+        destination_bucket_name (str): The name of the destination bucket.
+        source (Dict[str, Any]): The HeadObject response of the source object.
+
+    Returns:
+        str | None: The S3 URI of the copy, or None if content deduplication is
+            disabled or the content was not copied yet.
+    """
+
+    if not content_deduplication or not (
+        existing_key := content_index.find(s3_client, destination_bucket_name, source)
+    ):
+        return None
+
+    logger.info(
+        f"Reusing s3://{destination_bucket_name}/{existing_key} for {source_object_arn}"
+    )
+    add_metric("ArtifactsDeduplicated", MetricUnit.Count, 1)
+    add_metric("BytesDeduplicated", MetricUnit.Bytes, source["ContentLength"])
+    return f"s3://{destination_bucket_name}/{existing_key}"
+
+
+def replicate_artifact(
+    source_object_arn: str,
+    destination_object_arn: str,
+    source: Optional[Dict[str, Any]] = None,
+):
+    """Copy an artifact to a given location, and record it in the content index.
+
+    Large objects are copied with a parallel multipart copy, see `copy_engine.copy_object`.
+
+    Args:
+        source_object_arn (str): The S3 URI of the source object.
+        destination_object_arn (str): The S3 URI of the copy.
+        source (Dict[str, Any], optional): The HeadObject response of the source
+            object, when the caller already has it.
+    """
+
+    source_bucket_name, source_object_key = split_s3_uri(source_object_arn)
+    destination_bucket_name, destination_key = split_s3_uri(destination_object_arn)
+    if source is None:
+        source = head_artifact(source_object_arn)
+
+    bytes_copied = copy_engine.copy_object(
+        s3_client,
+        source_bucket=source_bucket_name,
+        source_key=source_object_key,
+        destination_bucket=destination_bucket_name,
+        destination_key=destination_key,
+        multipart_threshold=multipart_threshold,
+        part_size=multipart_part_size,
+        max_concurrency=multipart_concurrency,
+        sse_kms_key_id=destination_kms_key_id,
+        source=source,
+    )
+    add_metric("ArtifactsCopied", MetricUnit.Count, 1)
+    add_metric("BytesCopied", MetricUnit.Bytes, bytes_copied)
+
+    if content_deduplication:
+        content_index.record(
+            s3_client,
+            destination_bucket_name,
+            source,
+            destination_key,
+            copy_engine.encryption_args(destination_kms_key_id),
+        )
+
+
+def artifact_destination_key(source_object_arn: str, destination_prefix: str) -> str:
+    """Key of the copy of an artifact, following the configured key layout."""
+
+    _, source_object_key = split_s3_uri(source_object_arn)
+    return key_layout.destination_key(
+        destination_prefix,
+        source_object_key,
+        artifact_key_layout,
+        artifact_key_shard_width,
+    )
 
 
 def copy_artifact(
-    source_object_arn: str, destination_bucket_name: str, destination_prefix: str
+    source_object_arn: str,
+    destination_bucket_name: str,
+    destination_prefix: str,
+    defer: bool = False,
+    reused: Optional[Set[str]] = None,
 ):
     """
     Copy an object from one S3 bucket to another.
 
+    When content deduplication is enabled and the same content was already copied
+    to the destination bucket, the existing copy is returned instead.
+
     Args:
         source_object_arn (str):
             The ARN of the source S3 object.
@@ -28,65 +225,464 @@ def copy_artifact(
             The name of the destination bucket.
         destination_prefix (str):
             The prefix path within the destination bucket.
+        defer (bool):
+            Only return the location of the copy, the object is copied later
+            with `replicate_artifact`.
+        reused (Set[str], optional):
+            Collects the existing copies returned instead of a new copy.
 
     Returns:
         str:
             The ARN of the copied object in the destination bucket.
     """
-    source_bucket_name, source_object_key = source_object_arn.removeprefix(
-        "s3://"
-    ).split("/", 1)
-    s3_client.copy_object(
-        Bucket=destination_bucket_name,
-        Key=f"{destination_prefix}/{source_object_key}",
-        CopySource={"Bucket": source_bucket_name, "Key": source_object_key},
+    source = head_artifact(source_object_arn)
+    if existing_copy := find_artifact_copy(
+        source_object_arn, destination_bucket_name, source
+    ):
+        if reused is not None:
+            reused.add(existing_copy)
+        return existing_copy
+
+    destination_key = artifact_destination_key(source_object_arn, destination_prefix)
+    destination_object_arn = f"s3://{destination_bucket_name}/{destination_key}"
+    if not defer:
+        replicate_artifact(source_object_arn, destination_object_arn, source)
+    return destination_object_arn
+
+
+# leave room for the other metadata properties, a model package can have 50
+MAX_CHECKSUM_PROPERTIES = 40
+
+
+def verify_artifact(
+    source_object_arn: str,
+    destination_object_arn: str,
+    destination_prefix: str,
+    reused: bool = False,
+) -> Tuple[str, Tuple[str, str]]:
+    """Verify the copy of an artifact against its source.
+
+    A copy written by this sync is removed when it differs from its source. A
+    reused copy may be referenced by model packages already registered, so it is
+    kept, removed from the content index, and the artifact is copied again.
+
+    Args:
+        source_object_arn (str): The S3 URI of the source object.
+        destination_object_arn (str): The S3 URI of the copy.
+        destination_prefix (str): The prefix path of the copies of the model package.
+        reused (bool): The copy was found in the content index instead of written.
+
+    Returns:
+        Tuple[str, Tuple[str, str]]: The S3 URI of the verified copy, and its
+            checksum algorithm and value.
+
+    Raises:
+        checksums.ChecksumMismatchError: If the copy differs from its source.
+    """
+
+    destination_bucket, destination_key = split_s3_uri(destination_object_arn)
+    try:
+        return destination_object_arn, checksums.verify_copy(
+            s3_client, source_object_arn, destination_object_arn
+        )
+    except checksums.ChecksumMismatchError:
+        if not reused:
+            # remove the copy so it is neither reused nor kept by a retry
+            s3_client.delete_object(Bucket=destination_bucket, Key=destination_key)
+            raise
+
+    logger.warning(
+        f"Reused copy {destination_object_arn} differs from {source_object_arn}, copying it again"
+    )
+    source = head_artifact(source_object_arn)
+    content_index.invalidate(s3_client, destination_bucket, source, destination_key)
+    copy_object_arn = f"s3://{destination_bucket}/{artifact_destination_key(source_object_arn, destination_prefix)}"
+    replicate_artifact(source_object_arn, copy_object_arn, source)
+    return copy_object_arn, checksums.verify_copy(
+        s3_client, source_object_arn, copy_object_arn
+    )
+
+
+def verify_artifacts(
+    artifact_map: Dict[str, str],
+    destination_prefix: str,
+    reused: Optional[Set[str]] = None,
+) -> Dict[str, str]:
+    """Verify the copies of a set of artifacts against their source.
+
+    Reused copies that differ from their source are replaced in `artifact_map`
+    by a new copy, see `verify_artifact`.
+
+    Args:
+        artifact_map (Dict[str, str]): A mapping of source S3 URIs to their copy.
+        destination_prefix (str): The prefix path of the copies of the model package.
+        reused (Set[str], optional): The copies found in the content index.
+
+    Returns:
+        Dict[str, str]: The checksum of each copy, as metadata properties of the
+            model package referencing them.
+
+    Raises:
+        checksums.ChecksumMismatchError: If a copy differs from its source.
+    """
+
+    if not checksum_verification or not artifact_map:
+        return {}
+
+    reused = reused or set()
+
+    def verify(artifact: Tuple[str, str]) -> Tuple[str, Tuple[str, str]]:
+        source_object_arn, destination_object_arn = artifact
+        return verify_artifact(
+            source_object_arn,
+            destination_object_arn,
+            destination_prefix,
+            reused=destination_object_arn in reused,
+        )
+
+    with timed("ChecksumVerification"):
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(copy_concurrency, len(artifact_map)))
+        ) as executor:
+            results = list(executor.map(verify, artifact_map.items()))
+
+    verified = {}
+    for source_object_arn, (destination_object_arn, checksum) in zip(
+        list(artifact_map), results
+    ):
+        artifact_map[source_object_arn] = destination_object_arn
+        verified[destination_object_arn] = checksum
+
+    if len(verified) > MAX_CHECKSUM_PROPERTIES:
+        logger.warning(
+            f"Recording the checksums of {MAX_CHECKSUM_PROPERTIES} of {len(verified)} artifacts"
+        )
+    return {
+        checksums.metadata_key(uri): checksums.metadata_value(checksum)
+        for uri, checksum in list(verified.items())[:MAX_CHECKSUM_PROPERTIES]
+    }
+
+
+def copy_to_replica(central_object_arn: str, region: str) -> str:
+    """Copy an artifact from the central artifact bucket to a replica region.
+
+    The copy is skipped when the object was already copied by a previous attempt.
+
+    Args:
+        central_object_arn (str): The S3 URI of the artifact in the central bucket.
+        region (str): The replica region.
+
+    Returns:
+        str: The S3 URI of the artifact in the bucket of the replica region.
+    """
+
+    central_bucket, key = split_s3_uri(central_object_arn)
+    replica_bucket = replica_buckets[region]
+    replica_s3_client = replica_s3_clients[region]
+    try:
+        replica_s3_client.head_object(Bucket=replica_bucket, Key=key)
+        return replicas.regional_uri(central_object_arn, replica_bucket)
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "404":
+            raise
+
+    with copy_limiter:
+        copied_bytes = copy_engine.copy_object(
+            replica_s3_client,
+            central_bucket,
+            key,
+            replica_bucket,
+            key,
+            multipart_threshold=multipart_threshold,
+            part_size=multipart_part_size,
+            max_concurrency=multipart_concurrency,
+            source=s3_client.head_object(Bucket=central_bucket, Key=key),
+        )
+    add_metric("BytesReplicated", MetricUnit.Bytes, copied_bytes)
+    return replicas.regional_uri(central_object_arn, replica_bucket)
+
+
+def regional_images(
+    create_model_package_input: Dict[str, Any], region: str
+) -> Dict[str, str]:
+    """Find the copy in a region of each container image of a model package.
+
+    Raises:
+        replicas.MissingRegionalImageError: If an image has no regional copy.
+
+    Returns:
+        Dict[str, str]: A mapping of each image to its copy in the region.
+    """
+
+    specifications = [
+        create_model_package_input.get("InferenceSpecification", {}),
+        *create_model_package_input.get("AdditionalInferenceSpecifications", []),
+    ]
+    images = dict.fromkeys(
+        container["Image"]
+        for specification in specifications
+        for container in specification.get("Containers", [])
+        if "Image" in container
     )
-    return f"s3://{destination_bucket_name}/{destination_prefix}/{source_object_key}"
+    return {
+        image: replicas.regional_image(replica_ecr_clients[region], image, region)
+        for image in images
+    }
+
+
+def register_replica(
+    region: str,
+    source_model_package_arn: str,
+    create_model_package_input: Dict[str, Any],
+    group_policy: Optional[str],
+) -> str:
+    """Replicate a synced model package and its artifacts to a region.
+
+    Args:
+        region (str): The replica region.
+        source_model_package_arn (str): The ARN of the source model package.
+        create_model_package_input (Dict[str, Any]): The input of the creation of
+            the central model package, referencing the central artifacts.
+        group_policy (str, optional): The resource policy of the central group.
+
+    Returns:
+        str: The ARN of the regional model package.
+    """
+
+    index_key = replicas.index_key(source_model_package_arn, region)
+    if sync_index_table_name and (
+        replica_arn := sync_index.lookup(
+            dynamodb_client, sync_index_table_name, index_key
+        )
+    ):
+        return replica_arn
+
+    # checked before the copies, endpoints of the region pull the regional images
+    image_map = regional_images(create_model_package_input, region)
+    central_artifacts = collect_artifacts(create_model_package_input)
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(copy_concurrency, len(central_artifacts)))
+    ) as executor:
+        regional_map = dict(
+            zip(
+                central_artifacts,
+                executor.map(
+                    lambda uri: copy_to_replica(uri, region), central_artifacts
+                ),
+            )
+        )
+
+    model_package_group_name = create_model_package_input["ModelPackageGroupName"]
+    replica_sagemaker_client = replica_sagemaker_clients[region]
+    replicas.ensure_model_package_group(
+        replica_sagemaker_client,
+        model_package_group_name,
+        group_policy and replicas.regional_policy(group_policy, central_region, region),
+    )
+    regional_input = replace_artifacts(
+        create_model_package_input, {**image_map, **regional_map}
+    )
+    regional_input["CustomerMetadataProperties"] = replicas.regional_metadata(
+        create_model_package_input["CustomerMetadataProperties"],
+        {
+            checksums.metadata_key(central): checksums.metadata_key(regional)
+            for central, regional in regional_map.items()
+        },
+    )
+    replica_arn = replica_sagemaker_client.create_model_package(**regional_input)[
+        "ModelPackageArn"
+    ]
+
+    if sync_index_table_name:
+        sync_index.record(
+            dynamodb_client,
+            sync_index_table_name,
+            index_key,
+            replica_arn,
+            model_package_group_name,
+        )
+    return replica_arn
+
+
+def register_replicas(
+    source_model_package_arn: str, create_model_package_input: Dict[str, Any]
+) -> Dict[str, str]:
+    """Replicate a synced model package to every replica region in parallel.
+
+    Returns:
+        Dict[str, str]: The metadata properties recording the ARN of the model
+            package of each replica region.
+    """
+
+    if not replica_buckets:
+        return {}
+
+    try:
+        group_policy = sagemaker_client.get_model_package_group_policy(
+            ModelPackageGroupName=create_model_package_input["ModelPackageGroupName"]
+        )["ResourcePolicy"]
+    except ClientError:
+        group_policy = None
+
+    regions = list(replica_buckets)
+    with timed("RegionReplication"), ThreadPoolExecutor(
+        max_workers=len(regions)
+    ) as executor:
+        replica_arns = executor.map(
+            lambda region: register_replica(
+                region,
+                source_model_package_arn,
+                create_model_package_input,
+                group_policy,
+            ),
+            regions,
+        )
+        return {
+            replicas.metadata_key(region): replica_arn
+            for region, replica_arn in zip(regions, replica_arns)
+        }
 
 
 exclusion_list = ["ImageDigest"]
 
 
-def upload_and_replace(
-    data: dict | List | str | Any, destination_bucket_name: str, destination_prefix: str
-):
-    """Recursively scan a structure to upload data to an S3 bucket, replacing S3 URLs.
+def collect_artifacts(data: dict | List | str | Any) -> List[str]:
+    """Recursively scan a structure and collect every S3 URI it references.
 
     Args:
-        data (dict|List|str|Any): The data to upload. Can be a dict, list,
+        data (dict|List|str|Any): The structure to scan. Can be a dict, list,
             string or other object.
+
+    Returns:
+        List[str]: The unique S3 URIs found, in order of first appearance.
+    """
+
+    if isinstance(data, dict):
+        return list(
+            dict.fromkeys(
+                uri
+                for k, v in data.items()
+                if k not in exclusion_list
+                for uri in collect_artifacts(v)
+            )
+        )
+    elif isinstance(data, list):
+        return list(dict.fromkeys(uri for i in data for uri in collect_artifacts(i)))
+    elif isinstance(data, str) and data.startswith("s3://"):
+        return [data]
+    return []
+
+
+def copy_artifacts(
+    artifacts: List[str],
+    destination_bucket_name: str,
+    destination_prefix: str,
+    max_workers: int = copy_concurrency,
+    defer: bool = False,
+    reused: Optional[Set[str]] = None,
+) -> Dict[str, str]:
+    """Copy a set of S3 objects to the destination bucket using a bounded thread pool.
+
+    Args:
+        artifacts (List[str]): The S3 URIs of the objects to copy.
         destination_bucket_name (str): The name of the destination S3 bucket.
         destination_prefix (str): The prefix path within the bucket.
+        max_workers (int): The maximum number of concurrent copies, further
+            limited by `copy_limiter` while S3 asks to slow down.
+        defer (bool): Only plan the location of the copies, see `copy_artifact`.
+        reused (Set[str], optional): Collects the existing copies that were reused.
 
     Returns:
-        The uploaded data with any S3 URLs replaced by the new destination.
+        Dict[str, str]: A mapping of each source S3 URI to its copy in the
+            destination bucket.
+    """
+
+    if not artifacts:
+        return {}
+
+    def copy(uri: str) -> str:
+        with copy_limiter:
+            return copy_artifact(
+                uri,
+                destination_bucket_name,
+                destination_prefix,
+                defer=defer,
+                reused=reused,
+            )
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(artifacts)))
+    ) as executor:
+        return dict(zip(artifacts, executor.map(copy, artifacts)))
+
+
+def replace_artifacts(data: dict | List | str | Any, artifact_map: Dict[str, str]):
+    """Recursively rebuild a structure replacing S3 URIs using a precomputed mapping.
+
+    Args:
+        data (dict|List|str|Any): The structure to rebuild.
+        artifact_map (Dict[str, str]): A mapping of source S3 URIs to new S3 URIs.
+
+    Returns:
+        The rebuilt structure with the S3 URIs replaced.
     """
 
     if isinstance(data, dict):
         return {
-            k: upload_and_replace(v, destination_bucket_name, destination_prefix)
+            k: replace_artifacts(v, artifact_map)
             for k, v in data.items()
             if k not in exclusion_list
         }
     elif isinstance(data, list):
-        return [
-            upload_and_replace(i, destination_bucket_name, destination_prefix)
-            for i in data
-        ]
+        return [replace_artifacts(i, artifact_map) for i in data]
     elif isinstance(data, str):
-        return (
-            copy_artifact(data, destination_bucket_name, destination_prefix)
-            if data.startswith("s3://")
-            else data
-        )
+        return artifact_map.get(data, data)
     return data
 
 
+def upload_and_replace(
+    data: dict | List | str | Any,
+    destination_bucket_name: str,
+    destination_prefix: str,
+    defer: bool = False,
+    reused: Optional[Set[str]] = None,
+) -> Tuple[Any, Dict[str, str]]:
+    """Scan a structure to upload data to an S3 bucket, replacing S3 URLs.
+
+    The artifacts are collected first, then copied concurrently, and finally the
+    structure is rebuilt with the new S3 URLs.
+
+    Args:
+        data (dict|List|str|Any): The data to upload. Can be a dict, list,
+            string or other object.
+        destination_bucket_name (str): The name of the destination S3 bucket.
+        destination_prefix (str): The prefix path within the bucket.
+        defer (bool): Only plan the location of the copies, see `copy_artifact`.
+        reused (Set[str], optional): Collects the existing copies that were reused.
+
+    Returns:
+        The uploaded data with any S3 URLs replaced by the new destination, and
+            the mapping of the source S3 URLs to the new ones.
+    """
+
+    artifact_map = copy_artifacts(
+        collect_artifacts(data),
+        destination_bucket_name,
+        destination_prefix,
+        defer=defer,
+        reused=reused,
+    )
+    return replace_artifacts(data, artifact_map), artifact_map
+
+
 def check_pkg_already_exists(
     source_model_package_arn: str, target_model_package_group: str
 ) -> bool:
     """Check if a model package already exists in a target model package group.
 
+    The check is a single lookup in the sync index. The index of a target group
+    is built from the registry the first time the group is checked.
+
     Args:
         source_model_package_arn (str): The ARN of the source model package.
         target_model_package_group (str): The name of the target model package group.
@@ -96,7 +692,100 @@ def check_pkg_already_exists(
             already exists in the target group, False otherwise.
     """
 
-    for summary in paginator.paginate(ModelPackageGroupName=target_model_package_group):
+    if not sync_index_table_name:
+        return scan_pkg_already_exists(
+            source_model_package_arn, target_model_package_group
+        )
+
+    if not sync_index.is_group_indexed(
+        dynamodb_client, sync_index_table_name, target_model_package_group
+    ):
+        logger.info(f"Building sync index for {target_model_package_group}")
+        sync_index.rebuild(
+            dynamodb_client,
+            sagemaker_client,
+            sync_index_table_name,
+            target_model_package_group,
+        )
+
+    return (
+        sync_index.lookup(
+            dynamodb_client, sync_index_table_name, source_model_package_arn
+        )
+        is not None
+    )
+
+
+def lookup_pkg_already_exists(
+    source_model_package_arn: str, target_model_package_group: str
+) -> bool:
+    """Check if a model package already exists in a target model package group,
+    without writing to the sync index.
+
+    The sync index is only used if the target group was already indexed, the
+    registry is scanned otherwise.
+
+    Args:
+        source_model_package_arn (str): The ARN of the source model package.
+        target_model_package_group (str): The name of the target model package group.
+
+    Returns:
+        boolean: True if a package with the same OriginalARN metadata property
+            already exists in the target group, False otherwise.
+    """
+
+    if sync_index_table_name and sync_index.is_group_indexed(
+        dynamodb_client, sync_index_table_name, target_model_package_group
+    ):
+        return (
+            sync_index.lookup(
+                dynamodb_client, sync_index_table_name, source_model_package_arn
+            )
+            is not None
+        )
+    return scan_pkg_already_exists(source_model_package_arn, target_model_package_group)
+
+
+def scan_pkg_already_exists(
+    source_model_package_arn: str, target_model_package_group: str
+) -> bool:
+    """Check if a model package already exists in a target model package group by
+    describing every model package of the group.
+
+    Args:
+        source_model_package_arn (str): The ARN of the source model package.
+        target_model_package_group (str): The name of the target model package group.
+
+    Returns:
+        boolean: True if a package with the same OriginalARN metadata property
+            already exists in the target group, False otherwise.
+    """
+
+    return (
+        find_synced_package(source_model_package_arn, target_model_package_group)
+        is not None
+    )
+
+
+def find_synced_package(
+    source_model_package_arn: str, target_model_package_group: str
+) -> Optional[str]:
+    """Find the copy of a model package in a target model package group by
+    describing the model packages of the group, newest first.
+
+    Args:
+        source_model_package_arn (str): The ARN of the source model package.
+        target_model_package_group (str): The name of the target model package group.
+
+    Returns:
+        str | None: The ARN of the package with the same OriginalARN metadata
+            property, or None if the package was not synced.
+    """
+
+    paginator = sagemaker_client.get_paginator("list_model_packages")
+    for summary in paginator.paginate(
+        ModelPackageGroupName=target_model_package_group, SortOrder="Descending"
+    ):
         for package in summary["ModelPackageSummaryList"]:
             if (
                 sagemaker_client.describe_model_package(
@@ -104,22 +793,124 @@ def check_pkg_already_exists(
                 )["CustomerMetadataProperties"]["OriginalARN"]
                 == source_model_package_arn
             ):
-                return True
-    return False
+                return package["ModelPackageArn"]
+    return None
 
 
-@logger.inject_lambda_context(log_event=True)
-def lambda_handler(event, context: LambdaContext):
-    source_model_package_arn = event["detail"]["ModelPackageArn"]
-    logger.info(f"Source Model Package ARN: {source_model_package_arn}")
+def claim_sync(
+    source_model_package_arn: str, target_model_package_group: str, claimed_at: int
+) -> Optional[str]:
+    """Claim the sync of a model package in the sync index, see `sync_index.claim`.
 
-    model_package = sagemaker_client.describe_model_package(
-        ModelPackageName=source_model_package_arn
+    A claim left by a sync interrupted for longer than the function timeout is
+    taken over, unless that sync registered the package before it was interrupted.
+
+    Args:
+        source_model_package_arn (str): The ARN of the source model package.
+        target_model_package_group (str): The name of the target model package group.
+        claimed_at (int): The time of the claim, in seconds since the epoch.
+
+    Returns:
+        str | None: The ARN of the synced package if the package was synced in the
+            meantime, or None if the sync was claimed.
+
+    Raises:
+        sync_index.SyncInProgressError: If another sync of the package is running.
+    """
+
+    if sync_index.claim(
+        dynamodb_client,
+        sync_index_table_name,  # type: ignore
+        source_model_package_arn,
+        target_model_package_group,
+        claimed_at,
+    ):
+        return None
+
+    entry = sync_index.get_entry(
+        dynamodb_client, sync_index_table_name, source_model_package_arn  # type: ignore
     )
+    if entry and "TargetModelPackageArn" in entry:
+        return entry["TargetModelPackageArn"]["S"]
+    if (
+        not entry
+        or claimed_at - int(entry["ClaimedAt"]["N"]) < sync_index.CLAIM_TIMEOUT_SECONDS
+    ):
+        raise sync_index.SyncInProgressError(
+            f"Sync of {source_model_package_arn} is in progress"
+        )
+
+    logger.warning(f"Taking over the interrupted sync of {source_model_package_arn}")
+    if package_arn := find_synced_package(
+        source_model_package_arn, target_model_package_group
+    ):
+        sync_index.record(
+            dynamodb_client,
+            sync_index_table_name,  # type: ignore
+            source_model_package_arn,
+            package_arn,
+            target_model_package_group,
+        )
+        return package_arn
+    if not sync_index.claim(
+        dynamodb_client,
+        sync_index_table_name,  # type: ignore
+        source_model_package_arn,
+        target_model_package_group,
+        claimed_at,
+        previous_claim=int(entry["ClaimedAt"]["N"]),
+    ):
+        raise sync_index.SyncInProgressError(
+            f"Sync of {source_model_package_arn} is in progress"
+        )
+    return None
+
+
+def create_model_package_group(target_model_package_group: str):
+    """Create a target model package group, unless a concurrent sync created it.
+
+    Args:
+        target_model_package_group (str): The name of the target model package group.
+    """
+
+    logger.info(f"Creating model group {target_model_package_group}")
+    try:
+        sagemaker_client.create_model_package_group(
+            ModelPackageGroupName=target_model_package_group
+        )
+    except ClientError as e:
+        # packages of a new source group synced in parallel all miss the group,
+        # only the first creation succeeds and the others use its group
+        try:
+            sagemaker_client.describe_model_package_group(
+                ModelPackageGroupName=target_model_package_group
+            )
+        except ClientError:
+            raise e
+        logger.info(f"Model group {target_model_package_group} already exists")
+
+
+def sync_model_package(source_model_package_arn: str) -> str:
+    """Sync a model package to the central model registry.
+
+    The artifacts of the model package are copied to the central artifact bucket
+    and a model package referencing the copies is registered in a model package
+    group named after the source group and account.
+
+    Args:
+        source_model_package_arn (str): The ARN of the source model package.
+
+    Returns:
+        str: A message describing the outcome of the sync.
+    """
+
+    logger.info(f"Source Model Package ARN: {source_model_package_arn}")
+
     source_account_id = source_model_package_arn.split(":")[4]
-    model_package = sagemaker_client.describe_model_package(
-        ModelPackageName=source_model_package_arn
-    )
+    with timed("Describe"):
+        model_package = sagemaker_client.describe_model_package(
+            ModelPackageName=source_model_package_arn
+        )
 
     mpg_name = model_package["ModelPackageGroupName"]
     # mpg_arn = f"{source_model_package_arn.split(':model-package/')[0]}:model-package-group/{model_package['ModelPackageGroupName']}"
@@ -127,64 +918,374 @@ def lambda_handler(event, context: LambdaContext):
     target_model_package_group = f"{mpg_name}-{source_account_id}"
 
     try:
-        # Check if the model package group already exists, and if the model package has already been synced
+        # Check if the model package group already exists
         sagemaker_client.describe_model_package_group(
             ModelPackageGroupName=target_model_package_group
         )
+    except ClientError:
+        create_model_package_group(target_model_package_group)
+    else:
+        # errors of the sync index are raised, the package could be registered twice otherwise
+        with timed("DedupCheck"):
+            already_exists = check_pkg_already_exists(
+                source_model_package_arn, target_model_package_group
+            )
+        if already_exists:
+            return already_synced(source_model_package_arn, target_model_package_group)
 
-        if check_pkg_already_exists(
-            source_model_package_arn, target_model_package_group
-        ):
-            logger.info(
-                f"Model package {source_model_package_arn} already exists in {target_model_package_group}"
+    claimed_at = int(time.time())
+    if sync_index_table_name and claim_sync(
+        source_model_package_arn, target_model_package_group, claimed_at
+    ):
+        return already_synced(source_model_package_arn, target_model_package_group)
+
+    # the artifacts are replicated after the registration with deferred replication
+    defer = replication_mode != replication.EAGER
+    try:
+        create_model_package_input = prepare_model_package(
+            model_package,
+            source_model_package_arn,
+            target_model_package_group,
+            destination_prefix,
+            defer,
+        )
+    except Exception:
+        if sync_index_table_name:
+            # nothing was registered, let a retry sync the package right away
+            sync_index.release(
+                dynamodb_client,
+                sync_index_table_name,
+                source_model_package_arn,
+                claimed_at,
             )
+        raise
 
-            return {
-                "statusCode": 200,
-                "body": json.dumps(
-                    f"Model package {source_model_package_arn} already exists in {target_model_package_group}"
-                ),
-            }
+    try:
+        with timed("CreateModelPackage"):
+            response = sagemaker_client.create_model_package(**create_model_package_input)  # type: ignore
+        package_arn = response["ModelPackageArn"]
+        add_metric("PackagesSynced", MetricUnit.Count, 1)
+
+        if sync_index_table_name:
+            sync_index.record(
+                dynamodb_client,
+                sync_index_table_name,
+                source_model_package_arn,
+                package_arn,
+                target_model_package_group,
+            )
 
     except ClientError:
-        logger.info(f"Creating model group {target_model_package_group}")
-        sagemaker_client.create_model_package_group(
-            ModelPackageGroupName=target_model_package_group
+        logger.error("Model Package creation failed.")
+        raise
+
+    if not defer:
+        return f"Copied artifacts and registered Model: {package_arn}"
+
+    if replication_mode == replication.BACKGROUND:
+        sqs_client.send_message(
+            QueueUrl=replication_queue_url,
+            MessageBody=json.dumps({"ModelPackageArn": package_arn}),
         )
+    return f"Registered Model: {package_arn}, artifact replication is pending"
 
-    # scan the source model package for artifacts to upload to S3
-    new_model_package = upload_and_replace(
-        model_package,
-        destination_bucket_name,
-        destination_prefix,  # type: ignore
+
+def already_synced(
+    source_model_package_arn: str, target_model_package_group: str
+) -> str:
+    logger.info(
+        f"Model package {source_model_package_arn} already exists in {target_model_package_group}"
     )
+    add_metric("PackagesAlreadySynced", MetricUnit.Count, 1)
+    return f"Model package {source_model_package_arn} already exists in {target_model_package_group}"
+
+
+def prepare_model_package(
+    model_package: Dict[str, Any],
+    source_model_package_arn: str,
+    target_model_package_group: str,
+    destination_prefix: str,
+    defer: bool,
+) -> Dict[str, Any]:
+    """Copy the artifacts of a model package and build the input of its registration.
+
+    Args:
+        model_package (Dict[str, Any]): The description of the source model package.
+        source_model_package_arn (str): The ARN of the source model package.
+        target_model_package_group (str): The name of the target model package group.
+        destination_prefix (str): The prefix path of the copies of the model package.
+        defer (bool): Only plan the copies, see `replicate_model_package`.
+
+    Returns:
+        Dict[str, Any]: The input of `create_model_package`.
+    """
+
+    metadata = {"OriginalARN": source_model_package_arn}
+
+    # scan the source model package for artifacts to upload to S3
+    reused: Set[str] = set()
+    with timed("ArtifactCopy"):
+        new_model_package, artifact_map = upload_and_replace(
+            model_package,
+            destination_bucket_name,  # type: ignore
+            destination_prefix,
+            defer=defer,
+            reused=reused,
+        )
     assert isinstance(new_model_package, dict)  # fix type linting errors
 
-    try:
-        create_model_package_input = dict(
-            ModelPackageGroupName=target_model_package_group,
-            InferenceSpecification=new_model_package["InferenceSpecification"],
-            ModelApprovalStatus="PendingManualApproval",
-            ModelPackageDescription=new_model_package.get(
-                "ModelPackageDescription", ""
-            ),
-            CustomerMetadataProperties={"OriginalARN": source_model_package_arn},
+    if defer:
+        manifest = replication.write_manifest(
+            s3_client,
+            destination_bucket_name,  # type: ignore
+            source_model_package_arn,
+            artifact_map,
+            copy_engine.encryption_args(destination_kms_key_id),
         )
+        metadata.update(replication.pending_metadata(manifest))
+    else:
+        metadata.update(verify_artifacts(artifact_map, destination_prefix, reused))
+        # reused copies found to differ from their source were copied again
+        new_model_package = replace_artifacts(model_package, artifact_map)
 
-        if model_metrics := new_model_package.get("ModelMetrics", None):
-            create_model_package_input = {
-                **create_model_package_input,
-                "ModelMetrics": model_metrics,
-            }
+    create_model_package_input = dict(
+        ModelPackageGroupName=target_model_package_group,
+        InferenceSpecification=new_model_package["InferenceSpecification"],
+        ModelApprovalStatus="PendingManualApproval",
+        ModelPackageDescription=new_model_package.get("ModelPackageDescription", ""),
+        CustomerMetadataProperties=metadata,
+    )
 
-        response = sagemaker_client.create_model_package(**create_model_package_input)  # type: ignore
-        package_arn = response["ModelPackageArn"]
+    if model_metrics := new_model_package.get("ModelMetrics", None):
+        create_model_package_input = {
+            **create_model_package_input,
+            "ModelMetrics": model_metrics,
+        }
+
+    # the replicas are registered first, to record their ARNs
+    if not defer:
+        create_model_package_input["CustomerMetadataProperties"] = {
+            **metadata,
+            **register_replicas(source_model_package_arn, create_model_package_input),
+        }
+    return create_model_package_input
+
+
+def replicate_model_package(model_package_arn: str) -> str:
+    """Replicate the artifacts of a central model package registered with deferred
+    replication, verify them and mark them as available.
+
+    Artifacts already copied by a previous attempt are not copied again. The
+    checksums of the copies are recorded in the same update that marks the
+    artifacts as available, so a package whose copies could not be verified is
+    left pending.
+
+    Args:
+        model_package_arn (str): The ARN of the central model package.
+
+    Returns:
+        str: A message describing the outcome of the replication.
+    """
+
+    model_package = sagemaker_client.describe_model_package(
+        ModelPackageName=model_package_arn
+    )
+    if not replication.is_pending(model_package):
+        return f"Artifacts of {model_package_arn} are already available"
+
+    artifact_map = replication.read_manifest(
+        s3_client,
+        destination_bucket_name,  # type: ignore
+        model_package["CustomerMetadataProperties"][replication.MANIFEST_PROPERTY],
+    )
+    # the copies of a package are under the name of its group, see sync_model_package
+    destination_prefix = model_package["ModelPackageGroupName"]
+    # copies found in the content index at registration are shared with other packages
+    reused = {
+        destination_object_arn
+        for source_object_arn, destination_object_arn in artifact_map.items()
+        if destination_object_arn
+        != f"s3://{destination_bucket_name}/{artifact_destination_key(source_object_arn, destination_prefix)}"
+    }
+
+    def replicate(artifact: Tuple[str, str]):
+        source_object_arn, destination_object_arn = artifact
+        destination_bucket, destination_key = split_s3_uri(destination_object_arn)
+        try:
+            s3_client.head_object(Bucket=destination_bucket, Key=destination_key)
+            return
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "404":
+                raise
+        with copy_limiter:
+            replicate_artifact(source_object_arn, destination_object_arn)
+
+    with timed("ArtifactCopy"):
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(copy_concurrency, len(artifact_map)))
+        ) as executor:
+            list(executor.map(replicate, artifact_map.items()))
+
+    registered_map = dict(artifact_map)
+    checksum_metadata = verify_artifacts(artifact_map, destination_prefix, reused)
+    update: Dict[str, Any] = {}
+    if artifact_map != registered_map:
+        # shared copies found to differ from their source were copied again
+        update["InferenceSpecification"] = replace_artifacts(
+            model_package["InferenceSpecification"],
+            {
+                registered_map[source_object_arn]: destination_object_arn
+                for source_object_arn, destination_object_arn in artifact_map.items()
+                if registered_map[source_object_arn] != destination_object_arn
+            },
+        )
+
+    sagemaker_client.update_model_package(
+        ModelPackageArn=model_package_arn,
+        CustomerMetadataProperties={
+            **checksum_metadata,
+            replication.STATUS_PROPERTY: replication.AVAILABLE,
+        },
+        **update,
+    )
+    logger.info(f"Replicated {len(artifact_map)} artifacts of {model_package_arn}")
+    return f"Replicated artifacts of {model_package_arn}"
+
+
+def sync_event(event: Dict[str, Any]) -> str:
+    """Sync the model package of a model approval event.
 
+    When an idempotency table is configured, the outcome of each event is stored
+    in it: a repeated delivery of a synced event returns the stored outcome without
+    calling SageMaker or S3, and a delivery of an event still being synced raises
+    `IdempotencyAlreadyInProgressError` so it is retried later.
+
+    Args:
+        event (Dict[str, Any]): The SageMaker Model Package State Change event.
+
+    Returns:
+        str: A message describing the outcome of the sync.
+    """
+
+    return sync_model_package(event["detail"]["ModelPackageArn"])
+
+
+idempotency_config = None
+if idempotency_table_name:
+    # only imported when used, the idempotency utility takes long to import
+    from aws_lambda_powertools.utilities.idempotency import (
+        DynamoDBPersistenceLayer,
+        IdempotencyConfig,
+        idempotent_function,
+    )
+
+    idempotency_config = IdempotencyConfig(
+        # EventBridge redelivers an event with the same id
+        event_key_jmespath="[id, detail.ModelPackageArn]",
+        # events are retried by EventBridge for up to 24 hours
+        expires_after_seconds=24 * 60 * 60,
+    )
+    sync_event = idempotent_function(
+        data_keyword_argument="event",
+        config=idempotency_config,
+        persistence_store=DynamoDBPersistenceLayer(table_name=idempotency_table_name),
+    )(sync_event)
+
+
+def process_sqs_batch(event: Dict[str, Any], context: LambdaContext, record_handler):
+    """Process the records of an SQS batch, reporting the failed ones.
+
+    The batch utility is only imported when a function processes a batch, events
+    are not buffered by default.
+    """
+
+    from aws_lambda_powertools.utilities.batch import (
+        BatchProcessor,
+        EventType,
+        process_partial_response,
+    )
+
+    return process_partial_response(
+        event=event,
+        record_handler=record_handler,
+        processor=BatchProcessor(event_type=EventType.SQS),
+        context=context,
+    )
+
+
+def record_handler(record: "SQSRecord"):
+    """Sync the model package of an approval event buffered in the sync queue.
+
+    Raising marks the record as failed, so it is retried or sent to the
+    dead-letter queue without failing the rest of the batch.
+    """
+
+    sync_event(event=json.loads(record.body))
+
+
+def handle_event(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    # approval events buffered in the sync queue
+    if "Records" in event:
+        return process_sqs_batch(event, context, record_handler)
+
+    try:
+        message = sync_event(event=event)
     except ClientError as e:
-        logger.error("Model Package creation failed.")
-        return {"statusCode": 500, "body": json.dumps(e)}
+        if clients.is_throttling(e):
+            # still throttled after the client retries, let EventBridge retry the event
+            raise
+        return {"statusCode": 500, "body": json.dumps(str(e))}
 
     return {
         "statusCode": 200,
-        "body": json.dumps(f"Copied artifacts and registered Model: {package_arn}"),
+        "body": json.dumps(message),
     }
+
+
+def publish_api_metrics():
+    api_calls = clients.stats.snapshot(reset=True)
+    logger.info("AWS API calls", api_calls=api_calls)
+    for counter in ("Calls", "Retries", "Throttles"):
+        add_metric(
+            f"Api{counter}",
+            MetricUnit.Count,
+            sum(counts[counter] for counts in api_calls.values()),
+        )
+
+
+@logger.inject_lambda_context(log_event=True)
+@metrics.log_metrics
+def lambda_handler(event, context: LambdaContext):
+    if idempotency_config:
+        # expire in-flight idempotency records of invocations that timed out
+        idempotency_config.register_lambda_context(context)
+
+    try:
+        with timed("Sync"):
+            return handle_event(event, context)
+    finally:
+        publish_api_metrics()
+
+
+def replication_record_handler(record: "SQSRecord"):
+    """Replicate the artifacts of a central model package registered with deferred
+    replication.
+
+    The record is either a request sent by the sync function, or the approval
+    event of the central model package.
+    """
+
+    body = json.loads(record.body)
+    replicate_model_package(
+        body.get("ModelPackageArn") or body["detail"]["ModelPackageArn"]
+    )
+
+
+@logger.inject_lambda_context(log_event=True)
+@metrics.log_metrics
+def replication_handler(event, context: LambdaContext):
+    try:
+        with timed("Replication"):
+            return process_sqs_batch(event, context, replication_record_handler)
+    finally:
+        publish_api_metrics()
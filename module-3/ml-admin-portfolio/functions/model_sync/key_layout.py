@@ -0,0 +1,63 @@
+"""Layout of the keys of the artifacts copied to the central artifact bucket.
+
+With the `prefixed` layout, the artifacts of a model package are copied under
+`{destination_prefix}/{source_key}`, so every request for the artifacts of a
+model package group goes to the same prefix. The `hashed` layout prepends a
+shard derived from the hash of that key, `{shard}/{destination_prefix}/{source_key}`,
+so S3 can spread the requests for a hot group across partitions. The shard has
+a fixed width, so the layout is reversible with `unshard_key`.
+"""
+
+import hashlib
+
+PREFIXED = "prefixed"
+HASHED = "hashed"
+LAYOUTS = (PREFIXED, HASHED)
+
+# hex digits of the shard, 2 digits spread the keys across 256 prefixes
+DEFAULT_SHARD_WIDTH = 2
+
+
+def shard(key: str, shard_width: int = DEFAULT_SHARD_WIDTH) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()[:shard_width]
+
+
+def destination_key(
+    destination_prefix: str,
+    source_key: str,
+    layout: str = PREFIXED,
+    shard_width: int = DEFAULT_SHARD_WIDTH,
+) -> str:
+    """Key of the copy of an artifact in the central artifact bucket.
+
+    Args:
+        destination_prefix (str): The prefix of the model package group.
+        source_key (str): The key of the artifact in the source bucket.
+        layout (str): One of `LAYOUTS`.
+        shard_width (int): The number of hex digits of the shard of the hashed layout.
+
+    Returns:
+        str: The key of the copy.
+    """
+
+    key = f"{destination_prefix}/{source_key}"
+    if layout == PREFIXED:
+        return key
+    if layout == HASHED:
+        return f"{shard(key, shard_width)}/{key}"
+    raise ValueError(f"Unknown key layout {layout}")
+
+
+def unshard_key(
+    key: str, layout: str = PREFIXED, shard_width: int = DEFAULT_SHARD_WIDTH
+) -> str:
+    """Reverse `destination_key`, returning `{destination_prefix}/{source_key}`."""
+
+    if layout == PREFIXED:
+        return key
+    if layout == HASHED:
+        key_shard, _, unsharded_key = key.partition("/")
+        if key_shard != shard(unsharded_key, shard_width):
+            raise ValueError(f"{key} does not follow the {layout} key layout")
+        return unsharded_key
+    raise ValueError(f"Unknown key layout {layout}")
@@ -0,0 +1,268 @@
+"""Dry-run planner of the sync of model packages to the central model registry.
+
+The planner walks a model package like the sync function does and heads every
+artifact, without copying anything or registering any package. It reports the
+artifacts to copy, their total size, the artifacts already present in the
+artifact bucket and an estimate of the copy time with the configured copy
+concurrency, to size the timeout and memory of the sync function before
+onboarding an account.
+
+An artifact is present when the sync would reuse it instead of copying it: its
+content is in the content index, or, in the plan of a group, it is copied for an
+earlier package of the plan.
+
+The planner is deployed as its own function with read-only permissions. Invoke
+it with the ARN of a source model package, or of a source model package group
+to plan the sync of all its approved packages:
+
+    {"ModelPackageArn": "arn:aws:sagemaker:<region>:<account>:model-package/<group>/<version>"}
+    {"ModelPackageGroupArn": "arn:aws:sagemaker:<region>:<account>:model-package-group/<group>",
+     "ThroughputMiBps": 75}
+"""
+
+import heapq
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from botocore.exceptions import ClientError
+
+import content_index
+import copy_engine
+import index
+import sync_index
+
+# observed throughput of a single server side copy request
+DEFAULT_THROUGHPUT_MIBPS = 75
+# latency of the calls made for each artifact, besides the copy itself
+REQUEST_OVERHEAD_SECONDS = 0.2
+
+
+def copy_seconds(size: int, throughput_mibps: float) -> float:
+    """Estimate the time to copy an artifact with `copy_engine.copy_object`.
+
+    Args:
+        size (int): The size of the artifact in bytes.
+        throughput_mibps (float): The throughput of a single copy request in MiB/s.
+
+    Returns:
+        float: The estimated copy time in seconds.
+    """
+
+    streams = 1
+    if size > min(index.multipart_threshold, copy_engine.MAX_SINGLE_COPY_SIZE):
+        parts = len(copy_engine.part_ranges(size, index.multipart_part_size))
+        streams = min(index.multipart_concurrency, parts)
+    return REQUEST_OVERHEAD_SECONDS + size / (
+        throughput_mibps * copy_engine.MiB * streams
+    )
+
+
+def schedule_seconds(durations: List[float], workers: int) -> float:
+    """Estimate the time to run tasks on a pool of workers, longest tasks first."""
+
+    finish_times = [0.0] * max(1, workers)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(finish_times, finish_times[0] + duration)
+    return max(finish_times)
+
+
+def package_seconds(artifact_plans: List[Dict[str, Any]]) -> float:
+    return schedule_seconds(
+        [a["EstimatedSeconds"] for a in artifact_plans if not a["Present"]],
+        index.copy_concurrency,
+    )
+
+
+def plan_artifact(
+    source_object_arn: str, destination_prefix: str, throughput_mibps: float
+) -> Dict[str, Any]:
+    source = index.head_artifact(source_object_arn)
+    destination_key = index.artifact_destination_key(
+        source_object_arn, destination_prefix
+    )
+
+    # same rule as `index.copy_artifact`, an object at the destination key is copied again
+    present_key = None
+    if index.content_deduplication:
+        present_key = content_index.find(
+            index.s3_client, index.destination_bucket_name, source
+        )
+
+    size = source["ContentLength"]
+    return {
+        "Source": source_object_arn,
+        "Destination": f"s3://{index.destination_bucket_name}/{present_key or destination_key}",
+        "ContentId": (
+            content_index.content_id(source) if index.content_deduplication else None
+        ),
+        "Size": size,
+        "Present": present_key is not None,
+        "Multipart": size
+        > min(index.multipart_threshold, copy_engine.MAX_SINGLE_COPY_SIZE),
+        "EstimatedSeconds": 0 if present_key else copy_seconds(size, throughput_mibps),
+    }
+
+
+def is_synced(source_model_package_arn: str, target_model_package_group: str) -> bool:
+    """Check if a model package was synced, without building the sync index."""
+
+    try:
+        index.sagemaker_client.describe_model_package_group(
+            ModelPackageGroupName=target_model_package_group
+        )
+    except ClientError:
+        return False
+
+    if index.sync_index_table_name and sync_index.is_group_indexed(
+        index.dynamodb_client, index.sync_index_table_name, target_model_package_group
+    ):
+        return (
+            sync_index.lookup(
+                index.dynamodb_client,
+                index.sync_index_table_name,
+                source_model_package_arn,
+            )
+            is not None
+        )
+    return index.scan_pkg_already_exists(
+        source_model_package_arn, target_model_package_group
+    )
+
+
+def plan_model_package(
+    source_model_package_arn: str, throughput_mibps: float = DEFAULT_THROUGHPUT_MIBPS
+) -> Dict[str, Any]:
+    """Plan the sync of a model package.
+
+    Args:
+        source_model_package_arn (str): The ARN of the source model package.
+        throughput_mibps (float): The throughput of a single copy request in MiB/s.
+
+    Returns:
+        Dict[str, Any]: The plan of the sync, with the plan of each artifact.
+    """
+
+    model_package = index.sagemaker_client.describe_model_package(
+        ModelPackageName=source_model_package_arn
+    )
+    source_account_id = source_model_package_arn.split(":")[4]
+    target_model_package_group = (
+        f"{model_package['ModelPackageGroupName']}-{source_account_id}"
+    )
+    plan: Dict[str, Any] = {
+        "ModelPackageArn": source_model_package_arn,
+        "TargetModelPackageGroupName": target_model_package_group,
+        "AlreadySynced": is_synced(
+            source_model_package_arn, target_model_package_group
+        ),
+    }
+    if plan["AlreadySynced"]:
+        return {**plan, "Artifacts": [], "EstimatedSeconds": 0}
+
+    artifacts = index.collect_artifacts(model_package)
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(index.copy_concurrency, len(artifacts)))
+    ) as executor:
+        artifact_plans = list(
+            executor.map(
+                lambda uri: plan_artifact(
+                    uri, target_model_package_group, throughput_mibps
+                ),
+                artifacts,
+            )
+        )
+    return {
+        **plan,
+        "Artifacts": artifact_plans,
+        "EstimatedSeconds": package_seconds(artifact_plans),
+    }
+
+
+def deduplicate(package_plans: List[Dict[str, Any]]):
+    """Mark the artifacts copied for an earlier package of a plan as present.
+
+    The sync of the first package records the copy in the content index, the
+    following packages reuse it. Artifacts without a content id are copied by
+    every package, as they are by the sync.
+
+    Args:
+        package_plans (List[Dict[str, Any]]): The plan of each package, in order.
+    """
+
+    copied: Dict[str, str] = {}
+    for package_plan in package_plans:
+        for artifact in package_plan["Artifacts"]:
+            if artifact["Present"] or not (content := artifact["ContentId"]):
+                continue
+            if content in copied:
+                artifact.update(
+                    Present=True, Destination=copied[content], EstimatedSeconds=0
+                )
+            else:
+                copied[content] = artifact["Destination"]
+        if package_plan["Artifacts"]:
+            package_plan["EstimatedSeconds"] = package_seconds(
+                package_plan["Artifacts"]
+            )
+
+
+def summarize(package_plans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    artifacts = [a for p in package_plans for a in p["Artifacts"]]
+    to_copy = [a for a in artifacts if not a["Present"]]
+    return {
+        "PackagesToSync": sum(not p["AlreadySynced"] for p in package_plans),
+        "PackagesAlreadySynced": sum(p["AlreadySynced"] for p in package_plans),
+        "ObjectsToCopy": len(to_copy),
+        "BytesToCopy": sum(a["Size"] for a in to_copy),
+        "ObjectsPresent": len(artifacts) - len(to_copy),
+        "BytesPresent": sum(a["Size"] for a in artifacts if a["Present"]),
+        "LargestObjectBytes": max((a["Size"] for a in to_copy), default=0),
+        # each package is synced by its own invocation
+        "MaxPackageEstimatedSeconds": math.ceil(
+            max((p["EstimatedSeconds"] for p in package_plans), default=0)
+        ),
+        "TotalEstimatedSeconds": math.ceil(
+            sum(p["EstimatedSeconds"] for p in package_plans)
+        ),
+        "CopyConcurrency": index.copy_concurrency,
+        "MultipartConcurrency": index.multipart_concurrency,
+    }
+
+
+def plan(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Plan the sync of a model package, or of the approved packages of a group.
+
+    Args:
+        event (Dict[str, Any]): The `ModelPackageArn` of a source model package, or
+            the `ModelPackageGroupArn` of a source model package group, and
+            optionally the `ThroughputMiBps` of a single copy request.
+
+    Returns:
+        Dict[str, Any]: The summary of the plan, and the plan of each package.
+    """
+
+    throughput_mibps = float(event.get("ThroughputMiBps", DEFAULT_THROUGHPUT_MIBPS))
+    if group_arn := event.get("ModelPackageGroupArn"):
+        paginator = index.sagemaker_client.get_paginator("list_model_packages")
+        source_model_package_arns = [
+            package["ModelPackageArn"]
+            for page in paginator.paginate(
+                ModelPackageGroupName=group_arn, ModelApprovalStatus="Approved"
+            )
+            for package in page["ModelPackageSummaryList"]
+        ]
+    else:
+        source_model_package_arns = [event["ModelPackageArn"]]
+
+    package_plans = [
+        plan_model_package(arn, throughput_mibps) for arn in source_model_package_arns
+    ]
+    deduplicate(package_plans)
+    return {"Summary": summarize(package_plans), "Packages": package_plans}
+
+
+@index.logger.inject_lambda_context(log_event=True)
+def plan_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    return plan(event)
@@ -0,0 +1,246 @@
+"""Reconcile source model registries with the central model registry.
+
+Syncs every approved model package of the given source model package groups that
+is missing from the central model registry, reusing the logic of the sync
+function. Use it to backfill the registry of a newly onboarded workload account
+instead of replaying its approval events.
+
+Run it with credentials of the central account, from this directory:
+
+    python reconcile.py \\
+        --source-group arn:aws:sagemaker:<region>:<account>:model-package-group/<name> \\
+        --artifact-bucket mlops-model-artifacts-<account>-<region> \\
+        --kms-key-arn <artifact bucket key arn> \\
+        --sync-index-table <sync index table name>
+
+The outcome of every package is written to a checkpoint file as it completes, a
+second run with the same checkpoint file only syncs the packages not yet synced.
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger("reconcile")
+
+
+def list_approved_packages(sagemaker_client: Any, source_group_arn: str) -> List[str]:
+    """List the approved model packages of a source model package group.
+
+    Args:
+        sagemaker_client: The boto3 SageMaker client.
+        source_group_arn (str): The ARN of the source model package group.
+
+    Returns:
+        List[str]: The ARNs of the approved model packages.
+    """
+
+    paginator = sagemaker_client.get_paginator("list_model_packages")
+    return [
+        package["ModelPackageArn"]
+        for page in paginator.paginate(
+            ModelPackageGroupName=source_group_arn, ModelApprovalStatus="Approved"
+        )
+        for package in page["ModelPackageSummaryList"]
+    ]
+
+
+def target_group_name(source_group_arn: str) -> str:
+    """Name of the central model package group of a source model package group."""
+
+    return f"{source_group_arn.split('/')[-1]}-{source_group_arn.split(':')[4]}"
+
+
+class Checkpoint:
+    """Outcome of each model package, persisted to a JSON file after every update.
+
+    Args:
+        path (str): The path of the checkpoint file, loaded if it exists.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state: Dict[str, Any] = {"synced": {}, "failed": {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def is_synced(self, source_model_package_arn: str) -> bool:
+        return source_model_package_arn in self.state["synced"]
+
+    def update(self, source_model_package_arn: str, outcome: str, synced: bool):
+        with self.lock:
+            self.state["failed"].pop(source_model_package_arn, None)
+            self.state["synced" if synced else "failed"][
+                source_model_package_arn
+            ] = outcome
+            # write to a temporary file first so an interrupted run keeps the last state
+            with open(f"{self.path}.tmp", "w") as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(f"{self.path}.tmp", self.path)
+
+
+def find_missing(
+    index: Any,
+    source_group_arns: List[str],
+    checkpoint: Checkpoint,
+    dry_run: bool = False,
+) -> List[str]:
+    """Find the approved source model packages missing from the central registry.
+
+    Args:
+        index: The sync function module.
+        source_group_arns (List[str]): The ARNs of the source model package groups.
+        checkpoint (Checkpoint): The outcome of previous runs.
+        dry_run (bool): Look the packages up without building the sync index.
+
+    Returns:
+        List[str]: The ARNs of the model packages to sync.
+    """
+
+    missing = []
+    for source_group_arn in source_group_arns:
+        packages = [
+            arn
+            for arn in list_approved_packages(index.sagemaker_client, source_group_arn)
+            if not checkpoint.is_synced(arn)
+        ]
+        target_group = target_group_name(source_group_arn)
+        exists = (
+            index.lookup_pkg_already_exists
+            if dry_run
+            else index.check_pkg_already_exists
+        )
+        try:
+            index.sagemaker_client.describe_model_package_group(
+                ModelPackageGroupName=target_group
+            )
+        except ClientError:
+            # nothing of this group was synced yet
+            group_missing = packages
+        else:
+            group_missing = [arn for arn in packages if not exists(arn, target_group)]
+        logger.info(
+            f"{source_group_arn}: {len(packages)} approved packages to check, "
+            f"{len(group_missing)} missing from {target_group}"
+        )
+        missing.extend(group_missing)
+    return missing
+
+
+def reconcile(
+    index: Any,
+    source_group_arns: List[str],
+    checkpoint: Checkpoint,
+    concurrency: int = 4,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Sync the approved source model packages missing from the central registry.
+
+    Args:
+        index: The sync function module.
+        source_group_arns (List[str]): The ARNs of the source model package groups.
+        checkpoint (Checkpoint): The outcome of previous runs, updated as packages complete.
+        concurrency (int): The maximum number of model packages synced at the same time.
+        dry_run (bool): Only report the missing model packages.
+
+    Returns:
+        Dict[str, int]: The number of missing, synced and failed model packages.
+    """
+
+    missing = find_missing(index, source_group_arns, checkpoint, dry_run=dry_run)
+    report = {"missing": len(missing), "synced": 0, "failed": 0}
+    if dry_run:
+        for arn in missing:
+            logger.info(f"Missing: {arn}")
+        return report
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(index.sync_model_package, arn): arn for arn in missing
+        }
+        for future in as_completed(futures):
+            arn = futures[future]
+            try:
+                checkpoint.update(arn, future.result(), synced=True)
+                report["synced"] += 1
+            except Exception as e:
+                logger.error(f"Sync of {arn} failed: {e}")
+                checkpoint.update(arn, str(e), synced=False)
+                report["failed"] += 1
+            logger.info(
+                f"Progress: {report['synced'] + report['failed']}/{len(missing)} "
+                f"({report['synced']} synced, {report['failed']} failed)"
+            )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--source-group",
+        action="append",
+        default=[],
+        help="ARN of a source model package group, can be repeated",
+    )
+    parser.add_argument(
+        "--source-groups-file",
+        help="File with the ARN of a source model package group per line",
+    )
+    parser.add_argument("--artifact-bucket", required=True)
+    parser.add_argument("--kms-key-arn", help="KMS key of the artifact bucket")
+    parser.add_argument("--sync-index-table", help="Name of the sync index table")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of model packages synced at the same time",
+    )
+    parser.add_argument("--checkpoint", default="reconcile-checkpoint.json")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report the missing packages"
+    )
+    args = parser.parse_args()
+
+    source_group_arns = list(args.source_group)
+    if args.source_groups_file:
+        with open(args.source_groups_file) as f:
+            source_group_arns.extend(line.strip() for line in f if line.strip())
+    if not source_group_arns:
+        parser.error("at least one source model package group is required")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    # the sync function is configured through its environment, set it before import
+    os.environ["ArtifactBucketName"] = args.artifact_bucket
+    if args.kms_key_arn:
+        os.environ["ArtifactBucketKmsKeyArn"] = args.kms_key_arn
+    if args.sync_index_table:
+        os.environ["SyncIndexTableName"] = args.sync_index_table
+    os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "model-sync-reconcile")
+    # the sync metrics are only published from the function
+    os.environ.setdefault("POWERTOOLS_METRICS_NAMESPACE", "MLOps/ModelSync")
+    os.environ.setdefault("POWERTOOLS_METRICS_DISABLED", "true")
+    import index
+
+    report = reconcile(
+        index,
+        source_group_arns,
+        Checkpoint(args.checkpoint),
+        concurrency=args.concurrency,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(report, indent=2))
+    if report["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
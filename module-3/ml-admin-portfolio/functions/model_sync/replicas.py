@@ -0,0 +1,143 @@
+"""Replicas of the synced model packages in other regions.
+
+A replica region has its own artifact bucket, and a model package group of the
+same name as in the central region. The artifacts of a synced model package are
+copied from the central artifact bucket to the bucket of each replica region,
+under the same key, and a model package referencing the regional copies is
+registered there. The ARN of the regional model package is recorded in the
+metadata properties of the central model package, under `metadata_key(region)`,
+so deployments in a replica region can read the nearest copy.
+
+The container images are not copied: the ECR images of the regional model
+package point at the same repositories in the replica region, which ECR
+replication keeps in sync, and a package whose images have no regional copy is
+not replicated.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+METADATA_PREFIX = "ReplicaArn."
+# <registry>.dkr.ecr.<region>.<domain>/<repository>[:<tag>][@<digest>]
+ECR_IMAGE = re.compile(
+    r"^(?P<registry>\d{12})\.dkr\.ecr\.(?P<region>[a-z0-9-]+)"
+    r"\.(?P<domain>amazonaws\.com(?:\.cn)?)/(?P<repository>[^:@]+)"
+    r"(?::(?P<tag>[^@]+))?(?:@(?P<digest>.+))?$"
+)
+
+
+class MissingRegionalImageError(Exception):
+    """A container image of a model package has no copy in a replica region."""
+
+
+def metadata_key(region: str) -> str:
+    """Key of the ARN of a regional model package in the metadata of the central one."""
+
+    return f"{METADATA_PREFIX}{region}"
+
+
+def index_key(source_model_package_arn: str, region: str) -> str:
+    """Key of a regional model package in the sync index."""
+
+    return f"{source_model_package_arn}#{region}"
+
+
+def regional_uri(uri: str, bucket_name: str) -> str:
+    _, key = uri.removeprefix("s3://").split("/", 1)
+    return f"s3://{bucket_name}/{key}"
+
+
+def regional_image(ecr_client: Any, image: str, region: str) -> str:
+    """Rewrite the URI of a container image for a region.
+
+    Images of other registries than ECR are not regional and are kept as is.
+
+    Args:
+        ecr_client: The boto3 ECR client of the region.
+        image (str): The URI of the image in the central model package.
+        region (str): The replica region.
+
+    Raises:
+        MissingRegionalImageError: If the repository or the image does not exist
+            in the region.
+
+    Returns:
+        str: The URI of the image in the region.
+    """
+
+    if (match := ECR_IMAGE.match(image)) is None:
+        return image
+    registry, repository = match["registry"], match["repository"]
+    regional = image.replace(f".dkr.ecr.{match['region']}.", f".dkr.ecr.{region}.", 1)
+    image_id = (
+        {"imageDigest": match["digest"]}
+        if match["digest"]
+        else {"imageTag": match["tag"] or "latest"}
+    )
+    try:
+        ecr_client.describe_images(
+            registryId=registry, repositoryName=repository, imageIds=[image_id]
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] not in (
+            "RepositoryNotFoundException",
+            "ImageNotFoundException",
+        ):
+            raise
+        raise MissingRegionalImageError(
+            f"The image {image} has no copy {regional} in {region}, "
+            f"replicate the ECR repository {repository} to {region}"
+        ) from e
+    return regional
+
+
+def regional_policy(policy: str, central_region: str, region: str) -> str:
+    """Rewrite the resource policy of a central model package group for a region."""
+
+    return policy.replace(f":sagemaker:{central_region}:", f":sagemaker:{region}:")
+
+
+def regional_metadata(
+    metadata: Dict[str, str], renamed_keys: Dict[str, str]
+) -> Dict[str, str]:
+    """Metadata properties of a regional model package, without replica ARNs.
+
+    Args:
+        metadata (Dict[str, str]): The metadata properties of the central package.
+        renamed_keys (Dict[str, str]): The keys to rename, such as the checksums
+            of the artifacts, which are keyed on the URI of each artifact.
+    """
+
+    return {
+        renamed_keys.get(key, key): value
+        for key, value in metadata.items()
+        if not key.startswith(METADATA_PREFIX)
+    }
+
+
+def ensure_model_package_group(
+    sagemaker_client: Any, model_package_group_name: str, policy: Optional[str]
+):
+    """Create a regional model package group if needed, and set its resource policy.
+
+    Args:
+        sagemaker_client: The boto3 SageMaker client of the region.
+        model_package_group_name (str): The name of the model package group.
+        policy (str, optional): The resource policy of the group, granting the
+            deployment accounts access as the central group does.
+    """
+
+    try:
+        sagemaker_client.describe_model_package_group(
+            ModelPackageGroupName=model_package_group_name
+        )
+    except ClientError:
+        sagemaker_client.create_model_package_group(
+            ModelPackageGroupName=model_package_group_name
+        )
+    if policy:
+        sagemaker_client.put_model_package_group_policy(
+            ModelPackageGroupName=model_package_group_name, ResourcePolicy=policy
+        )
@@ -0,0 +1,100 @@
+"""Deferred replication of the artifacts of synced model packages.
+
+With deferred replication a model package is registered in the central registry
+before its artifacts are copied. The package is marked with the `ArtifactStatus`
+metadata property set to `Pending`, and a manifest mapping each source artifact
+to the location referenced by the central package is written under
+`replication-manifests/` in the artifact bucket. Once every artifact of the
+manifest is copied the status is set to `Available`.
+
+The replication runs either right after the registration, or only when the
+central package is approved for deployment.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+MANIFEST_PREFIX = "replication-manifests"
+STATUS_PROPERTY = "ArtifactStatus"
+MANIFEST_PROPERTY = "ArtifactManifest"
+PENDING = "Pending"
+AVAILABLE = "Available"
+
+EAGER = "eager"
+BACKGROUND = "background"
+ON_DEMAND = "on-demand"
+REPLICATION_MODES = (EAGER, BACKGROUND, ON_DEMAND)
+
+
+def manifest_key(source_model_package_arn: str) -> str:
+    digest = hashlib.sha256(source_model_package_arn.encode()).hexdigest()
+    return f"{MANIFEST_PREFIX}/{digest}.json"
+
+
+def write_manifest(
+    s3_client: Any,
+    bucket_name: str,
+    source_model_package_arn: str,
+    artifact_map: Dict[str, str],
+    encryption_args: Optional[Dict[str, str]] = None,
+) -> str:
+    """Write the replication manifest of a model package.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        bucket_name (str): The name of the artifact bucket.
+        source_model_package_arn (str): The ARN of the source model package.
+        artifact_map (Dict[str, str]): A mapping of the source S3 URIs of the
+            artifacts to the S3 URIs referenced by the central model package.
+        encryption_args (Dict[str, str], optional): The server side encryption
+            arguments of the artifact bucket.
+
+    Returns:
+        str: The key of the manifest in the artifact bucket.
+    """
+
+    key = manifest_key(source_model_package_arn)
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=json.dumps(
+            {
+                "SourceModelPackageArn": source_model_package_arn,
+                "Artifacts": artifact_map,
+            }
+        ).encode(),
+        ContentType="application/json",
+        **(encryption_args or {}),
+    )
+    return key
+
+
+def read_manifest(s3_client: Any, bucket_name: str, key: str) -> Dict[str, str]:
+    """Read the artifact mapping of a replication manifest.
+
+    Args:
+        s3_client: The boto3 S3 client.
+        bucket_name (str): The name of the artifact bucket.
+        key (str): The key of the manifest in the artifact bucket.
+
+    Returns:
+        Dict[str, str]: A mapping of the source S3 URIs of the artifacts to the
+            S3 URIs referenced by the central model package.
+    """
+
+    manifest = s3_client.get_object(Bucket=bucket_name, Key=key)
+    return json.loads(manifest["Body"].read())["Artifacts"]
+
+
+def pending_metadata(manifest: str) -> Dict[str, str]:
+    return {STATUS_PROPERTY: PENDING, MANIFEST_PROPERTY: manifest}
+
+
+def is_pending(model_package: Dict[str, Any]) -> bool:
+    """Check if the artifacts of a central model package still have to be replicated."""
+
+    return (
+        model_package.get("CustomerMetadataProperties", {}).get(STATUS_PROPERTY)
+        == PENDING
+    )
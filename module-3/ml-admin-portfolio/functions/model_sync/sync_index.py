@@ -0,0 +1,245 @@
+"""Index of the model packages already synced to the central model registry.
+
+Each item maps the ARN of a source model package to the ARN of its copy in the
+central registry. A marker item per target model package group records that the
+index holds every package of that group, groups without a marker are rebuilt
+from the registry the first time they are looked up. Deleting the marker of a
+group forces a rebuild.
+
+Before a model package is registered, a pending item without a target ARN claims
+its sync, see `claim`. A retry of a sync interrupted between the registration
+and the `record` of the package then finds the claim instead of registering the
+package again.
+"""
+
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+KEY = "SourceModelPackageArn"
+GROUP_MARKER_PREFIX = "model-package-group/"
+
+# a claim older than the timeout of the sync function was left by an interrupted sync
+CLAIM_TIMEOUT_SECONDS = 15 * 60
+
+
+class SyncInProgressError(Exception):
+    pass
+
+
+def get_entry(
+    dynamodb_client: Any, table_name: str, source_model_package_arn: str
+) -> Optional[Dict[str, Any]]:
+    """Get the index item of a source model package, synced or claimed.
+
+    Args:
+        dynamodb_client: The boto3 DynamoDB client.
+        table_name (str): The name of the index table.
+        source_model_package_arn (str): The ARN of the source model package.
+
+    Returns:
+        Dict[str, Any] | None: The item, or None if the package was neither synced
+            nor claimed.
+    """
+
+    return dynamodb_client.get_item(
+        TableName=table_name,
+        Key={KEY: {"S": source_model_package_arn}},
+        ConsistentRead=True,
+    ).get("Item")
+
+
+def lookup(
+    dynamodb_client: Any, table_name: str, source_model_package_arn: str
+) -> Optional[str]:
+    """Get the central copy of a source model package.
+
+    Args:
+        dynamodb_client: The boto3 DynamoDB client.
+        table_name (str): The name of the index table.
+        source_model_package_arn (str): The ARN of the source model package.
+
+    Returns:
+        str | None: The ARN of the synced model package, or None if it was not synced.
+    """
+
+    item = get_entry(dynamodb_client, table_name, source_model_package_arn)
+    # a claimed package is not synced until it is recorded
+    return (
+        item["TargetModelPackageArn"]["S"]
+        if item and "TargetModelPackageArn" in item
+        else None
+    )
+
+
+def record(
+    dynamodb_client: Any,
+    table_name: str,
+    source_model_package_arn: str,
+    target_model_package_arn: str,
+    target_model_package_group: str,
+):
+    """Add a synced model package to the index.
+
+    Args:
+        dynamodb_client: The boto3 DynamoDB client.
+        table_name (str): The name of the index table.
+        source_model_package_arn (str): The ARN of the source model package.
+        target_model_package_arn (str): The ARN of the synced model package.
+        target_model_package_group (str): The name of the target model package group.
+    """
+
+    dynamodb_client.put_item(
+        TableName=table_name,
+        Item={
+            KEY: {"S": source_model_package_arn},
+            "TargetModelPackageArn": {"S": target_model_package_arn},
+            "TargetModelPackageGroupName": {"S": target_model_package_group},
+        },
+    )
+
+
+def claim(
+    dynamodb_client: Any,
+    table_name: str,
+    source_model_package_arn: str,
+    target_model_package_group: str,
+    claimed_at: int,
+    previous_claim: Optional[int] = None,
+) -> bool:
+    """Claim the sync of a model package with a pending item, before registering it.
+
+    Args:
+        dynamodb_client: The boto3 DynamoDB client.
+        table_name (str): The name of the index table.
+        source_model_package_arn (str): The ARN of the source model package.
+        target_model_package_group (str): The name of the target model package group.
+        claimed_at (int): The time of the claim, in seconds since the epoch.
+        previous_claim (int, optional): The time of a stale claim to take over.
+            Without it, the package must not be in the index yet.
+
+    Returns:
+        boolean: True if the sync was claimed, False if the package was synced or
+            claimed by another sync in the meantime.
+    """
+
+    condition: Dict[str, Any] = {"ConditionExpression": f"attribute_not_exists({KEY})"}
+    if previous_claim is not None:
+        condition = {
+            "ConditionExpression": "ClaimedAt = :previous_claim",
+            "ExpressionAttributeValues": {
+                ":previous_claim": {"N": str(previous_claim)}
+            },
+        }
+    try:
+        dynamodb_client.put_item(
+            TableName=table_name,
+            Item={
+                KEY: {"S": source_model_package_arn},
+                "TargetModelPackageGroupName": {"S": target_model_package_group},
+                "ClaimedAt": {"N": str(claimed_at)},
+            },
+            **condition,
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+    return True
+
+
+def release(
+    dynamodb_client: Any,
+    table_name: str,
+    source_model_package_arn: str,
+    claimed_at: int,
+):
+    """Remove the claim of a sync that failed before registering the model package.
+
+    Args:
+        dynamodb_client: The boto3 DynamoDB client.
+        table_name (str): The name of the index table.
+        source_model_package_arn (str): The ARN of the source model package.
+        claimed_at (int): The time of the claim, a newer claim is kept.
+    """
+
+    try:
+        dynamodb_client.delete_item(
+            TableName=table_name,
+            Key={KEY: {"S": source_model_package_arn}},
+            ConditionExpression="ClaimedAt = :claimed_at",
+            ExpressionAttributeValues={":claimed_at": {"N": str(claimed_at)}},
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+
+def is_group_indexed(
+    dynamodb_client: Any, table_name: str, target_model_package_group: str
+) -> bool:
+    """Check if the index holds every model package of a target model package group.
+
+    Args:
+        dynamodb_client: The boto3 DynamoDB client.
+        table_name (str): The name of the index table.
+        target_model_package_group (str): The name of the target model package group.
+
+    Returns:
+        boolean: True if the group was indexed, False otherwise.
+    """
+
+    # the marker is read on every check, so deleting it takes effect right away
+    return (
+        get_entry(
+            dynamodb_client,
+            table_name,
+            f"{GROUP_MARKER_PREFIX}{target_model_package_group}",
+        )
+        is not None
+    )
+
+
+def rebuild(
+    dynamodb_client: Any,
+    sagemaker_client: Any,
+    table_name: str,
+    target_model_package_group: str,
+) -> int:
+    """Rebuild the index of a target model package group from the model registry.
+
+    Args:
+        dynamodb_client: The boto3 DynamoDB client.
+        sagemaker_client: The boto3 SageMaker client.
+        table_name (str): The name of the index table.
+        target_model_package_group (str): The name of the target model package group.
+
+    Returns:
+        int: The number of synced model packages found in the group.
+    """
+
+    count = 0
+    paginator = sagemaker_client.get_paginator("list_model_packages")
+    for summary in paginator.paginate(ModelPackageGroupName=target_model_package_group):
+        for package in summary["ModelPackageSummaryList"]:
+            metadata = sagemaker_client.describe_model_package(
+                ModelPackageName=package["ModelPackageArn"]
+            ).get("CustomerMetadataProperties", {})
+            if original_arn := metadata.get("OriginalARN"):
+                record(
+                    dynamodb_client,
+                    table_name,
+                    original_arn,
+                    package["ModelPackageArn"],
+                    target_model_package_group,
+                )
+                count += 1
+
+    dynamodb_client.put_item(
+        TableName=table_name,
+        Item={
+            KEY: {"S": f"{GROUP_MARKER_PREFIX}{target_model_package_group}"},
+            "TargetModelPackageGroupName": {"S": target_model_package_group},
+        },
+    )
+    return count
@@ -0,0 +1,172 @@
+"""Provider of the seed code check-in custom resource of the SageMaker projects.
+
+The function is deployed once per account, and is the service token of the
+`Custom::LambdaInvoker` resource of every project product. A create request
+starts the CodeBuild project named in `CODEBUILD_PROJECT_NAME`, which pushes the
+seed code to the git repository of the project, and returns as soon as the
+build is started. The request is kept in a SecureString SSM parameter named
+after the build, and the function is invoked again by the state change event of
+the build to respond to the custom resource, so it is not billed while the build
+runs. The presigned response URL is never visible in the build.
+"""
+
+import json
+from typing import Any, Dict, List
+
+import boto3
+import cfnresponse
+
+# requests waiting for their build, keyed on the build id
+REQUEST_PARAMETER_PREFIX = "/mlops/seedcode-checkin/"
+# the request fields needed to respond once the build completes
+REQUEST_FIELDS = ("ResponseURL", "StackId", "RequestId", "LogicalResourceId")
+
+
+def lambda_handler(event: Dict[str, Any], context: Any):
+    if event.get("source") == "aws.codebuild":
+        return on_build_state_change(event, context)
+
+    if event["RequestType"] != "Create":
+        cfnresponse.send(
+            event,
+            context,
+            cfnresponse.SUCCESS,
+            {},
+            physicalResourceId=event.get("PhysicalResourceId"),
+        )
+        return
+
+    try:
+        build = boto3.client("codebuild").start_build(
+            projectName=event["ResourceProperties"]["CODEBUILD_PROJECT_NAME"],
+            environmentVariablesOverride=get_build_environment_variables_override(
+                event
+            ),
+            secondarySourcesOverride=get_secondary_sources_override(event),
+        )["build"]
+        put_request(build["id"], event)
+    except Exception as e:
+        cfnresponse.send(
+            event,
+            context,
+            cfnresponse.FAILED,
+            {},
+            reason=f"Codebuild to checkin seedcode could not start: {e}",
+        )
+
+
+def on_build_state_change(event: Dict[str, Any], context: Any):
+    """Respond to the custom resource request a completed build was started for."""
+
+    build_id = event["detail"]["build-id"]
+    ssm_client = boto3.client("ssm")
+    try:
+        parameter = ssm_client.get_parameter(
+            Name=request_parameter_name(build_id), WithDecryption=True
+        )
+    except ssm_client.exceptions.ParameterNotFound:
+        # builds started outside of a custom resource request
+        return
+
+    request = json.loads(parameter["Parameter"]["Value"])
+    build_status = event["detail"]["build-status"]
+    if build_status == "SUCCEEDED":
+        cfnresponse.send(
+            request,
+            context,
+            cfnresponse.SUCCESS,
+            {"url": request["RepositoryURL"]},
+            physicalResourceId=build_id,
+        )
+    else:
+        cfnresponse.send(
+            request,
+            context,
+            cfnresponse.FAILED,
+            {},
+            physicalResourceId=build_id,
+            reason=f"Codebuild to checkin seedcode has status {build_status}",
+        )
+    ssm_client.delete_parameter(Name=request_parameter_name(build_id))
+
+
+def request_parameter_name(build_id: str) -> str:
+    # build ids are <project name>:<uuid>, and colons are not allowed in names
+    return REQUEST_PARAMETER_PREFIX + build_id.replace(":", "/")
+
+
+def put_request(build_id: str, event: Dict[str, Any]):
+    """Keep the request a build was started for, until the build completes."""
+
+    request = {key: event[key] for key in REQUEST_FIELDS}
+    request["RepositoryURL"] = get_repository_url(event)
+    boto3.client("ssm").put_parameter(
+        Name=request_parameter_name(build_id),
+        Value=json.dumps(request),
+        Type="SecureString",
+        Overwrite=True,
+    )
+
+
+def get_build_environment_variables_override(
+    event: Dict[str, Any],
+) -> List[Dict[str, str]]:
+    return [
+        {
+            "name": "GIT_REPOSITORY_BRANCH",
+            "value": event["ResourceProperties"]["GIT_REPOSITORY_BRANCH"],
+            "type": "PLAINTEXT",
+        },
+        {
+            "name": "GIT_REPOSITORY_URL",
+            "value": get_repository_url(event),
+            "type": "PLAINTEXT",
+        },
+    ]
+
+
+def get_secondary_sources_override(event: Dict[str, Any]) -> List[Dict[str, str]]:
+    properties = event["ResourceProperties"]
+    return [
+        {
+            "location": f"{properties['SEEDCODE_BUCKET_NAME']}/{properties['SEEDCODE_BUCKET_KEY']}",
+            "type": "S3",
+            "sourceIdentifier": "source",
+        }
+    ]
+
+
+def get_repository_url(event: Dict[str, Any]) -> str:
+    """HTTPS URL of the git repository, through its CodeStar connection."""
+
+    connection = parse_arn(event["ResourceProperties"]["GIT_REPOSITORY_CONNECTION_ARN"])
+    url_prefix = "codeconnections"
+    if "codestar-connections" in connection["service"]:
+        url_prefix = "codestar-connections"
+    return "https://{}.{}.amazonaws.com/git-http/{}/{}/{}/{}.git".format(
+        url_prefix,
+        connection["region"],
+        connection["account"],
+        connection["region"],
+        connection["resource"],
+        event["ResourceProperties"]["GIT_REPOSITORY_FULL_NAME"],
+    )
+
+
+def parse_arn(arn: str) -> Dict[str, Any]:
+    # http://docs.aws.amazon.com/general/latest/gr/aws-arns-and-namespaces.html
+    elements = arn.split(":", 5)
+    result = {
+        "arn": elements[0],
+        "partition": elements[1],
+        "service": elements[2],
+        "region": elements[3],
+        "account": elements[4],
+        "resource": elements[5],
+        "resource_type": None,
+    }
+    if "/" in result["resource"]:
+        result["resource_type"], result["resource"] = result["resource"].split("/", 1)
+    elif ":" in result["resource"]:
+        result["resource_type"], result["resource"] = result["resource"].split(":", 1)
+    return result
@@ -18,12 +18,63 @@
 # Function: EnableSagemakerProjects
 # Purpose:  Enables Sagemaker Projects
 
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
 import cfnresponse
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-sm_client = boto3.client("sagemaker")
-sc_client = boto3.client("servicecatalog")
+# throttled calls are retried with backoff
+retry_config = Config(retries={"mode": "adaptive", "max_attempts": 10})
+sm_client = boto3.client("sagemaker", config=retry_config)
+sc_client = boto3.client("servicecatalog", config=retry_config)
+
+# associations applied at the same time
+MAX_WORKERS = 8
+
+
+def enable_projects():
+    """Enable Project on account level (accepts portfolio share), if not enabled yet."""
+    status = sm_client.get_sagemaker_servicecatalog_portfolio_status()["Status"]
+    if status != "Enabled":
+        print("Enable Project on account level (accepts portfolio share)")
+        print(sm_client.enable_sagemaker_servicecatalog_portfolio())
+
+
+def list_principals(portfolio_id):
+    """Returns the ARNs of the principals associated with a portfolio."""
+    paginator = sc_client.get_paginator("list_principals_for_portfolio")
+    return {
+        principal["PrincipalARN"]
+        for page in paginator.paginate(PortfolioId=portfolio_id)
+        for principal in page["Principals"]
+    }
+
+
+def associate(portfolio_id, role):
+    print("Associating role: {} to portfolio: {}".format(role, portfolio_id))
+    sc_client.associate_principal_with_portfolio(
+        PortfolioId=portfolio_id,
+        PrincipalARN=role,
+        PrincipalType="IAM"
+    )
+
+
+def disassociate(portfolio_id, role):
+    print("Disassociating role: {} from portfolio: {}".format(role, portfolio_id))
+    sc_client.disassociate_principal_from_portfolio(
+        PortfolioId=portfolio_id,
+        PrincipalARN=role,
+        PrincipalType="IAM"
+    )
+
+
+def apply(operation, portfolio_id, roles):
+    """Applies an operation to a set of roles in parallel."""
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # consume the results to raise the first error
+        list(executor.map(lambda role: operation(portfolio_id, role), sorted(roles)))
 
 
 def handler(event, context):
@@ -32,23 +83,29 @@ def handler(event, context):
         if "RequestType" in event and event["RequestType"] in {"Create", "Update"}:
 
             properties = event["ResourceProperties"]
-            roles = properties.get("ExecutionRoles", [])
+            roles = set(properties.get("ExecutionRoles", []))
             portfolio_id = properties.get("PortfolioId", "")
 
-            # Enable Project on account level (accepts portfolio share)
-            response = sm_client.enable_sagemaker_servicecatalog_portfolio()
+            enable_projects()
 
-            print("Enable Project on account level (accepts portfolio share)")
-            print(response)
-            for role in roles:
+            # only associate the roles not associated yet
+            missing_roles = roles - list_principals(portfolio_id)
+            print("Associating {} of {} roles".format(len(missing_roles), len(roles)))
+            apply(associate, portfolio_id, missing_roles)
 
-                print("Associating role: {} to portfolio: {}".format(role, portfolio_id))
-                response = sc_client.associate_principal_with_portfolio(
-                    PortfolioId=portfolio_id, 
-                    PrincipalARN=role, 
-                    PrincipalType="IAM"
-                )
-                print(response)
+            # disassociate the roles removed from the resource
+            if event["RequestType"] == "Update":
+                old_properties = event.get("OldResourceProperties", {})
+                old_portfolio_id = old_properties.get("PortfolioId", "")
+                removed_roles = set(old_properties.get("ExecutionRoles", []))
+                if old_portfolio_id == portfolio_id:
+                    removed_roles -= roles
+                if removed_roles:
+                    apply(
+                        disassociate,
+                        old_portfolio_id,
+                        removed_roles & list_principals(old_portfolio_id),
+                    )
 
         cfnresponse.send(event, context, cfnresponse.SUCCESS, {}, "")
 
@@ -1,36 +1,89 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, Iterable, List
 
 import boto3
 import botocore
+from botocore.config import Config
 from aws_lambda_powertools import Logger
-from aws_lambda_powertools.utilities.data_classes import EventBridgeEvent, event_source
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 logger = Logger()
 
-tooling_account = os.getenv("CENTRAL_ACCOUNT_ID")
-assert isinstance(tooling_account, str)
-sagemaker_client = boto3.client("sagemaker")
 region = os.getenv("AWS_REGION", "us-east-1")
+# groups whose policy is put at the same time
+policy_concurrency = int(os.getenv("POLICY_CONCURRENCY", "4"))
 
+# rendered for each group, only the identifiers change between groups
+POLICY_TEMPLATE = Template(
+    json.dumps(
+        {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Sid": "ModelPackageGroup",
+                    "Effect": "Allow",
+                    "Principal": {"AWS": "arn:aws:iam::${tooling_account}:root"},
+                    "Action": "sagemaker:DescribeModelPackageGroup",
+                    "Resource": "arn:aws:sagemaker:${region}:${account_id}:model-package-group/${model_package_group_name}",
+                },
+                {
+                    "Sid": "ModelPackages",
+                    "Effect": "Allow",
+                    "Principal": {"AWS": "arn:aws:iam::${account_id}:root"},
+                    "Action": [
+                        "sagemaker:DescribeModelPackage",
+                        "sagemaker:ListModelPackages",
+                        "sagemaker:UpdateModelPackage",
+                        "sagemaker:CreateModel",
+                    ],
+                    "Resource": "arn:aws:sagemaker:${region}:${account_id}:model-package/${model_package_group_name}/*",
+                },
+            ],
+        }
+    )
+)
+
+
+@lru_cache(maxsize=None)
+def sagemaker_client():
+    """SageMaker client, created on the first event to keep cold starts short."""
+    return boto3.client(
+        "sagemaker",
+        config=Config(
+            retries={"mode": "adaptive", "max_attempts": 10},
+            max_pool_connections=max(10, policy_concurrency),
+        ),
+    )
 
-@logger.inject_lambda_context
-@event_source(data_class=EventBridgeEvent)
-def handler(event: EventBridgeEvent, context: LambdaContext):
-    details = event.detail
 
-    model_package_group_arn = details["responseElements"]["modelPackageGroupArn"]
+def get_tooling_account() -> str:
+    tooling_account = os.getenv("CENTRAL_ACCOUNT_ID")
+    if not tooling_account:
+        raise ValueError("CENTRAL_ACCOUNT_ID is not set")
+    return tooling_account
+
+
+def group_name_from_event(event: Dict[str, Any]) -> str:
+    """Name of the model package group created, from a CloudTrail event."""
+
+    model_package_group_arn = event["detail"]["responseElements"][
+        "modelPackageGroupArn"
+    ]
     assert isinstance(model_package_group_arn, str)
-    model_package_group_name = model_package_group_arn.rsplit("/", 1)[0]
-    account_id = context.invoked_function_arn.split(":")[4]
+    return model_package_group_arn.rsplit("/", 1)[1]
+
 
+def put_policy(model_package_group_name: str, account_id: str):
     resource_policy = write_cross_account_policy(
-        model_package_group_name, account_id, region, tooling_account
+        model_package_group_name, account_id, region, get_tooling_account()
     )
 
     try:
-        sagemaker_client.put_model_package_group_policy(
+        sagemaker_client().put_model_package_group_policy(
             ModelPackageGroupName=model_package_group_name,
             ResourcePolicy=resource_policy,
         )
@@ -38,6 +91,106 @@ def handler(event: EventBridgeEvent, context: LambdaContext):
         logger.exception(error)
         raise error
 
+
+def put_policies(
+    model_package_group_names: Iterable[str], account_id: str
+) -> Dict[str, Exception]:
+    """Put the policy of each model package group once, with bounded concurrency.
+
+    Args:
+        model_package_group_names (Iterable[str]): The names of the model package
+            groups, duplicates are ignored.
+        account_id (str): The AWS account ID of the account that owns the groups.
+
+    Returns:
+        Dict[str, Exception]: The error of each group whose policy was not put.
+    """
+
+    def put(model_package_group_name: str):
+        try:
+            put_policy(model_package_group_name, account_id)
+        except Exception as error:
+            return error
+
+    group_names = list(dict.fromkeys(model_package_group_names))
+    with ThreadPoolExecutor(max_workers=policy_concurrency) as executor:
+        errors = dict(zip(group_names, executor.map(put, group_names)))
+    return {name: error for name, error in errors.items() if error is not None}
+
+
+def list_model_package_groups() -> List[str]:
+    paginator = sagemaker_client().get_paginator("list_model_package_groups")
+    return [
+        group["ModelPackageGroupName"]
+        for page in paginator.paginate()
+        for group in page["ModelPackageGroupSummaryList"]
+    ]
+
+
+def handle_records(records: List[Dict[str, Any]], account_id: str):
+    """Put the policies of the groups created in a batch of buffered events.
+
+    A burst of group creations is coalesced in a batch, and the policy of each
+    group is put once. The records that are not a group creation event, and the
+    records of the groups whose policy was not put, are reported as failed, so
+    they are retried without failing the rest of the batch.
+    """
+
+    record_groups = {}
+    failed_message_ids = []
+    for record in records:
+        try:
+            record_groups[record["messageId"]] = group_name_from_event(
+                json.loads(record["body"])
+            )
+        except Exception:
+            logger.exception(f"Invalid event in message {record['messageId']}")
+            failed_message_ids.append(record["messageId"])
+
+    errors = put_policies(record_groups.values(), account_id)
+    logger.info(
+        f"Put the policies of {len(set(record_groups.values())) - len(errors)} model package groups from {len(records)} events"
+    )
+    failed_message_ids.extend(
+        message_id
+        for message_id, group_name in record_groups.items()
+        if group_name in errors
+    )
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": message_id} for message_id in failed_message_ids
+        ]
+    }
+
+
+@logger.inject_lambda_context
+def handler(event: Dict[str, Any], context: LambdaContext):
+    account_id = context.invoked_function_arn.split(":")[4]
+
+    # events buffered in an SQS queue
+    if "Records" in event:
+        return handle_records(event["Records"], account_id)
+
+    # re-apply the policy of every existing group
+    if event.get("action") == "reconcile":
+        group_names = list_model_package_groups()
+        errors = put_policies(group_names, account_id)
+        if errors:
+            raise RuntimeError(
+                f"Failed to put the policies of {len(errors)} model package groups: {', '.join(errors)}"
+            )
+        return {
+            "statusCode": 200,
+            "body": json.dumps(
+                {
+                    "message": f"Added cross account policy to {len(group_names)} Model Package Groups",
+                }
+            ),
+        }
+
+    model_package_group_name = group_name_from_event(event)
+    put_policy(model_package_group_name, account_id)
+
     return {
         "statusCode": 200,
         "body": json.dumps(
@@ -63,29 +216,9 @@ def write_cross_account_policy(
         policy (str): The IAM policy document as a JSON-serialized dictionary.
     """
 
-    policy = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Sid": "ModelPackageGroup",
-                "Effect": "Allow",
-                "Principal": {"AWS": f"arn:aws:iam::{tooling_account}:root"},
-                "Action": "sagemaker:DescribeModelPackageGroup",
-                "Resource": f"arn:aws:sagemaker:{region}:{account_id}:model-package-group/{model_package_group_name}",
-            },
-            {
-                "Sid": "ModelPackages",
-                "Effect": "Allow",
-                "Principal": {"AWS": f"arn:aws:iam::{account_id}:root"},
-                "Action": [
-                    "sagemaker:DescribeModelPackage",
-                    "sagemaker:ListModelPackages",
-                    "sagemaker:UpdateModelPackage",
-                    "sagemaker:CreateModel",
-                ],
-                "Resource": f"arn:aws:sagemaker:{region}:{account_id}:model-package/{model_package_group_name}/*",
-            },
-        ],
-    }
-
-    return json.dumps(policy)
+    return POLICY_TEMPLATE.substitute(
+        model_package_group_name=model_package_group_name,
+        account_id=account_id,
+        region=region,
+        tooling_account=tooling_account,
+    )
@@ -0,0 +1,198 @@
+"""Throughput benchmark of the model_sync function against in-process stand-ins.
+
+Synthetic approved model packages are registered in a stand-in source registry,
+each with a configurable number and size of artifacts, and the central group is
+pre-populated with a configurable history of synced packages. Every package is
+then synced through `lambda_handler`, and the p50/p95 sync latency and the
+number of calls to each API are reported. Every API call takes the configured
+latency, objects are not backed by real bytes so large artifacts are cheap.
+
+Run it from the root of the project, before and after a change:
+
+    python tests/benchmarks/benchmark_model_sync.py --packages 20 --artifacts 4 \\
+        --artifact-size-mb 1024 --history 200 --latency-ms 20
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).parents[1]
+sys.path.insert(0, str(TESTS_DIR.parent.joinpath("functions", "model_sync")))
+sys.path.insert(0, str(TESTS_DIR))
+
+SOURCE_ACCOUNT_ID = "222222222222"
+SOURCE_BUCKET = "sagemaker-source-bucket"
+ARTIFACT_BUCKET = "mlops-model-artifacts"
+SYNC_INDEX_TABLE = "sync-index"
+
+
+@dataclass
+class FakeLambdaContext:
+    function_name: str = "SyncModelFunction"
+    memory_limit_in_mb: int = 1024
+    invoked_function_arn: str = (
+        "arn:aws:lambda:us-east-1:111111111111:function:SyncModelFunction"
+    )
+    aws_request_id: str = ""
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 15 * 60 * 1000
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=10)
+    parser.add_argument("--artifacts", type=int, default=3, help="Per package")
+    parser.add_argument("--artifact-size-mb", type=int, default=512)
+    parser.add_argument(
+        "--history",
+        type=int,
+        default=100,
+        help="Model packages already synced to the central group",
+    )
+    parser.add_argument("--latency-ms", type=float, default=10, help="Per API call")
+    parser.add_argument(
+        "--no-sync-index", action="store_true", help="Scan the registry instead"
+    )
+    parser.add_argument("--no-content-deduplication", action="store_true")
+    parser.add_argument(
+        "--no-checksum-verification",
+        action="store_true",
+        help="The stand-in generates the bytes of streamed objects, which is slow",
+    )
+    parser.add_argument(
+        "--shared-artifacts",
+        action="store_true",
+        help="Reference the same artifacts from every package",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    os.environ.update(
+        {
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "POWERTOOLS_LOG_LEVEL": "WARNING",
+            "POWERTOOLS_METRICS_NAMESPACE": "Benchmark",
+            "POWERTOOLS_METRICS_DISABLED": "true",
+            "ArtifactBucketName": ARTIFACT_BUCKET,
+            "ContentDeduplication": str(not args.no_content_deduplication).lower(),
+            "ChecksumVerification": str(not args.no_checksum_verification).lower(),
+        }
+    )
+    if not args.no_sync_index:
+        os.environ["SyncIndexTableName"] = SYNC_INDEX_TABLE
+
+    import index
+    from fakes import MiB, FakeDynamoDB, FakeS3, FakeSageMaker
+
+    latency = args.latency_ms / 1000
+    s3 = FakeS3(latency=latency, compute_checksums=not args.no_checksum_verification)
+    sagemaker = FakeSageMaker(latency=latency)
+    dynamodb = FakeDynamoDB(latency=latency)
+    index.s3_client = s3
+    index.sagemaker_client = sagemaker
+    index.dynamodb_client = dynamodb
+
+    group_name = "benchmark-models"
+    target_group = f"{group_name}-{SOURCE_ACCOUNT_ID}"
+    sagemaker.create_model_package_group(ModelPackageGroupName=target_group)
+    for _ in range(args.history):
+        sagemaker.add_model_package(
+            target_group,
+            approval_status="PendingManualApproval",
+            CustomerMetadataProperties={
+                "OriginalARN": f"arn:aws:sagemaker:us-east-1:{SOURCE_ACCOUNT_ID}:model-package/{group_name}/{uuid.uuid4().hex}"
+            },
+        )
+
+    def artifact(package: int, artifact: int) -> str:
+        key = f"{group_name}/{'shared' if args.shared_artifacts else package}/{artifact}/model.tar.gz"
+        if (SOURCE_BUCKET, key) not in s3.objects:
+            obj = s3.add_object(SOURCE_BUCKET, key, args.artifact_size_mb * MiB)
+            # only SHA checksums identify the content of shared artifacts
+            obj.checksums["ChecksumSHA256"] = base64.b64encode(
+                hashlib.sha256(obj.etag.encode()).digest()
+            ).decode()
+        return f"s3://{SOURCE_BUCKET}/{key}"
+
+    source_arns = [
+        sagemaker.add_model_package(
+            group_name,
+            account_id=SOURCE_ACCOUNT_ID,
+            InferenceSpecification={
+                "Containers": [
+                    {
+                        "Image": "123456789012.dkr.ecr.us-east-1.amazonaws.com/xgboost:1",
+                        "ImageDigest": "sha256:0",
+                        "ModelDataUrl": artifact(package, i),
+                    }
+                    for i in range(args.artifacts)
+                ],
+                "SupportedContentTypes": ["text/csv"],
+                "SupportedResponseMIMETypes": ["text/csv"],
+            },
+        )
+        for package in range(args.packages)
+    ]
+    sagemaker.calls.clear()
+    s3.calls.clear()
+    dynamodb.calls.clear()
+
+    latencies = []
+    for arn in source_arns:
+        event = {
+            "id": uuid.uuid4().hex,
+            "detail-type": "SageMaker Model Package State Change",
+            "source": "aws.sagemaker",
+            "detail": {"ModelPackageArn": arn, "ModelApprovalStatus": "Approved"},
+        }
+        start = time.perf_counter()
+        response = index.lambda_handler(
+            event, FakeLambdaContext(aws_request_id=event["id"])
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response["statusCode"] != 200:
+            raise SystemExit(f"Sync of {arn} failed: {response['body']}")
+
+    report = {
+        "packages": args.packages,
+        "sync_latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "mean": round(statistics.mean(latencies), 1),
+            "max": round(max(latencies), 1),
+        },
+        "api_calls": {
+            **{f"sagemaker.{op}": n for op, n in sorted(sagemaker.calls.items())},
+            **{f"s3.{op}": n for op, n in sorted(s3.calls.items())},
+            **{f"dynamodb.{op}": n for op, n in sorted(dynamodb.calls.items())},
+        },
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Synced {args.packages} model packages")
+    for name, value in report["sync_latency_ms"].items():
+        print(f"  {name:<5} {value:>10.1f} ms")
+    print("API calls")
+    for name, count in report["api_calls"].items():
+        print(f"  {name:<40} {count:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Startup benchmark of the Lambda functions of the project.
+
+Imports the handler module of each function in a fresh interpreter with
+`python -X importtime`, as a cold start does, and reports the median total
+import time and the modules taking the longest to import. Clients created at
+import time are included in the import time of the handler module.
+
+Run it from the root of the project, with the dependencies of the functions
+installed. Use --budget-ms to fail when a function exceeds a startup budget:
+
+    python tests/benchmarks/benchmark_startup.py --runs 5 --budget-ms 500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_DIR = Path(__file__).parents[2]
+
+# handler module and environment of each function
+FUNCTIONS = {
+    "model_sync": (
+        PROJECT_DIR / "functions" / "model_sync",
+        "index",
+        {
+            "ArtifactBucketName": "mlops-model-artifacts",
+            "SyncIndexTableName": "sync-index",
+            "IdempotencyTableName": "idempotency",
+        },
+    ),
+    "model_package_group_policy": (
+        PROJECT_DIR
+        / "service_catalog"
+        / "ml_admin_products"
+        / "functions"
+        / "model_package_group_policy",
+        "index",
+        {"CENTRAL_ACCOUNT_ID": "111111111111"},
+    ),
+}
+
+
+def import_times(
+    directory: Path, module: str, environment: Dict[str, str]
+) -> Tuple[float, Dict[str, float]]:
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple[float, Dict[str, float]]: The total import time in ms, and the
+            cumulative import time in ms of each top level module imported.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=directory,
+        env={
+            **os.environ,
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "POWERTOOLS_METRICS_NAMESPACE": "Benchmark",
+            **environment,
+        },
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # the handler module, and the modules it imports, indented by 2 spaces
+        name = name.removeprefix(" ")
+        if len(name) - len(name.lstrip()) <= 2:
+            modules[name.strip()] = int(cumulative) / 1000
+    return modules.get(module, sum(modules.values())), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Modules to report")
+    parser.add_argument("--budget-ms", type=float, help="Fail above this time")
+    args = parser.parse_args()
+
+    over_budget = []
+    for name, (directory, module, environment) in FUNCTIONS.items():
+        totals: List[float] = []
+        modules: Dict[str, List[float]] = defaultdict(list)
+        for _ in range(args.runs):
+            total, run_modules = import_times(directory, module, environment)
+            totals.append(total)
+            for imported, time in run_modules.items():
+                modules[imported].append(time)
+
+        total = statistics.median(totals)
+        print(f"{name}: {total:.1f} ms (median of {args.runs} runs)")
+        for imported, times in sorted(
+            modules.items(), key=lambda item: -statistics.median(item[1])
+        )[: args.top]:
+            print(f"  {imported:<60} {statistics.median(times):>8.1f} ms")
+        if args.budget_ms and total > args.budget_ms:
+            over_budget.append(name)
+
+    if over_budget:
+        raise SystemExit(
+            f"Over the startup budget of {args.budget_ms} ms: {', '.join(over_budget)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Lambda handlers are deployed from their own directories, import them the same way
+sys.path.insert(0, str(Path(__file__).parents[1].joinpath("functions", "model_sync")))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from fakes import FakeS3  # noqa: E402
+
+
+@pytest.fixture
+def s3():
+    return FakeS3()
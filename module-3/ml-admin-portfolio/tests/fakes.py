@@ -0,0 +1,733 @@
+"""In-process stand-ins for the AWS APIs used by the Lambda functions.
+
+Objects are not backed by real bytes: an object is a list of byte ranges of the
+objects originally added to the stand-in, so multi-GB copies can be checked
+without allocating memory for them.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyItemAlreadyExistsError,
+    IdempotencyItemNotFoundError,
+)
+from aws_lambda_powertools.utilities.idempotency.persistence.base import (
+    BasePersistenceLayer,
+    DataRecord,
+)
+from botocore.exceptions import ClientError
+
+GiB = 1024**3
+MiB = 1024**2
+
+
+def origin_bytes(origin: str, start: int, end: int) -> bytes:
+    """Deterministic content of the bytes [start, end) of an object added to the stand-in."""
+    first_block, last_block = start // 32, (end - 1) // 32
+    data = b"".join(
+        hashlib.sha256(f"{origin}:{block}".encode()).digest()
+        for block in range(first_block, last_block + 1)
+    )
+    return data[start - first_block * 32 : end - first_block * 32]
+
+
+class FakeBody:
+    """Stand-in for the botocore StreamingBody returned by GetObject."""
+
+    def __init__(self, obj: "FakeObject"):
+        self._obj = obj
+        self._position = 0
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        end = (
+            self._obj.size if amt is None else min(self._position + amt, self._obj.size)
+        )
+        data = self._obj.read(self._position, end)
+        self._position = end
+        return data
+
+    def iter_chunks(self, chunk_size: int = 1024):
+        while chunk := self.read(chunk_size):
+            yield chunk
+
+
+def client_error(code: str, operation: str, message: str = "") -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+@dataclass
+class FakeObject:
+    # (origin object id, first byte, last byte + 1)
+    segments: List[Tuple[str, int, int]]
+    etag: str
+    content_type: str = "binary/octet-stream"
+    metadata: Dict[str, str] = field(default_factory=dict)
+    server_side_encryption: Optional[str] = None
+    kms_key_id: Optional[str] = None
+    # objects written with PutObject keep their bytes
+    data: Optional[bytes] = None
+    # S3 additional checksums, e.g. {"ChecksumSHA256": "..."}
+    checksums: Dict[str, str] = field(default_factory=dict)
+    # the size and checksums of each part of an object uploaded in parts
+    parts: List[dict] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return sum(end - start for _, start, end in self.segments)
+
+    def content(self) -> List[Tuple[str, int, int]]:
+        """The byte ranges of the object with adjacent ranges merged."""
+        merged: List[Tuple[str, int, int]] = []
+        for origin, start, end in self.segments:
+            if merged and merged[-1][0] == origin and merged[-1][2] == start:
+                merged[-1] = (origin, merged[-1][1], end)
+            else:
+                merged.append((origin, start, end))
+        return merged
+
+    def read(self, start: int, end: int) -> bytes:
+        """The bytes [start, end) of the object."""
+        if self.data is not None:
+            return self.data[start:end]
+        return b"".join(
+            origin_bytes(origin, lo, hi)
+            for origin, lo, hi in self.byte_range(start, end - 1)
+        )
+
+    def byte_range(self, first: int, last: int) -> List[Tuple[str, int, int]]:
+        ranges, offset = [], 0
+        for origin, start, end in self.segments:
+            length = end - start
+            lo, hi = max(first, offset), min(last + 1, offset + length)
+            if lo < hi:
+                ranges.append((origin, start + lo - offset, start + hi - offset))
+            offset += length
+        return ranges
+
+
+class FakeClient:
+    """Counts the calls made to a stand-in and adds a latency to each of them.
+
+    Args:
+        latency (float): The time in seconds each call takes.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _call(self, operation: str):
+        with self._lock:
+            self.calls[operation] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakeS3(FakeClient):
+    """A thread safe stand-in for the subset of the S3 API used by model_sync.
+
+    Args:
+        compute_checksums (bool): Compute the additional checksums requested with
+            `ChecksumAlgorithm`. The bytes of the objects are then generated,
+            which is slow for large objects.
+    """
+
+    def __init__(
+        self,
+        default_kms_key_id: str = "arn:aws:kms:us-east-1:111111111111:key/default",
+        latency: float = 0.0,
+        compute_checksums: bool = True,
+    ):
+        super().__init__(latency)
+        self.default_kms_key_id = default_kms_key_id
+        self.compute_checksums = compute_checksums
+        self.objects: Dict[Tuple[str, str], FakeObject] = {}
+        self.uploads: Dict[str, dict] = {}
+
+    def add_object(self, bucket: str, key: str, size: int, **attributes) -> FakeObject:
+        origin = uuid.uuid4().hex
+        obj = FakeObject(segments=[(origin, 0, size)], etag=f'"{origin}"', **attributes)
+        self.objects[(bucket, key)] = obj
+        return obj
+
+    def _get(self, bucket: str, key: str, operation: str) -> FakeObject:
+        try:
+            return self.objects[(bucket, key)]
+        except KeyError:
+            code = "404" if operation == "HeadObject" else "NoSuchKey"
+            raise client_error(code, operation, "Not Found")
+
+    def _checksum(
+        self, obj: FakeObject, algorithm: Optional[str], first: int = 0, last: int = -1
+    ) -> Dict[str, str]:
+        """The additional checksum of the bytes [first, last] of an object."""
+        if not algorithm or not self.compute_checksums:
+            return {}
+        hasher = hashlib.new(algorithm.lower())
+        last = obj.size - 1 if last < 0 else last
+        for start in range(first, last + 1, 8 * MiB):
+            hasher.update(obj.read(start, min(start + 8 * MiB, last + 1)))
+        return {f"Checksum{algorithm}": base64.b64encode(hasher.digest()).decode()}
+
+    def _encryption(self, kwargs: dict) -> Tuple[str, str]:
+        if kwargs.get("ServerSideEncryption") == "aws:kms":
+            return "aws:kms", kwargs.get("SSEKMSKeyId", "aws/s3")
+        # destination bucket default encryption
+        return "aws:kms", self.default_kms_key_id
+
+    @staticmethod
+    def _attributes(obj: FakeObject) -> dict:
+        return {
+            "ContentLength": obj.size,
+            "ETag": obj.etag,
+            "ContentType": obj.content_type,
+            "Metadata": dict(obj.metadata),
+            "ServerSideEncryption": obj.server_side_encryption,
+            "SSEKMSKeyId": obj.kms_key_id,
+            **obj.checksums,
+            **({"ChecksumType": "COMPOSITE"} if obj.parts and obj.checksums else {}),
+        }
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._call("HeadObject")
+        return self._attributes(self._get(Bucket, Key, "HeadObject"))
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes = b"", **kwargs) -> dict:
+        self._call("PutObject")
+        origin = uuid.uuid4().hex
+        sse, kms_key_id = self._encryption(kwargs)
+        etag = f'"{hashlib.md5(Body).hexdigest()}"'
+        with self._lock:
+            self.objects[(Bucket, Key)] = FakeObject(
+                segments=[(origin, 0, len(Body))],
+                etag=etag,
+                content_type=kwargs.get("ContentType", "binary/octet-stream"),
+                metadata=kwargs.get("Metadata", {}),
+                server_side_encryption=sse,
+                kms_key_id=kms_key_id,
+                data=Body,
+            )
+        return {"ETag": etag}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._call("GetObject")
+        obj = self._get(Bucket, Key, "GetObject")
+        return {**self._attributes(obj), "Body": FakeBody(obj)}
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._call("DeleteObject")
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def copy_object(self, Bucket: str, Key: str, CopySource: dict, **kwargs) -> dict:
+        self._call("CopyObject")
+        source = self._get(CopySource["Bucket"], CopySource["Key"], "CopyObject")
+        if source.size > 5 * GiB:
+            raise client_error(
+                "InvalidRequest",
+                "CopyObject",
+                "The specified copy source is larger than the maximum allowable size for a copy source: 5368709120",
+            )
+        sse, kms_key_id = self._encryption(kwargs)
+        # CopyObject keeps the additional checksum of the source, unless another is requested
+        checksums = dict(source.checksums)
+        if algorithm := kwargs.get("ChecksumAlgorithm"):
+            checksum_key = f"Checksum{algorithm}"
+            checksums = (
+                {checksum_key: checksums[checksum_key]}
+                if "-" not in checksums.get(checksum_key, "-")
+                else self._checksum(source, algorithm)
+            )
+        with self._lock:
+            self.objects[(Bucket, Key)] = FakeObject(
+                segments=list(source.segments),
+                etag=source.etag,
+                content_type=source.content_type,
+                metadata=dict(source.metadata),
+                server_side_encryption=sse,
+                kms_key_id=kms_key_id,
+                data=source.data,
+                checksums=checksums,
+            )
+        return {"CopyObjectResult": {"ETag": source.etag}}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self._call("CreateMultipartUpload")
+        upload_id = uuid.uuid4().hex
+        sse, kms_key_id = self._encryption(kwargs)
+        with self._lock:
+            self.uploads[upload_id] = {
+                "Bucket": Bucket,
+                "Key": Key,
+                "Parts": {},
+                "ContentType": kwargs.get("ContentType", "binary/octet-stream"),
+                "Metadata": kwargs.get("Metadata", {}),
+                "ServerSideEncryption": sse,
+                "SSEKMSKeyId": kms_key_id,
+                "ChecksumAlgorithm": kwargs.get("ChecksumAlgorithm"),
+            }
+        return {"UploadId": upload_id}
+
+    def upload_part_copy(
+        self,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        PartNumber: int,
+        CopySource: dict,
+        CopySourceRange: str,
+        **kwargs,
+    ) -> dict:
+        self._call("UploadPartCopy")
+        upload = self.uploads.get(UploadId)
+        if upload is None:
+            raise client_error("NoSuchUpload", "UploadPartCopy")
+        source = self._get(CopySource["Bucket"], CopySource["Key"], "UploadPartCopy")
+        if (etag := kwargs.get("CopySourceIfMatch")) and etag != source.etag:
+            raise client_error("PreconditionFailed", "UploadPartCopy")
+        if not 1 <= PartNumber <= 10000:
+            raise client_error("InvalidArgument", "UploadPartCopy")
+        first, last = map(int, CopySourceRange.removeprefix("bytes=").split("-"))
+        if not 0 <= first <= last < source.size or last - first + 1 > 5 * GiB:
+            raise client_error("InvalidRange", "UploadPartCopy")
+        segments = source.byte_range(first, last)
+        etag = f'"{hashlib.md5(repr(segments).encode()).hexdigest()}"'
+        checksum = self._checksum(source, upload["ChecksumAlgorithm"], first, last)
+        with self._lock:
+            upload["Parts"][PartNumber] = (etag, segments, checksum)
+        return {"CopyPartResult": {"ETag": etag, **checksum}}
+
+    def complete_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict, **kwargs
+    ) -> dict:
+        self._call("CompleteMultipartUpload")
+        upload = self.uploads.pop(UploadId)
+        parts = MultipartUpload["Parts"]
+        if [p["PartNumber"] for p in parts] != sorted(p["PartNumber"] for p in parts):
+            raise client_error("InvalidPartOrder", "CompleteMultipartUpload")
+        segments, object_parts = [], []
+        for i, part in enumerate(parts):
+            etag, part_segments, checksum = upload["Parts"][part["PartNumber"]]
+            size = sum(end - start for _, start, end in part_segments)
+            if etag != part["ETag"]:
+                raise client_error("InvalidPart", "CompleteMultipartUpload")
+            if any(part.get(k) != v for k, v in checksum.items()):
+                raise client_error("InvalidPart", "CompleteMultipartUpload")
+            if i < len(parts) - 1 and size < 5 * MiB:
+                raise client_error("EntityTooSmall", "CompleteMultipartUpload")
+            segments.extend(part_segments)
+            object_parts.append(
+                {"PartNumber": part["PartNumber"], "Size": size, **checksum}
+            )
+        digest = hashlib.md5("".join(p["ETag"] for p in parts).encode()).hexdigest()
+        checksums = {}
+        if object_parts and (algorithm := upload["ChecksumAlgorithm"]):
+            checksum_key = f"Checksum{algorithm}"
+            if all(checksum_key in p for p in object_parts):
+                composite = hashlib.new(algorithm.lower())
+                for p in object_parts:
+                    composite.update(base64.b64decode(p[checksum_key]))
+                checksums[checksum_key] = (
+                    f"{base64.b64encode(composite.digest()).decode()}-{len(parts)}"
+                )
+        with self._lock:
+            self.objects[(Bucket, Key)] = FakeObject(
+                segments=segments,
+                etag=f'"{digest}-{len(parts)}"',
+                content_type=upload["ContentType"],
+                metadata=dict(upload["Metadata"]),
+                server_side_encryption=upload["ServerSideEncryption"],
+                kms_key_id=upload["SSEKMSKeyId"],
+                checksums=checksums,
+                parts=object_parts,
+            )
+        return {"ETag": self.objects[(Bucket, Key)].etag}
+
+    def get_object_attributes(
+        self,
+        Bucket: str,
+        Key: str,
+        ObjectAttributes: List[str],
+        MaxParts: int = 1000,
+        PartNumberMarker: int = 0,
+        **kwargs,
+    ) -> dict:
+        self._call("GetObjectAttributes")
+        obj = self._get(Bucket, Key, "GetObjectAttributes")
+        parts = [p for p in obj.parts if p["PartNumber"] > PartNumberMarker]
+        object_parts = {
+            "TotalPartsCount": len(obj.parts),
+            "Parts": parts[:MaxParts],
+            "IsTruncated": len(parts) > MaxParts,
+        }
+        if object_parts["IsTruncated"]:
+            object_parts["NextPartNumberMarker"] = parts[MaxParts - 1]["PartNumber"]
+        return {"ObjectSize": obj.size, "ObjectParts": object_parts}
+
+    def abort_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, **kwargs
+    ) -> dict:
+        self._call("AbortMultipartUpload")
+        with self._lock:
+            self.uploads.pop(UploadId, None)
+        return {}
+
+
+class FakePaginator:
+    def __init__(self, method):
+        self._method = method
+
+    def paginate(self, **kwargs):
+        while True:
+            page = self._method(**kwargs)
+            yield page
+            if not (next_token := page.get("NextToken")):
+                return
+            kwargs = {**kwargs, "NextToken": next_token}
+
+
+class FakeSageMaker(FakeClient):
+    """A thread safe stand-in for the SageMaker model registry APIs used by model_sync."""
+
+    def __init__(
+        self,
+        account_id: str = "111111111111",
+        region: str = "us-east-1",
+        latency: float = 0.0,
+    ):
+        super().__init__(latency)
+        self.account_id = account_id
+        self.region = region
+        self.groups: Dict[str, dict] = {}
+        # model packages by ARN, in creation order
+        self.packages: Dict[str, dict] = {}
+
+    def add_model_package(
+        self,
+        group_name: str,
+        account_id: Optional[str] = None,
+        approval_status: str = "Approved",
+        **description,
+    ) -> str:
+        """Register a model package without counting the call, creating its group."""
+        account_id = account_id or self.account_id
+        group_arn = f"arn:aws:sagemaker:{self.region}:{account_id}:model-package-group/{group_name}"
+        with self._lock:
+            group = self.groups.setdefault(
+                group_arn, {"ModelPackageGroupName": group_name, "Versions": 0}
+            )
+            group["Versions"] += 1
+            arn = f"arn:aws:sagemaker:{self.region}:{account_id}:model-package/{group_name}/{group['Versions']}"
+            self.packages[arn] = {
+                **description,
+                "ModelPackageGroupName": group_name,
+                "ModelPackageVersion": group["Versions"],
+                "ModelPackageArn": arn,
+                "ModelApprovalStatus": approval_status,
+                "ModelPackageStatus": "Completed",
+            }
+        return arn
+
+    def _group_arn(self, name: str) -> str:
+        if name.startswith("arn:"):
+            return name
+        return f"arn:aws:sagemaker:{self.region}:{self.account_id}:model-package-group/{name}"
+
+    def describe_model_package(self, ModelPackageName: str) -> dict:
+        self._call("DescribeModelPackage")
+        try:
+            return dict(self.packages[ModelPackageName])
+        except KeyError:
+            raise client_error("ValidationException", "DescribeModelPackage")
+
+    def describe_model_package_group(self, ModelPackageGroupName: str) -> dict:
+        self._call("DescribeModelPackageGroup")
+        group_arn = self._group_arn(ModelPackageGroupName)
+        if group_arn not in self.groups:
+            raise client_error("ValidationException", "DescribeModelPackageGroup")
+        return {
+            "ModelPackageGroupName": self.groups[group_arn]["ModelPackageGroupName"],
+            "ModelPackageGroupArn": group_arn,
+        }
+
+    def create_model_package_group(self, ModelPackageGroupName: str, **kwargs) -> dict:
+        self._call("CreateModelPackageGroup")
+        group_arn = self._group_arn(ModelPackageGroupName)
+        with self._lock:
+            if group_arn in self.groups:
+                raise client_error("ValidationException", "CreateModelPackageGroup")
+            self.groups[group_arn] = {
+                "ModelPackageGroupName": ModelPackageGroupName,
+                "Versions": 0,
+            }
+        return {"ModelPackageGroupArn": group_arn}
+
+    def create_model_package(
+        self, ModelPackageGroupName: str, ModelApprovalStatus: str, **kwargs
+    ) -> dict:
+        self._call("CreateModelPackage")
+        if self._group_arn(ModelPackageGroupName) not in self.groups:
+            raise client_error("ValidationException", "CreateModelPackage")
+        arn = self.add_model_package(
+            ModelPackageGroupName, approval_status=ModelApprovalStatus, **kwargs
+        )
+        return {"ModelPackageArn": arn}
+
+    def update_model_package(
+        self,
+        ModelPackageArn: str,
+        CustomerMetadataProperties: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> dict:
+        self._call("UpdateModelPackage")
+        if ModelPackageArn not in self.packages:
+            raise client_error("ValidationException", "UpdateModelPackage")
+        with self._lock:
+            package = self.packages[ModelPackageArn]
+            package["CustomerMetadataProperties"] = {
+                **package.get("CustomerMetadataProperties", {}),
+                **(CustomerMetadataProperties or {}),
+            }
+            package.update(kwargs)
+        return {"ModelPackageArn": ModelPackageArn}
+
+    def list_model_packages(
+        self,
+        ModelPackageGroupName: str,
+        ModelApprovalStatus: Optional[str] = None,
+        MaxResults: int = 100,
+        NextToken: Optional[str] = None,
+        SortBy: str = "CreationTime",
+        SortOrder: str = "Ascending",
+    ) -> dict:
+        self._call("ListModelPackages")
+        group_arn = self._group_arn(ModelPackageGroupName)
+        group_name = group_arn.split("/")[-1]
+        prefix = group_arn.replace(":model-package-group/", ":model-package/") + "/"
+        summaries = [
+            {
+                "ModelPackageArn": arn,
+                "ModelPackageGroupName": group_name,
+                "ModelApprovalStatus": package["ModelApprovalStatus"],
+            }
+            for arn, package in self.packages.items()
+            if arn.startswith(prefix)
+            and ModelApprovalStatus in (None, package["ModelApprovalStatus"])
+        ]
+        if SortOrder == "Descending":
+            summaries.reverse()
+        start = int(NextToken or 0)
+        page = {"ModelPackageSummaryList": summaries[start : start + MaxResults]}
+        if start + MaxResults < len(summaries):
+            page["NextToken"] = str(start + MaxResults)
+        return page
+
+    def list_model_package_groups(
+        self, MaxResults: int = 100, NextToken: Optional[str] = None
+    ) -> dict:
+        self._call("ListModelPackageGroups")
+        summaries = [
+            {
+                "ModelPackageGroupName": group["ModelPackageGroupName"],
+                "ModelPackageGroupArn": arn,
+            }
+            for arn, group in self.groups.items()
+        ]
+        start = int(NextToken or 0)
+        page = {"ModelPackageGroupSummaryList": summaries[start : start + MaxResults]}
+        if start + MaxResults < len(summaries):
+            page["NextToken"] = str(start + MaxResults)
+        return page
+
+    def get_model_package_group_policy(self, ModelPackageGroupName: str) -> dict:
+        self._call("GetModelPackageGroupPolicy")
+        group = self.groups.get(self._group_arn(ModelPackageGroupName), {})
+        if "ResourcePolicy" not in group:
+            raise client_error("ValidationException", "GetModelPackageGroupPolicy")
+        return {"ResourcePolicy": group["ResourcePolicy"]}
+
+    def put_model_package_group_policy(
+        self, ModelPackageGroupName: str, ResourcePolicy: str
+    ) -> dict:
+        self._call("PutModelPackageGroupPolicy")
+        group_arn = self._group_arn(ModelPackageGroupName)
+        if group_arn not in self.groups:
+            raise client_error("ValidationException", "PutModelPackageGroupPolicy")
+        with self._lock:
+            self.groups[group_arn]["ResourcePolicy"] = ResourcePolicy
+        return {"ModelPackageGroupArn": group_arn}
+
+    def get_paginator(self, operation_name: str) -> FakePaginator:
+        return FakePaginator(getattr(self, operation_name))
+
+
+class FakeDynamoDB(FakeClient):
+    """A thread safe stand-in for the DynamoDB item APIs, keyed on the first key attribute.
+
+    Conditions are limited to `attribute_not_exists(<key>)` and `<attribute> = :<value>`.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        self.tables: Dict[str, Dict[str, dict]] = {}
+
+    @staticmethod
+    def _check(item: Optional[dict], operation: str, **kwargs):
+        if not (condition := kwargs.get("ConditionExpression")):
+            return
+        if condition.startswith("attribute_not_exists("):
+            satisfied = item is None
+        else:
+            attribute, value = (part.strip() for part in condition.split("="))
+            satisfied = (
+                item is not None
+                and item.get(attribute) == kwargs["ExpressionAttributeValues"][value]
+            )
+        if not satisfied:
+            raise client_error("ConditionalCheckFailedException", operation)
+
+    def get_item(self, TableName: str, Key: dict, **kwargs) -> dict:
+        self._call("GetItem")
+        (key,) = Key.values()
+        item = self.tables.get(TableName, {}).get(key["S"])
+        return {"Item": dict(item)} if item else {}
+
+    def put_item(self, TableName: str, Item: dict, **kwargs) -> dict:
+        self._call("PutItem")
+        key = next(iter(Item.values()))
+        with self._lock:
+            table = self.tables.setdefault(TableName, {})
+            self._check(table.get(key["S"]), "PutItem", **kwargs)
+            table[key["S"]] = dict(Item)
+        return {}
+
+    def delete_item(self, TableName: str, Key: dict, **kwargs) -> dict:
+        self._call("DeleteItem")
+        (key,) = Key.values()
+        with self._lock:
+            table = self.tables.setdefault(TableName, {})
+            self._check(table.get(key["S"]), "DeleteItem", **kwargs)
+            table.pop(key["S"], None)
+        return {}
+
+
+class FakeCodeBuild(FakeClient):
+    """A stand-in for the CodeBuild build APIs used by the seed code check-in."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        self.builds: Dict[str, dict] = {}
+
+    def start_build(self, projectName: str, **kwargs) -> dict:
+        self._call("StartBuild")
+        build = {
+            "id": f"{projectName}:{uuid.uuid4()}",
+            "projectName": projectName,
+            "environment": {
+                "environmentVariables": kwargs.get("environmentVariablesOverride", [])
+            },
+            "secondarySources": kwargs.get("secondarySourcesOverride", []),
+        }
+        with self._lock:
+            self.builds[build["id"]] = build
+        return {"build": build}
+
+    def batch_get_builds(self, ids: List[str]) -> dict:
+        self._call("BatchGetBuilds")
+        return {"builds": [self.builds[build_id] for build_id in ids]}
+
+
+class FakeSSM(FakeClient):
+    """A stand-in for the SSM parameter APIs, without versions or tiers."""
+
+    class exceptions:
+        class ParameterNotFound(Exception):
+            pass
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        self.parameters: Dict[str, str] = {}
+
+    def get_parameter(self, Name: str, **kwargs) -> dict:
+        self._call("GetParameter")
+        if Name not in self.parameters:
+            raise self.exceptions.ParameterNotFound(Name)
+        return {"Parameter": {"Name": Name, "Value": self.parameters[Name]}}
+
+    def put_parameter(
+        self, Name: str, Value: str, Overwrite: bool = False, **kwargs
+    ) -> dict:
+        self._call("PutParameter")
+        with self._lock:
+            if Name in self.parameters and not Overwrite:
+                raise client_error("ParameterAlreadyExists", "PutParameter")
+            self.parameters[Name] = Value
+        return {"Version": 1}
+
+    def delete_parameter(self, Name: str) -> dict:
+        self._call("DeleteParameter")
+        with self._lock:
+            if self.parameters.pop(Name, None) is None:
+                raise self.exceptions.ParameterNotFound(Name)
+        return {}
+
+
+class FakeECR(FakeClient):
+    """A stand-in for the ECR image API used by the replicas, keyed on tags."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        # image tags by (registry, repository)
+        self.repositories: Dict[Tuple[str, str], set] = {}
+
+    def add_image(self, registry: str, repository: str, tag: str):
+        self.repositories.setdefault((registry, repository), set()).add(tag)
+
+    def describe_images(
+        self, registryId: str, repositoryName: str, imageIds: List[dict]
+    ) -> dict:
+        self._call("DescribeImages")
+        if (tags := self.repositories.get((registryId, repositoryName))) is None:
+            raise client_error("RepositoryNotFoundException", "DescribeImages")
+        if any(image_id.get("imageTag") not in tags for image_id in imageIds):
+            raise client_error("ImageNotFoundException", "DescribeImages")
+        return {"imageDetails": [{"imageTags": [i["imageTag"]]} for i in imageIds]}
+
+
+class FakePersistenceLayer(BasePersistenceLayer):
+    """An in-memory stand-in for the DynamoDB idempotency persistence layer."""
+
+    def __init__(self):
+        super().__init__()
+        self.records: Dict[str, DataRecord] = {}
+        self._lock = threading.Lock()
+
+    def _get_record(self, idempotency_key) -> DataRecord:
+        try:
+            return self.records[idempotency_key]
+        except KeyError:
+            raise IdempotencyItemNotFoundError
+
+    def _put_record(self, data_record: DataRecord):
+        with self._lock:
+            existing = self.records.get(data_record.idempotency_key)
+            if existing and not existing.is_expired:
+                raise IdempotencyItemAlreadyExistsError(old_data_record=existing)
+            self.records[data_record.idempotency_key] = data_record
+
+    def _update_record(self, data_record: DataRecord):
+        with self._lock:
+            self.records[data_record.idempotency_key] = data_record
+
+    def _delete_record(self, data_record: DataRecord):
+        with self._lock:
+            self.records.pop(data_record.idempotency_key, None)
@@ -0,0 +1,167 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+from fakes import FakeSageMaker, FakeSSM
+
+# loaded under its own name, the model sync handler is imported as `index`
+spec = importlib.util.spec_from_file_location(
+    "approved_model_pointer",
+    Path(__file__)
+    .parents[2]
+    .joinpath("functions", "approved_model_pointer", "index.py"),
+)
+approved_model_pointer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(approved_model_pointer)
+
+POINTER_NAME = "/mlops/project/model/latest_approved"
+
+
+class FakeCodePipeline:
+    def __init__(self):
+        self.executions = []
+
+    def start_pipeline_execution(self, name: str) -> dict:
+        self.executions.append(name)
+        return {"pipelineExecutionId": str(len(self.executions))}
+
+
+@pytest.fixture
+def sagemaker(monkeypatch):
+    sagemaker = FakeSageMaker()
+    monkeypatch.setattr(approved_model_pointer, "sagemaker_client", sagemaker)
+    return sagemaker
+
+
+@pytest.fixture
+def ssm(monkeypatch):
+    ssm = FakeSSM()
+    monkeypatch.setattr(approved_model_pointer, "ssm_client", ssm)
+    return ssm
+
+
+@pytest.fixture
+def codepipeline(monkeypatch):
+    codepipeline = FakeCodePipeline()
+    monkeypatch.setattr(approved_model_pointer, "codepipeline_client", codepipeline)
+    return codepipeline
+
+
+def add_model_package(sagemaker):
+    return sagemaker.add_model_package(
+        "models",
+        InferenceSpecification={
+            "Containers": [{"ModelDataUrl": "s3://bucket/model/model.tar.gz"}]
+        },
+        ModelMetrics={
+            "ModelQuality": {
+                "Statistics": {
+                    "ContentType": "application/json",
+                    "S3Uri": "s3://bucket/model/evaluation.json",
+                }
+            }
+        },
+    )
+
+
+def state_change(sagemaker, model_package_arn):
+    detail = sagemaker.describe_model_package(ModelPackageName=model_package_arn)
+    return {
+        "ProjectName": "project",
+        "PipelineName": "sagemaker-project-deploy",
+        "detail": detail,
+    }
+
+
+def pointer(ssm):
+    return json.loads(ssm.parameters[POINTER_NAME])
+
+
+def test_approval_moves_the_pointer_and_starts_the_pipeline(
+    sagemaker, ssm, codepipeline
+):
+    model_package_arn = add_model_package(sagemaker)
+
+    approved_model_pointer.lambda_handler(
+        state_change(sagemaker, model_package_arn), None
+    )
+
+    assert pointer(ssm) == {
+        "ModelPackageArn": model_package_arn,
+        "ModelPackageVersion": 1,
+        "ArtifactUris": ["s3://bucket/model/model.tar.gz"],
+        "ModelMetrics": {
+            "ModelQuality.Statistics": "s3://bucket/model/evaluation.json"
+        },
+        "ArtifactStatus": "Available",
+        "ReplicaArns": {},
+    }
+    assert codepipeline.executions == ["sagemaker-project-deploy"]
+
+
+def test_update_of_the_approved_package_refreshes_the_pointer(
+    sagemaker, ssm, codepipeline
+):
+    model_package_arn = add_model_package(sagemaker)
+    replica_arn = model_package_arn.replace("us-east-1", "eu-west-1")
+    sagemaker.packages[model_package_arn]["CustomerMetadataProperties"] = {
+        "ArtifactStatus": "Pending"
+    }
+    approved_model_pointer.lambda_handler(
+        state_change(sagemaker, model_package_arn), None
+    )
+    assert pointer(ssm)["ArtifactStatus"] == "Pending"
+
+    # the replication of the artifacts completes
+    sagemaker.packages[model_package_arn]["CustomerMetadataProperties"] = {
+        "ArtifactStatus": "Available",
+        "ReplicaArn.eu-west-1": replica_arn,
+    }
+    approved_model_pointer.lambda_handler(
+        state_change(sagemaker, model_package_arn), None
+    )
+
+    assert pointer(ssm) == {
+        **pointer(ssm),
+        "ArtifactStatus": "Available",
+        "ReplicaArns": {"eu-west-1": replica_arn},
+    }
+
+
+def test_late_approval_of_an_earlier_version_is_ignored(sagemaker, ssm, codepipeline):
+    first_arn = add_model_package(sagemaker)
+    second_arn = add_model_package(sagemaker)
+    approved_model_pointer.lambda_handler(state_change(sagemaker, second_arn), None)
+
+    approved_model_pointer.lambda_handler(state_change(sagemaker, first_arn), None)
+
+    assert pointer(ssm)["ModelPackageArn"] == second_arn
+    assert len(codepipeline.executions) == 2
+
+
+def test_rejection_moves_the_pointer_back(sagemaker, ssm, codepipeline):
+    first_arn = add_model_package(sagemaker)
+    second_arn = add_model_package(sagemaker)
+    approved_model_pointer.lambda_handler(state_change(sagemaker, second_arn), None)
+    sagemaker.packages[second_arn]["ModelApprovalStatus"] = "Rejected"
+
+    approved_model_pointer.lambda_handler(state_change(sagemaker, second_arn), None)
+
+    assert pointer(ssm)["ModelPackageArn"] == first_arn
+
+
+def test_rejection_of_the_last_approved_package_removes_the_pointer(
+    sagemaker, ssm, codepipeline
+):
+    model_package_arn = add_model_package(sagemaker)
+    approved_model_pointer.lambda_handler(
+        state_change(sagemaker, model_package_arn), None
+    )
+    sagemaker.packages[model_package_arn]["ModelApprovalStatus"] = "Rejected"
+
+    approved_model_pointer.lambda_handler(
+        state_change(sagemaker, model_package_arn), None
+    )
+
+    assert POINTER_NAME not in ssm.parameters
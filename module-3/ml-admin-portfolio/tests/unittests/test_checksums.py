@@ -0,0 +1,162 @@
+import base64
+import hashlib
+
+import checksums
+import content_index
+import copy_engine
+import index
+import pytest
+from fakes import MiB
+
+
+def sha256_checksum(obj):
+    return base64.b64encode(hashlib.sha256(obj.read(0, obj.size)).digest()).decode()
+
+
+def test_multipart_copy_streams_only_the_source(s3, monkeypatch):
+    monkeypatch.setattr(checksums, "STREAM_CHUNK_SIZE", 1 * MiB)
+    source = s3.add_object("dev-bucket", "model/model.tar.gz", 12 * MiB)
+    copy_engine.copy_object(
+        s3,
+        "dev-bucket",
+        "model/model.tar.gz",
+        "central-bucket",
+        "group/model/model.tar.gz",
+        multipart_threshold=5 * MiB,
+        part_size=5 * MiB,
+    )
+
+    algorithm, value = checksums.verify_copy(
+        s3,
+        "s3://dev-bucket/model/model.tar.gz",
+        "s3://central-bucket/group/model/model.tar.gz",
+    )
+
+    part_digests = b"".join(
+        hashlib.sha256(source.read(start, min(start + 5 * MiB, source.size))).digest()
+        for start in range(0, source.size, 5 * MiB)
+    )
+    expected = base64.b64encode(hashlib.sha256(part_digests).digest()).decode()
+    assert (algorithm, value) == ("SHA256", f"{expected}-3")
+    assert s3.calls["GetObject"] == 1
+
+
+def test_copy_of_a_source_with_the_same_checksum_is_not_streamed(s3):
+    source = s3.add_object("dev-bucket", "model/model.tar.gz", 10 * MiB)
+    source.checksums["ChecksumSHA256"] = sha256_checksum(source)
+    copy_engine.copy_object(
+        s3,
+        "dev-bucket",
+        "model/model.tar.gz",
+        "central-bucket",
+        "group/model/model.tar.gz",
+    )
+
+    assert checksums.verify_copy(
+        s3,
+        "s3://dev-bucket/model/model.tar.gz",
+        "s3://central-bucket/group/model/model.tar.gz",
+    ) == ("SHA256", source.checksums["ChecksumSHA256"])
+    assert s3.calls["GetObject"] == 0
+
+
+def test_composite_checksum_of_source_is_ignored(s3):
+    s3.add_object(
+        "dev-bucket",
+        "model/model.tar.gz",
+        10 * MiB,
+        checksums={"ChecksumSHA256": "c29tZS1wYXJ0cw==-3"},
+    )
+    copy_engine.copy_object(
+        s3,
+        "dev-bucket",
+        "model/model.tar.gz",
+        "central-bucket",
+        "group/model/model.tar.gz",
+    )
+
+    algorithm, _ = checksums.verify_copy(
+        s3,
+        "s3://dev-bucket/model/model.tar.gz",
+        "s3://central-bucket/group/model/model.tar.gz",
+    )
+
+    assert algorithm == "SHA256"
+    # the copy has the SHA-256 checksum computed by S3, only the source is streamed
+    assert s3.calls["GetObject"] == 1
+
+
+def test_corrupted_copy_is_detected(s3):
+    s3.add_object("dev-bucket", "model/model.tar.gz", 10 * MiB)
+    s3.add_object("central-bucket", "group/model/model.tar.gz", 10 * MiB)
+
+    with pytest.raises(checksums.ChecksumMismatchError):
+        checksums.verify_copy(
+            s3,
+            "s3://dev-bucket/model/model.tar.gz",
+            "s3://central-bucket/group/model/model.tar.gz",
+        )
+
+
+def sync_artifact(monkeypatch, s3, source_key, destination_prefix):
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "content_deduplication", True)
+    monkeypatch.setattr(index, "checksum_verification", True)
+    model_package = {"ModelDataUrl": f"s3://dev-bucket/{source_key}"}
+    reused = set()
+    _, artifact_map = index.upload_and_replace(
+        model_package, "central-bucket", destination_prefix, reused=reused
+    )
+    index.verify_artifacts(artifact_map, destination_prefix, reused)
+    return artifact_map[f"s3://dev-bucket/{source_key}"]
+
+
+def test_corrupted_shared_copy_is_kept_and_copied_again(s3, monkeypatch):
+    source = s3.add_object("dev-bucket", "model/model.tar.gz", 1024)
+    source.checksums["ChecksumSHA256"] = sha256_checksum(source)
+    s3.objects[("dev-bucket", "other/model.tar.gz")] = source
+    shared_copy = sync_artifact(monkeypatch, s3, "model/model.tar.gz", "models-1")
+    # the shared copy gets corrupted after a first package referenced it
+    s3.add_object("central-bucket", index.split_s3_uri(shared_copy)[1], 1024)
+
+    new_copy = sync_artifact(monkeypatch, s3, "other/model.tar.gz", "models-2")
+
+    assert new_copy == "s3://central-bucket/models-2/other/model.tar.gz"
+    assert ("central-bucket", index.split_s3_uri(shared_copy)[1]) in s3.objects
+    # the content index now references the new copy
+    head = s3.head_object(Bucket="dev-bucket", Key="model/model.tar.gz")
+    assert (
+        content_index.find(s3, "central-bucket", head)
+        == index.split_s3_uri(new_copy)[1]
+    )
+
+
+def test_corrupted_new_copy_is_removed(s3, monkeypatch):
+    s3.add_object("dev-bucket", "model/model.tar.gz", 1024)
+    monkeypatch.setattr(index, "s3_client", s3)
+    destination = "s3://central-bucket/models-1/model/model.tar.gz"
+    s3.add_object("central-bucket", "models-1/model/model.tar.gz", 1024)
+
+    with pytest.raises(checksums.ChecksumMismatchError):
+        index.verify_artifacts(
+            {"s3://dev-bucket/model/model.tar.gz": destination}, "models-1"
+        )
+
+    assert ("central-bucket", "models-1/model/model.tar.gz") not in s3.objects
+
+
+def test_artifacts_with_a_crc_checksum_are_not_deduplicated(s3, monkeypatch):
+    source = s3.add_object(
+        "dev-bucket",
+        "model/model.tar.gz",
+        1024,
+        checksums={"ChecksumCRC32": "AAAAAA=="},
+    )
+    s3.objects[("dev-bucket", "other/model.tar.gz")] = source
+    first_copy = sync_artifact(monkeypatch, s3, "model/model.tar.gz", "models-1")
+
+    second_copy = sync_artifact(monkeypatch, s3, "other/model.tar.gz", "models-2")
+
+    assert first_copy != second_copy
+    assert s3.calls["CopyObject"] == 2
+    assert not any(key.startswith(content_index.INDEX_PREFIX) for _, key in s3.objects)
@@ -0,0 +1,128 @@
+import threading
+
+import clients
+import pytest
+from fakes import client_error
+
+
+class FakeClock:
+    """Replaces the clock of the clients module, sleeping advances the time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        with self.lock:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(clients.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(clients.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_token_bucket_limits_the_rate_after_the_burst(clock):
+    bucket = clients.TokenBucket(rate=10, burst=5)
+
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.now == 0
+    for _ in range(20):
+        bucket.acquire()
+
+    # the 20 calls after the burst are spread over 2 seconds
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_token_bucket_refills_while_idle(clock):
+    bucket = clients.TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.acquire()
+
+    clock.now += 10
+    for _ in range(5):
+        bucket.acquire()
+
+    # the bucket never holds more than its burst
+    assert clock.now == 10
+    bucket.acquire()
+    assert clock.now == pytest.approx(10.1)
+
+
+def test_limiter_is_released_when_the_holder_raises():
+    limiter = clients.ConcurrencyLimiter(1)
+
+    with pytest.raises(RuntimeError):
+        with limiter:
+            raise RuntimeError("copy failed")
+
+    assert limiter.active == 0
+    entered = threading.Event()
+
+    def hold():
+        with limiter:
+            entered.set()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    assert entered.wait(timeout=5)
+    thread.join()
+
+
+def test_limiter_is_halved_and_raised_back_after_successes():
+    limiter = clients.ConcurrencyLimiter(8, increase_after=2)
+
+    limiter.decrease()
+    limiter.decrease()
+    assert limiter.limit == 2
+    with pytest.raises(RuntimeError):
+        with limiter:
+            raise RuntimeError("copy failed")
+    for _ in range(3):
+        with limiter:
+            pass
+
+    # failures do not count towards raising the limit
+    assert limiter.limit == 3
+
+
+def test_limiter_blocks_holders_over_the_limit():
+    limiter = clients.ConcurrencyLimiter(2)
+    release = threading.Event()
+    peak = []
+
+    def hold():
+        with limiter:
+            peak.append(limiter.active)
+            release.wait(timeout=5)
+
+    threads = [threading.Thread(target=hold) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while len(peak) < 2:
+        release.wait(timeout=0.01)
+    # the third holder waits for one of the first two
+    release.wait(timeout=0.1)
+    assert len(peak) == 2
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 2
+
+
+def test_throttling_errors_are_recognized():
+    assert clients.is_throttling(
+        client_error("ThrottlingException", "ListModelPackages")
+    )
+    assert clients.is_throttling(client_error("SlowDown", "UploadPartCopy"))
+    assert not clients.is_throttling(
+        client_error("ValidationException", "CreateModelPackage")
+    )
+    assert not clients.is_throttling(RuntimeError("ThrottlingException"))
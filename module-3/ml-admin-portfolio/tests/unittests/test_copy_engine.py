@@ -0,0 +1,116 @@
+import math
+
+import copy_engine
+import pytest
+from botocore.exceptions import ClientError
+from fakes import FakeS3, GiB, MiB
+
+KMS_KEY_ARN = "arn:aws:kms:us-east-1:111111111111:key/central-artifacts"
+
+
+@pytest.fixture
+def s3():
+    # the objects are several GB, the checksums of copies are covered in test_checksums
+    return FakeS3(compute_checksums=False)
+
+
+def test_small_object_uses_single_copy(s3):
+    source = s3.add_object("dev-bucket", "model/model.tar.gz", 10 * MiB)
+
+    copied = copy_engine.copy_object(
+        s3,
+        "dev-bucket",
+        "model/model.tar.gz",
+        "central-bucket",
+        "group-111111111111/model/model.tar.gz",
+        sse_kms_key_id=KMS_KEY_ARN,
+    )
+
+    destination = s3.objects[
+        ("central-bucket", "group-111111111111/model/model.tar.gz")
+    ]
+    assert copied == 10 * MiB
+    assert s3.calls["CopyObject"] == 1
+    assert s3.calls["CreateMultipartUpload"] == 0
+    assert destination.content() == source.content()
+    assert (destination.server_side_encryption, destination.kms_key_id) == (
+        "aws:kms",
+        KMS_KEY_ARN,
+    )
+
+
+def test_6_gb_object_is_copied_in_parallel_parts(s3):
+    size = 6 * GiB + 12345
+    source = s3.add_object(
+        "dev-bucket",
+        "llm/model.tar.gz",
+        size,
+        content_type="application/x-tar",
+        metadata={"framework": "pytorch"},
+    )
+
+    copied = copy_engine.copy_object(
+        s3,
+        "dev-bucket",
+        "llm/model.tar.gz",
+        "central-bucket",
+        "llm-111111111111/llm/model.tar.gz",
+        part_size=256 * MiB,
+        max_concurrency=8,
+        sse_kms_key_id=KMS_KEY_ARN,
+    )
+
+    destination = s3.objects[("central-bucket", "llm-111111111111/llm/model.tar.gz")]
+    assert copied == size
+    assert s3.calls["CopyObject"] == 0
+    assert s3.calls["UploadPartCopy"] == math.ceil(size / (256 * MiB))
+    assert destination.size == size
+    assert destination.content() == source.content()
+    assert destination.content_type == "application/x-tar"
+    assert destination.metadata == {"framework": "pytorch"}
+    assert (destination.server_side_encryption, destination.kms_key_id) == (
+        "aws:kms",
+        KMS_KEY_ARN,
+    )
+    assert not s3.uploads
+
+
+def test_bucket_default_encryption_applies_without_kms_key(s3):
+    s3.add_object("dev-bucket", "llm/model.tar.gz", 6 * GiB)
+
+    copy_engine.copy_object(
+        s3, "dev-bucket", "llm/model.tar.gz", "central-bucket", "llm/model.tar.gz"
+    )
+
+    destination = s3.objects[("central-bucket", "llm/model.tar.gz")]
+    assert destination.kms_key_id == s3.default_kms_key_id
+
+
+def test_failed_part_aborts_multipart_upload(s3, monkeypatch):
+    s3.add_object("dev-bucket", "llm/model.tar.gz", 1 * GiB)
+    upload_part_copy = s3.upload_part_copy
+
+    def flaky_upload_part_copy(**kwargs):
+        if kwargs["PartNumber"] == 3:
+            raise ClientError({"Error": {"Code": "InternalError"}}, "UploadPartCopy")
+        return upload_part_copy(**kwargs)
+
+    monkeypatch.setattr(s3, "upload_part_copy", flaky_upload_part_copy)
+
+    with pytest.raises(ClientError):
+        copy_engine.copy_object(
+            s3, "dev-bucket", "llm/model.tar.gz", "central-bucket", "llm/model.tar.gz"
+        )
+
+    assert s3.calls["AbortMultipartUpload"] == 1
+    assert ("central-bucket", "llm/model.tar.gz") not in s3.objects
+    assert not s3.uploads
+
+
+def test_part_ranges_respect_s3_limits():
+    ranges = copy_engine.part_ranges(6 * 1024 * GiB, 8 * MiB)
+
+    assert len(ranges) <= copy_engine.MAX_PARTS
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == 6 * 1024 * GiB - 1
+    assert all(b[0] == a[1] + 1 for a, b in zip(ranges, ranges[1:]))
@@ -0,0 +1,165 @@
+import importlib.util
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from fakes import FakeClient, FakePaginator, client_error
+
+# loaded under its own name, the model sync handler is imported as `index`
+spec = importlib.util.spec_from_file_location(
+    "enable_sagemaker_projects",
+    Path(__file__)
+    .parents[2]
+    .joinpath(
+        "service_catalog",
+        "ml_admin_products",
+        "functions",
+        "enable_sagemaker_projects",
+        "index.py",
+    ),
+)
+enable_sagemaker_projects = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(enable_sagemaker_projects)
+
+PORTFOLIO_ID = "port-abc"
+
+
+def role(name):
+    return f"arn:aws:iam::111111111111:role/{name}"
+
+
+class FakeSageMakerPortfolio:
+    def __init__(self):
+        self.status = "Disabled"
+
+    def get_sagemaker_servicecatalog_portfolio_status(self) -> dict:
+        return {"Status": self.status}
+
+    def enable_sagemaker_servicecatalog_portfolio(self) -> dict:
+        self.status = "Enabled"
+        return {}
+
+
+class FakeServiceCatalog(FakeClient):
+    def __init__(self, failing_principals=()):
+        super().__init__()
+        self.principals = {}
+        self.failing_principals = set(failing_principals)
+
+    def list_principals_for_portfolio(
+        self, PortfolioId: str, PageToken: Optional[str] = None
+    ) -> dict:
+        self._call("ListPrincipalsForPortfolio")
+        return {
+            "Principals": [
+                {"PrincipalARN": arn, "PrincipalType": "IAM"}
+                for arn in sorted(self.principals.get(PortfolioId, set()))
+            ]
+        }
+
+    def associate_principal_with_portfolio(
+        self, PortfolioId: str, PrincipalARN: str, PrincipalType: str
+    ) -> dict:
+        self._call("AssociatePrincipalWithPortfolio")
+        if PrincipalARN in self.failing_principals:
+            raise client_error("InvalidParametersException", "AssociatePrincipal")
+        with self._lock:
+            self.principals.setdefault(PortfolioId, set()).add(PrincipalARN)
+        return {}
+
+    def disassociate_principal_from_portfolio(
+        self, PortfolioId: str, PrincipalARN: str, PrincipalType: str
+    ) -> dict:
+        self._call("DisassociatePrincipalFromPortfolio")
+        with self._lock:
+            self.principals[PortfolioId].remove(PrincipalARN)
+        return {}
+
+    def get_paginator(self, operation_name: str) -> FakePaginator:
+        return FakePaginator(getattr(self, operation_name))
+
+
+@pytest.fixture
+def sagemaker(monkeypatch):
+    sagemaker = FakeSageMakerPortfolio()
+    monkeypatch.setattr(enable_sagemaker_projects, "sm_client", sagemaker)
+    return sagemaker
+
+
+@pytest.fixture
+def servicecatalog(monkeypatch):
+    servicecatalog = FakeServiceCatalog()
+    monkeypatch.setattr(enable_sagemaker_projects, "sc_client", servicecatalog)
+    return servicecatalog
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    responses = []
+    monkeypatch.setattr(
+        enable_sagemaker_projects.cfnresponse,
+        "send",
+        lambda event, context, status, data, *args, **kwargs: responses.append(status),
+    )
+    return responses
+
+
+def request(request_type, roles, old_roles=None):
+    event = {
+        "RequestType": request_type,
+        "ResourceProperties": {"PortfolioId": PORTFOLIO_ID, "ExecutionRoles": roles},
+    }
+    if old_roles is not None:
+        event["OldResourceProperties"] = {
+            "PortfolioId": PORTFOLIO_ID,
+            "ExecutionRoles": old_roles,
+        }
+    return event
+
+
+def test_only_the_missing_principals_are_associated(
+    sagemaker, servicecatalog, responses
+):
+    servicecatalog.principals[PORTFOLIO_ID] = {role("a"), role("b")}
+    roles = [role(name) for name in "abcde"]
+
+    enable_sagemaker_projects.handler(request("Create", roles), None)
+
+    assert responses == [enable_sagemaker_projects.cfnresponse.SUCCESS]
+    assert sagemaker.status == "Enabled"
+    assert servicecatalog.principals[PORTFOLIO_ID] == set(roles)
+    assert servicecatalog.calls["AssociatePrincipalWithPortfolio"] == 3
+
+
+def test_principals_removed_from_the_resource_are_disassociated(
+    sagemaker, servicecatalog, responses
+):
+    servicecatalog.principals[PORTFOLIO_ID] = {role("a"), role("b"), role("other")}
+
+    enable_sagemaker_projects.handler(
+        request("Update", [role("a"), role("c")], old_roles=[role("a"), role("b")]),
+        None,
+    )
+
+    assert responses == [enable_sagemaker_projects.cfnresponse.SUCCESS]
+    # principals associated outside of the resource are kept
+    assert servicecatalog.principals[PORTFOLIO_ID] == {
+        role("a"),
+        role("c"),
+        role("other"),
+    }
+    assert servicecatalog.calls["DisassociatePrincipalFromPortfolio"] == 1
+
+
+def test_failed_association_fails_the_request(sagemaker, monkeypatch, responses):
+    monkeypatch.setattr(
+        enable_sagemaker_projects,
+        "sc_client",
+        FakeServiceCatalog(failing_principals=[role("b")]),
+    )
+
+    enable_sagemaker_projects.handler(
+        request("Create", [role("a"), role("b"), role("c")]), None
+    )
+
+    assert responses == [enable_sagemaker_projects.cfnresponse.FAILED]
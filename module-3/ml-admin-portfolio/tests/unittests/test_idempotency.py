@@ -0,0 +1,94 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from aws_lambda_powertools.utilities import idempotency
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyAlreadyInProgressError,
+)
+from fakes import FakePersistenceLayer, FakeSageMaker
+
+
+def add_approval_event(sagemaker, s3):
+    s3.add_object("dev-bucket", "model/model.tar.gz", 1024)
+    model_package_arn = sagemaker.add_model_package(
+        "models",
+        account_id="222222222222",
+        InferenceSpecification={
+            "Containers": [
+                {
+                    "Image": "xgboost:1",
+                    "ModelDataUrl": "s3://dev-bucket/model/model.tar.gz",
+                }
+            ]
+        },
+    )
+    return {"id": "event-1", "detail": {"ModelPackageArn": model_package_arn}}
+
+
+@pytest.fixture
+def persistence_store(monkeypatch):
+    persistence_store = FakePersistenceLayer()
+    monkeypatch.setattr(
+        idempotency, "DynamoDBPersistenceLayer", lambda table_name: persistence_store
+    )
+    return persistence_store
+
+
+@pytest.fixture
+def idempotent_index(monkeypatch, persistence_store, s3, sagemaker):
+    # the sync is only made idempotent when the function has an idempotency table
+    monkeypatch.setenv("IdempotencyTableName", "idempotency")
+    spec = importlib.util.spec_from_file_location(
+        "idempotent_index",
+        Path(__file__).parents[2].joinpath("functions", "model_sync", "index.py"),
+    )
+    idempotent_index = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(idempotent_index)
+    # the source and central registries are served by the same stand-in
+    idempotent_index.s3_client = s3
+    idempotent_index.sagemaker_client = sagemaker
+    idempotent_index.destination_bucket_name = "central-bucket"
+    idempotent_index.sync_index_table_name = None
+    idempotent_index.replica_buckets = {}
+    return idempotent_index
+
+
+@pytest.fixture
+def sagemaker():
+    return FakeSageMaker()
+
+
+def test_duplicate_delivery_is_not_synced_again(s3, sagemaker, idempotent_index):
+    event = add_approval_event(sagemaker, s3)
+
+    message = idempotent_index.sync_event(event=event)
+    calls = sum(sagemaker.calls.values()) + sum(s3.calls.values())
+    duplicate_message = idempotent_index.sync_event(event=dict(event))
+
+    assert duplicate_message == message
+    # the stored outcome is returned without calling SageMaker or S3
+    assert sum(sagemaker.calls.values()) + sum(s3.calls.values()) == calls
+    assert sagemaker.calls["CreateModelPackage"] == 1
+
+
+def test_delivery_of_an_event_being_synced_is_retried_later(
+    s3, sagemaker, idempotent_index, monkeypatch
+):
+    event = add_approval_event(sagemaker, s3)
+    redeliveries = []
+    describe_model_package = sagemaker.describe_model_package
+
+    def redeliver_while_syncing(**kwargs):
+        if not redeliveries:
+            with pytest.raises(IdempotencyAlreadyInProgressError):
+                redeliveries.append(idempotent_index.sync_event(event=dict(event)))
+            redeliveries.append(None)
+        return describe_model_package(**kwargs)
+
+    monkeypatch.setattr(sagemaker, "describe_model_package", redeliver_while_syncing)
+
+    idempotent_index.sync_event(event=event)
+
+    assert redeliveries == [None]
+    assert sagemaker.calls["CreateModelPackage"] == 1
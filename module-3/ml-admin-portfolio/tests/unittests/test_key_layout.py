@@ -0,0 +1,50 @@
+import index
+import key_layout
+import pytest
+
+
+def test_hashed_layout_is_reversible():
+    key = key_layout.destination_key(
+        "models-222222222222", "model/model.tar.gz", key_layout.HASHED
+    )
+
+    shard, _, unsharded_key = key.partition("/")
+    assert len(shard) == key_layout.DEFAULT_SHARD_WIDTH
+    assert unsharded_key == "models-222222222222/model/model.tar.gz"
+    assert key_layout.unshard_key(key, key_layout.HASHED) == unsharded_key
+
+
+def test_unsharded_key_is_rejected():
+    with pytest.raises(ValueError):
+        key_layout.unshard_key(
+            "models-222222222222/model/model.tar.gz", key_layout.HASHED
+        )
+
+
+def test_copies_follow_the_key_layout(s3, monkeypatch):
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "content_deduplication", False)
+    monkeypatch.setattr(index, "checksum_verification", False)
+    monkeypatch.setattr(index, "artifact_key_layout", key_layout.HASHED)
+    s3.add_object("dev-bucket", "model/model.tar.gz", 1024)
+    model_package = {
+        "InferenceSpecification": {
+            "Containers": [{"ModelDataUrl": "s3://dev-bucket/model/model.tar.gz"}]
+        }
+    }
+
+    new_model_package, artifact_map = index.upload_and_replace(
+        model_package, "central-bucket", "models-222222222222"
+    )
+
+    destination_uri = artifact_map["s3://dev-bucket/model/model.tar.gz"]
+    _, destination_key = index.split_s3_uri(destination_uri)
+    assert (
+        new_model_package["InferenceSpecification"]["Containers"][0]["ModelDataUrl"]
+        == destination_uri
+    )
+    assert ("central-bucket", destination_key) in s3.objects
+    assert (
+        key_layout.unshard_key(destination_key, key_layout.HASHED)
+        == "models-222222222222/model/model.tar.gz"
+    )
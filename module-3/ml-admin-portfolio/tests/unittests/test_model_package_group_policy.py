@@ -0,0 +1,104 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+from fakes import FakeSageMaker
+
+# loaded under its own name, the model sync handler is imported as `index`
+spec = importlib.util.spec_from_file_location(
+    "model_package_group_policy",
+    Path(__file__)
+    .parents[2]
+    .joinpath(
+        "service_catalog",
+        "ml_admin_products",
+        "functions",
+        "model_package_group_policy",
+        "index.py",
+    ),
+)
+model_package_group_policy = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(model_package_group_policy)
+
+ACCOUNT_ID = "111111111111"
+
+
+class FakeContext:
+    function_name = "model-package-group-policy"
+    memory_limit_in_mb = 128
+    invoked_function_arn = (
+        f"arn:aws:lambda:us-east-1:{ACCOUNT_ID}:function:model-package-group-policy"
+    )
+    aws_request_id = "request-1"
+
+
+@pytest.fixture
+def sagemaker(monkeypatch):
+    sagemaker = FakeSageMaker(account_id=ACCOUNT_ID)
+    monkeypatch.setattr(
+        model_package_group_policy, "sagemaker_client", lambda: sagemaker
+    )
+    monkeypatch.setenv("CENTRAL_ACCOUNT_ID", "999999999999")
+    return sagemaker
+
+
+def group_created(sagemaker, message_id, group_name):
+    group_arn = sagemaker._group_arn(group_name)
+    return {
+        "messageId": message_id,
+        "body": json.dumps(
+            {"detail": {"responseElements": {"modelPackageGroupArn": group_arn}}}
+        ),
+    }
+
+
+def test_policy_of_each_group_is_put_once_per_batch(sagemaker):
+    for name in ("models-a", "models-b"):
+        sagemaker.create_model_package_group(ModelPackageGroupName=name)
+    records = [
+        group_created(sagemaker, "1", "models-a"),
+        group_created(sagemaker, "2", "models-a"),
+        group_created(sagemaker, "3", "models-b"),
+    ]
+
+    response = model_package_group_policy.handle_records(records, ACCOUNT_ID)
+
+    assert response == {"batchItemFailures": []}
+    assert sagemaker.calls["PutModelPackageGroupPolicy"] == 2
+    policy = json.loads(
+        sagemaker.get_model_package_group_policy(ModelPackageGroupName="models-a")[
+            "ResourcePolicy"
+        ]
+    )
+    assert policy["Statement"][0]["Resource"].endswith("model-package-group/models-a")
+
+
+def test_only_the_failed_records_are_reported(sagemaker):
+    sagemaker.create_model_package_group(ModelPackageGroupName="models-a")
+    records = [
+        group_created(sagemaker, "1", "models-a"),
+        # the group was deleted before its policy was put
+        group_created(sagemaker, "2", "deleted"),
+        {"messageId": "3", "body": "not json"},
+        {"messageId": "4", "body": json.dumps({"detail": {}})},
+    ]
+
+    response = model_package_group_policy.handle_records(records, ACCOUNT_ID)
+
+    assert sorted(
+        failure["itemIdentifier"] for failure in response["batchItemFailures"]
+    ) == ["2", "3", "4"]
+    assert "ResourcePolicy" in sagemaker.groups[sagemaker._group_arn("models-a")]
+
+
+def test_reconcile_puts_the_policy_of_every_group(sagemaker):
+    for name in ("models-a", "models-b", "models-c"):
+        sagemaker.create_model_package_group(ModelPackageGroupName=name)
+
+    response = model_package_group_policy.handler(
+        {"action": "reconcile"}, FakeContext()
+    )
+
+    assert response["statusCode"] == 200
+    assert all("ResourcePolicy" in group for group in sagemaker.groups.values())
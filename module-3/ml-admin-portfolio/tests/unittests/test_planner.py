@@ -0,0 +1,119 @@
+import content_index
+import index
+import planner
+import pytest
+from fakes import MiB, FakeSageMaker
+
+SOURCE_ACCOUNT_ID = "222222222222"
+
+
+@pytest.fixture
+def sagemaker(s3, monkeypatch):
+    sagemaker = FakeSageMaker()
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "sagemaker_client", sagemaker)
+    monkeypatch.setattr(index, "destination_bucket_name", "central-bucket")
+    monkeypatch.setattr(index, "sync_index_table_name", None)
+    monkeypatch.setattr(index, "content_deduplication", False)
+    monkeypatch.setattr(index, "multipart_threshold", 256 * MiB)
+    monkeypatch.setattr(index, "copy_concurrency", 2)
+    return sagemaker
+
+
+def add_model_package(sagemaker, s3, sizes, **checksums):
+    for i, size in enumerate(sizes):
+        s3.add_object(
+            "dev-bucket", f"model/{i}/model.tar.gz", size, checksums=checksums
+        )
+    return sagemaker.add_model_package(
+        "models",
+        account_id=SOURCE_ACCOUNT_ID,
+        InferenceSpecification={
+            "Containers": [
+                {
+                    "Image": "xgboost:1",
+                    "ModelDataUrl": f"s3://dev-bucket/model/{i}/model.tar.gz",
+                }
+                for i in range(len(sizes))
+            ],
+        },
+    )
+
+
+def test_plan_reports_objects_to_copy_without_side_effects(s3, sagemaker):
+    arn = add_model_package(sagemaker, s3, [1024 * MiB, 10 * MiB, 10 * MiB])
+    # the sync copies over an object at the destination key, it is not reused
+    s3.add_object(
+        "central-bucket", f"models-{SOURCE_ACCOUNT_ID}/model/2/model.tar.gz", 10 * MiB
+    )
+    objects = dict(s3.objects)
+
+    plan = planner.plan({"ModelPackageArn": arn})
+
+    assert plan["Summary"] == {
+        **plan["Summary"],
+        "PackagesToSync": 1,
+        "ObjectsToCopy": 3,
+        "BytesToCopy": 1044 * MiB,
+        "ObjectsPresent": 0,
+        "LargestObjectBytes": 1024 * MiB,
+    }
+    assert [a["Multipart"] for a in plan["Packages"][0]["Artifacts"]] == [
+        True,
+        False,
+        False,
+    ]
+    assert s3.objects == objects
+    assert not s3.calls["CopyObject"] and not sagemaker.calls["CreateModelPackage"]
+
+
+def test_objects_in_the_content_index_are_present(s3, sagemaker, monkeypatch):
+    monkeypatch.setattr(index, "content_deduplication", True)
+    arn = add_model_package(sagemaker, s3, [10 * MiB], ChecksumSHA256="c2hhMjU2")
+    source = s3.head_object(
+        Bucket="dev-bucket", Key="model/0/model.tar.gz", ChecksumMode="ENABLED"
+    )
+    s3.add_object(
+        "central-bucket", "models-333333333333/model/0/model.tar.gz", 10 * MiB
+    )
+    content_index.record(
+        s3, "central-bucket", source, "models-333333333333/model/0/model.tar.gz"
+    )
+
+    plan = planner.plan({"ModelPackageArn": arn})
+
+    assert plan["Summary"]["ObjectsToCopy"] == 0
+    assert plan["Summary"]["BytesPresent"] == 10 * MiB
+    assert plan["Packages"][0]["Artifacts"][0]["Destination"] == (
+        "s3://central-bucket/models-333333333333/model/0/model.tar.gz"
+    )
+    assert plan["Summary"]["TotalEstimatedSeconds"] == 0
+
+
+def test_group_plan_counts_shared_objects_once(s3, sagemaker, monkeypatch):
+    monkeypatch.setattr(index, "content_deduplication", True)
+    first = add_model_package(sagemaker, s3, [100 * MiB], ChecksumSHA256="c2hhMjU2")
+    second = add_model_package(sagemaker, s3, [100 * MiB], ChecksumSHA256="c2hhMjU2")
+    group_arn = first.replace(":model-package/", ":model-package-group/").rsplit(
+        "/", 1
+    )[0]
+
+    plan = planner.plan({"ModelPackageGroupArn": group_arn, "ThroughputMiBps": 100})
+
+    assert plan["Summary"] == {
+        **plan["Summary"],
+        "PackagesToSync": 2,
+        "ObjectsToCopy": 1,
+        "BytesToCopy": 100 * MiB,
+        "ObjectsPresent": 1,
+        "BytesPresent": 100 * MiB,
+        "TotalEstimatedSeconds": plan["Summary"]["MaxPackageEstimatedSeconds"],
+    }
+    assert [p["ModelPackageArn"] for p in plan["Packages"]] == [first, second]
+    assert plan["Packages"][1]["EstimatedSeconds"] == 0
+
+
+def test_copies_are_scheduled_on_the_copy_concurrency():
+    assert planner.schedule_seconds([4, 3, 3, 2], workers=2) == 6
+    assert planner.schedule_seconds([4, 3, 3, 2], workers=1) == 12
+    assert planner.schedule_seconds([], workers=2) == 0
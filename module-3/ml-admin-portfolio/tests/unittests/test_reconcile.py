@@ -0,0 +1,84 @@
+import index
+import reconcile
+from fakes import FakeDynamoDB, FakeSageMaker
+
+SOURCE_ACCOUNT_ID = "222222222222"
+SOURCE_GROUP_ARN = (
+    f"arn:aws:sagemaker:us-east-1:{SOURCE_ACCOUNT_ID}:model-package-group/models"
+)
+TABLE_NAME = "sync-index"
+
+
+def add_source_packages(sagemaker, s3, count):
+    arns = []
+    for version in range(count):
+        s3.add_object("dev-bucket", f"model/{version}/model.tar.gz", 1024)
+        arns.append(
+            sagemaker.add_model_package(
+                "models",
+                account_id=SOURCE_ACCOUNT_ID,
+                InferenceSpecification={
+                    "Containers": [
+                        {
+                            "Image": "xgboost:1",
+                            "ModelDataUrl": f"s3://dev-bucket/model/{version}/model.tar.gz",
+                        }
+                    ],
+                },
+            )
+        )
+    return arns
+
+
+def setup_index(monkeypatch, s3, sagemaker, dynamodb):
+    # the source and central registries are served by the same stand-in
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "sagemaker_client", sagemaker)
+    monkeypatch.setattr(index, "dynamodb_client", dynamodb)
+    monkeypatch.setattr(index, "destination_bucket_name", "central-bucket")
+    monkeypatch.setattr(index, "sync_index_table_name", TABLE_NAME)
+    monkeypatch.setattr(index, "replica_buckets", {})
+
+
+def test_backfill_of_a_new_group_syncs_every_package(s3, monkeypatch, tmp_path):
+    # every sync misses the group before the first one creates it
+    sagemaker = FakeSageMaker(latency=0.01)
+    setup_index(monkeypatch, s3, sagemaker, FakeDynamoDB())
+    source_arns = add_source_packages(sagemaker, s3, 4)
+
+    report = reconcile.reconcile(
+        index,
+        [SOURCE_GROUP_ARN],
+        reconcile.Checkpoint(str(tmp_path / "checkpoint.json")),
+        concurrency=4,
+    )
+
+    assert report == {"missing": 4, "synced": 4, "failed": 0}
+    synced = [
+        package["CustomerMetadataProperties"]["OriginalARN"]
+        for package in sagemaker.packages.values()
+        if package["ModelPackageGroupName"] == f"models-{SOURCE_ACCOUNT_ID}"
+    ]
+    assert sorted(synced) == sorted(source_arns)
+
+
+def test_dry_run_does_not_build_the_sync_index(s3, monkeypatch, tmp_path):
+    sagemaker = FakeSageMaker()
+    dynamodb = FakeDynamoDB()
+    setup_index(monkeypatch, s3, sagemaker, dynamodb)
+    source_arns = add_source_packages(sagemaker, s3, 2)
+    index.sync_model_package(source_arns[0])
+    # the index of the group is lost, as for a newly created table
+    dynamodb.tables.clear()
+    dynamodb.calls.clear()
+
+    report = reconcile.reconcile(
+        index,
+        [SOURCE_GROUP_ARN],
+        reconcile.Checkpoint(str(tmp_path / "checkpoint.json")),
+        dry_run=True,
+    )
+
+    assert report == {"missing": 1, "synced": 0, "failed": 0}
+    assert dynamodb.calls["PutItem"] == 0
+    assert dynamodb.tables == {}
@@ -0,0 +1,119 @@
+import json
+
+import index
+import pytest
+import replicas
+from fakes import FakeECR, FakeSageMaker
+
+SOURCE_ACCOUNT_ID = "222222222222"
+POLICY = json.dumps(
+    {
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"AWS": "arn:aws:iam::333333333333:root"},
+                "Action": "sagemaker:DescribeModelPackage",
+                "Resource": "arn:aws:sagemaker:us-east-1:111111111111:model-package/models-222222222222/*",
+            }
+        ]
+    }
+)
+
+
+IMAGE = "444444444444.dkr.ecr.us-east-1.amazonaws.com/xgboost:1"
+REGIONAL_IMAGE = "444444444444.dkr.ecr.eu-west-1.amazonaws.com/xgboost:1"
+
+
+@pytest.fixture
+def ecr(monkeypatch):
+    ecr = FakeECR()
+    monkeypatch.setattr(index, "replica_ecr_clients", {"eu-west-1": ecr})
+    return ecr
+
+
+def sync_with_replica(s3, monkeypatch, image=IMAGE):
+    source = FakeSageMaker(account_id=SOURCE_ACCOUNT_ID)
+    central = FakeSageMaker()
+    regional = {"eu-west-1": FakeSageMaker(region="eu-west-1")}
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "sagemaker_client", central)
+    monkeypatch.setattr(index, "destination_bucket_name", "central-bucket")
+    monkeypatch.setattr(index, "sync_index_table_name", None)
+    monkeypatch.setattr(index, "central_region", "us-east-1")
+    monkeypatch.setattr(index, "replica_buckets", {"eu-west-1": "regional-bucket"})
+    monkeypatch.setattr(index, "replica_s3_clients", {"eu-west-1": s3})
+    monkeypatch.setattr(index, "replica_sagemaker_clients", regional)
+    # the source and central registries answer the calls of the sync function
+    monkeypatch.setattr(
+        central, "describe_model_package", source.describe_model_package
+    )
+    central.create_model_package_group(ModelPackageGroupName="models-222222222222")
+    central.put_model_package_group_policy(
+        ModelPackageGroupName="models-222222222222", ResourcePolicy=POLICY
+    )
+    s3.add_object("dev-bucket", "model/model.tar.gz", 1024)
+    source_arn = source.add_model_package(
+        "models",
+        InferenceSpecification={
+            "Containers": [
+                {
+                    "Image": image,
+                    "ModelDataUrl": "s3://dev-bucket/model/model.tar.gz",
+                }
+            ],
+        },
+    )
+
+    index.sync_model_package(source_arn)
+    return source_arn, central, regional
+
+
+def test_synced_model_package_is_replicated_to_each_region(s3, ecr, monkeypatch):
+    ecr.add_image("444444444444", "xgboost", "1")
+
+    source_arn, central, regional = sync_with_replica(s3, monkeypatch)
+
+    central_package = list(central.packages.values())[-1]
+    replica_arn = central_package["CustomerMetadataProperties"][
+        replicas.metadata_key("eu-west-1")
+    ]
+    replica = regional["eu-west-1"].packages[replica_arn]
+    model_data_url = replica["InferenceSpecification"]["Containers"][0]["ModelDataUrl"]
+    assert (
+        model_data_url == "s3://regional-bucket/models-222222222222/model/model.tar.gz"
+    )
+    assert ("regional-bucket", "models-222222222222/model/model.tar.gz") in s3.objects
+    assert replica["CustomerMetadataProperties"]["OriginalARN"] == source_arn
+    assert (
+        "arn:aws:sagemaker:eu-west-1:"
+        in regional["eu-west-1"].get_model_package_group_policy(
+            ModelPackageGroupName="models-222222222222"
+        )["ResourcePolicy"]
+    )
+
+
+def test_replica_pulls_the_regional_image(s3, ecr, monkeypatch):
+    ecr.add_image("444444444444", "xgboost", "1")
+
+    _, central, regional = sync_with_replica(s3, monkeypatch)
+
+    central_package = list(central.packages.values())[-1]
+    assert central_package["InferenceSpecification"]["Containers"][0]["Image"] == IMAGE
+    replica = list(regional["eu-west-1"].packages.values())[-1]
+    assert replica["InferenceSpecification"]["Containers"][0]["Image"] == REGIONAL_IMAGE
+
+
+def test_image_without_regional_copy_is_not_replicated(s3, ecr, monkeypatch):
+    ecr.add_image("444444444444", "xgboost", "2")
+
+    with pytest.raises(replicas.MissingRegionalImageError, match=REGIONAL_IMAGE):
+        sync_with_replica(s3, monkeypatch)
+
+    assert not any(bucket == "regional-bucket" for bucket, _ in s3.objects)
+
+
+def test_images_of_other_registries_are_kept(ecr):
+    assert replicas.regional_image(
+        ecr, "registry.example.com/xgboost:1", "eu-west-1"
+    ) == ("registry.example.com/xgboost:1")
+    assert not ecr.calls["DescribeImages"]
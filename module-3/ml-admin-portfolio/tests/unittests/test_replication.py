@@ -0,0 +1,78 @@
+import checksums
+import index
+import pytest
+import replication
+from fakes import FakeSageMaker
+
+SOURCE_ACCOUNT_ID = "222222222222"
+
+
+class FakeSQS:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, QueueUrl: str, MessageBody: str) -> dict:
+        self.messages.append(MessageBody)
+        return {"MessageId": str(len(self.messages))}
+
+
+@pytest.fixture
+def sagemaker(s3, monkeypatch):
+    # the source and central registries are served by the same stand-in
+    sagemaker = FakeSageMaker()
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "sagemaker_client", sagemaker)
+    monkeypatch.setattr(index, "sqs_client", FakeSQS())
+    monkeypatch.setattr(index, "destination_bucket_name", "central-bucket")
+    monkeypatch.setattr(index, "sync_index_table_name", None)
+    monkeypatch.setattr(index, "replica_buckets", {})
+    monkeypatch.setattr(index, "replication_mode", replication.BACKGROUND)
+    monkeypatch.setattr(index, "checksum_verification", True)
+    return sagemaker
+
+
+def register_pending_package(sagemaker, s3):
+    s3.add_object("dev-bucket", "model/model.tar.gz", 1024)
+    source_arn = sagemaker.add_model_package(
+        "models",
+        account_id=SOURCE_ACCOUNT_ID,
+        InferenceSpecification={
+            "Containers": [
+                {
+                    "Image": "xgboost:1",
+                    "ModelDataUrl": "s3://dev-bucket/model/model.tar.gz",
+                }
+            ]
+        },
+    )
+    index.sync_model_package(source_arn)
+    return list(sagemaker.packages)[-1]
+
+
+def test_replicated_artifacts_are_verified_before_they_are_available(s3, sagemaker):
+    package_arn = register_pending_package(sagemaker, s3)
+    assert replication.is_pending(sagemaker.packages[package_arn])
+
+    index.replicate_model_package(package_arn)
+
+    metadata = sagemaker.packages[package_arn]["CustomerMetadataProperties"]
+    copy_uri = sagemaker.packages[package_arn]["InferenceSpecification"]["Containers"][
+        0
+    ]["ModelDataUrl"]
+    assert metadata[replication.STATUS_PROPERTY] == replication.AVAILABLE
+    assert metadata[checksums.metadata_key(copy_uri)].startswith("SHA256:")
+    assert sagemaker.calls["UpdateModelPackage"] == 1
+
+
+def test_package_with_a_corrupted_copy_is_left_pending(s3, sagemaker, monkeypatch):
+    package_arn = register_pending_package(sagemaker, s3)
+
+    def corrupted_copy(source_object_arn, destination_object_arn, source=None):
+        s3.add_object(*index.split_s3_uri(destination_object_arn), 1024)
+
+    monkeypatch.setattr(index, "replicate_artifact", corrupted_copy)
+
+    with pytest.raises(checksums.ChecksumMismatchError):
+        index.replicate_model_package(package_arn)
+    assert replication.is_pending(sagemaker.packages[package_arn])
+    assert sagemaker.calls["UpdateModelPackage"] == 0
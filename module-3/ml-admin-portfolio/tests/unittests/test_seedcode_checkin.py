@@ -0,0 +1,133 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from fakes import FakeCodeBuild, FakeSSM
+
+# loaded under its own name, the model sync handler is imported as `index`
+spec = importlib.util.spec_from_file_location(
+    "seedcode_checkin",
+    Path(__file__).parents[2].joinpath("functions", "seedcode_checkin", "index.py"),
+)
+seedcode_checkin = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(seedcode_checkin)
+
+CONNECTION_ARN = "arn:aws:codestar-connections:eu-west-1:222222222222:connection/abc"
+REQUEST = {
+    "RequestType": "Create",
+    "ResponseURL": "https://cloudformation-custom-resource-response.example/abc",
+    "StackId": "arn:aws:cloudformation:eu-west-1:222222222222:stack/project/1",
+    "RequestId": "request-1",
+    "LogicalResourceId": "SageMakerSeedCodeCheckinProjectTriggerLambdaInvoker",
+    "ResourceProperties": {
+        "CODEBUILD_PROJECT_NAME": "sagemaker-project-p-1-git-seedcodecheckin",
+        "SEEDCODE_BUCKET_NAME": "seedcode-bucket",
+        "SEEDCODE_BUCKET_KEY": "seedcode/abc.zip",
+        "GIT_REPOSITORY_FULL_NAME": "owner/repository",
+        "GIT_REPOSITORY_BRANCH": "main",
+        "GIT_REPOSITORY_CONNECTION_ARN": CONNECTION_ARN,
+    },
+}
+
+
+@pytest.fixture
+def ssm():
+    return FakeSSM()
+
+
+@pytest.fixture
+def codebuild(monkeypatch, ssm):
+    codebuild = FakeCodeBuild()
+    clients = {"codebuild": codebuild, "ssm": ssm}
+    monkeypatch.setattr(seedcode_checkin.boto3, "client", clients.__getitem__)
+    return codebuild
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    responses = []
+    monkeypatch.setattr(
+        seedcode_checkin.cfnresponse,
+        "send",
+        lambda event, context, status, data, **kwargs: responses.append(
+            (event, status, data, kwargs)
+        ),
+    )
+    return responses
+
+
+def build_state_change(build_id, build_status):
+    return {
+        "source": "aws.codebuild",
+        "detail": {"build-id": build_id, "build-status": build_status},
+    }
+
+
+def test_create_starts_the_build_without_responding(codebuild, responses):
+    seedcode_checkin.lambda_handler(REQUEST, None)
+
+    (build,) = codebuild.builds.values()
+    assert build["projectName"] == "sagemaker-project-p-1-git-seedcodecheckin"
+    assert (
+        build["secondarySources"][0]["location"] == "seedcode-bucket/seedcode/abc.zip"
+    )
+    assert responses == []
+
+
+def test_response_url_is_kept_out_of_the_build(codebuild, ssm, responses):
+    seedcode_checkin.lambda_handler(REQUEST, None)
+
+    (build,) = codebuild.builds.values()
+    values = [v["value"] for v in build["environment"]["environmentVariables"]]
+    assert REQUEST["ResponseURL"] not in values
+    assert any(REQUEST["ResponseURL"] in value for value in ssm.parameters.values())
+
+
+def test_completed_build_responds_to_the_request(codebuild, ssm, responses):
+    seedcode_checkin.lambda_handler(REQUEST, None)
+    (build_id,) = codebuild.builds
+
+    seedcode_checkin.lambda_handler(build_state_change(build_id, "SUCCEEDED"), None)
+
+    ((request, status, data, kwargs),) = responses
+    assert status == seedcode_checkin.cfnresponse.SUCCESS
+    assert data == {
+        "url": "https://codestar-connections.eu-west-1.amazonaws.com/git-http/222222222222/eu-west-1/abc/owner/repository.git"
+    }
+    assert kwargs["physicalResourceId"] == build_id
+    for key in seedcode_checkin.REQUEST_FIELDS:
+        assert request[key] == REQUEST[key]
+    # the pending request is removed once responded
+    assert ssm.parameters == {}
+
+
+def test_failed_build_fails_the_request(codebuild, responses):
+    seedcode_checkin.lambda_handler(REQUEST, None)
+    (build_id,) = codebuild.builds
+
+    seedcode_checkin.lambda_handler(build_state_change(build_id, "FAILED"), None)
+
+    ((_, status, _, kwargs),) = responses
+    assert status == seedcode_checkin.cfnresponse.FAILED
+    assert "FAILED" in kwargs["reason"]
+
+
+def test_builds_started_outside_of_a_request_are_ignored(codebuild, responses):
+    build_id = codebuild.start_build(projectName="other-git-seedcodecheckin")["build"][
+        "id"
+    ]
+
+    seedcode_checkin.lambda_handler(build_state_change(build_id, "SUCCEEDED"), None)
+
+    assert responses == []
+
+
+def test_delete_keeps_the_physical_resource_id(codebuild, responses):
+    request = {**REQUEST, "RequestType": "Delete", "PhysicalResourceId": "build-1"}
+
+    seedcode_checkin.lambda_handler(request, None)
+
+    ((_, status, _, kwargs),) = responses
+    assert status == seedcode_checkin.cfnresponse.SUCCESS
+    assert kwargs["physicalResourceId"] == "build-1"
+    assert codebuild.builds == {}
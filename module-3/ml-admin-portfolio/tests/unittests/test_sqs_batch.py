@@ -0,0 +1,74 @@
+import json
+
+import index
+from fakes import FakeS3, FakeSageMaker
+
+SOURCE_ACCOUNT_ID = "222222222222"
+
+
+def approval_event(event_id, model_package_arn):
+    return {
+        "id": event_id,
+        "source": "aws.sagemaker",
+        "detail-type": "SageMaker Model Package State Change",
+        "detail": {"ModelPackageArn": model_package_arn},
+    }
+
+
+def sqs_record(message_id, body):
+    return {
+        "messageId": message_id,
+        "receiptHandle": f"handle-{message_id}",
+        "body": json.dumps(body),
+        "attributes": {"ApproximateReceiveCount": "1"},
+        "messageAttributes": {},
+        "md5OfBody": "",
+        "eventSource": "aws:sqs",
+        "eventSourceARN": "arn:aws:sqs:us-east-1:111111111111:model-sync",
+        "awsRegion": "us-east-1",
+    }
+
+
+def setup_index(monkeypatch, s3: FakeS3, sagemaker: FakeSageMaker):
+    # the source and central registries are served by the same stand-in
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "sagemaker_client", sagemaker)
+    monkeypatch.setattr(index, "destination_bucket_name", "central-bucket")
+    monkeypatch.setattr(index, "sync_index_table_name", None)
+    monkeypatch.setattr(index, "replica_buckets", {})
+
+
+def add_source_package(sagemaker, s3, key):
+    s3.add_object("dev-bucket", key, 1024)
+    return sagemaker.add_model_package(
+        "models",
+        account_id=SOURCE_ACCOUNT_ID,
+        InferenceSpecification={
+            "Containers": [
+                {"Image": "xgboost:1", "ModelDataUrl": f"s3://dev-bucket/{key}"}
+            ]
+        },
+    )
+
+
+def test_only_the_failed_records_of_a_batch_are_reported(s3, monkeypatch):
+    sagemaker = FakeSageMaker()
+    setup_index(monkeypatch, s3, sagemaker)
+    synced_arn = add_source_package(sagemaker, s3, "model/1/model.tar.gz")
+    missing_arn = (
+        f"arn:aws:sagemaker:us-east-1:{SOURCE_ACCOUNT_ID}:model-package/models/99"
+    )
+    event = {
+        "Records": [
+            sqs_record("1", approval_event("event-1", synced_arn)),
+            sqs_record("2", approval_event("event-2", missing_arn)),
+            sqs_record("3", {"detail": {}}),
+        ]
+    }
+
+    response = index.handle_event(event, None)
+
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "2"}, {"itemIdentifier": "3"}]
+    }
+    assert sagemaker.calls["CreateModelPackage"] == 1
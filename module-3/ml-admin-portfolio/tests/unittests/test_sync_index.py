@@ -0,0 +1,144 @@
+import index
+import pytest
+import sync_index
+from fakes import FakeDynamoDB, FakeSageMaker, client_error
+
+TABLE_NAME = "sync-index"
+TARGET_GROUP = "models-222222222222"
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    dynamodb = FakeDynamoDB()
+    monkeypatch.setattr(index, "dynamodb_client", dynamodb)
+    monkeypatch.setattr(index, "sync_index_table_name", TABLE_NAME)
+    return dynamodb
+
+
+@pytest.fixture
+def sagemaker(monkeypatch):
+    sagemaker = FakeSageMaker()
+    monkeypatch.setattr(index, "sagemaker_client", sagemaker)
+    return sagemaker
+
+
+def add_synced_package(sagemaker, version):
+    source_arn = (
+        f"arn:aws:sagemaker:us-east-1:222222222222:model-package/models/{version}"
+    )
+    sagemaker.add_model_package(
+        TARGET_GROUP, CustomerMetadataProperties={"OriginalARN": source_arn}
+    )
+    return source_arn
+
+
+def test_group_is_indexed_from_the_registry_on_first_lookup(dynamodb, sagemaker):
+    synced = [add_synced_package(sagemaker, version) for version in (1, 2, 3)]
+
+    assert index.check_pkg_already_exists(synced[0], TARGET_GROUP)
+    assert sagemaker.calls["DescribeModelPackage"] == 3
+    # the following lookups are answered by the index alone
+    assert index.check_pkg_already_exists(synced[2], TARGET_GROUP)
+    assert not index.check_pkg_already_exists(
+        "arn:aws:sagemaker:us-east-1:222222222222:model-package/models/4",
+        TARGET_GROUP,
+    )
+    assert sagemaker.calls["DescribeModelPackage"] == 3
+    assert sagemaker.calls["ListModelPackages"] == 1
+
+
+def test_marker_of_a_group_is_read_from_the_table(dynamodb, sagemaker):
+    source_arn = add_synced_package(sagemaker, 1)
+    sync_index.rebuild(dynamodb, sagemaker, TABLE_NAME, TARGET_GROUP)
+
+    assert sync_index.is_group_indexed(dynamodb, TABLE_NAME, TARGET_GROUP)
+    assert index.check_pkg_already_exists(source_arn, TARGET_GROUP)
+    assert sagemaker.calls["ListModelPackages"] == 1
+
+
+def test_deleting_the_marker_of_a_group_forces_a_rebuild(dynamodb, sagemaker):
+    add_synced_package(sagemaker, 1)
+    sync_index.rebuild(dynamodb, sagemaker, TABLE_NAME, TARGET_GROUP)
+    # registered outside of the sync function, so missing from the index
+    source_arn = add_synced_package(sagemaker, 2)
+
+    dynamodb.tables[TABLE_NAME].pop(f"{sync_index.GROUP_MARKER_PREFIX}{TARGET_GROUP}")
+
+    assert index.check_pkg_already_exists(source_arn, TARGET_GROUP)
+    assert sagemaker.calls["ListModelPackages"] == 2
+
+
+def test_synced_packages_are_recorded(dynamodb):
+    source_arn = "arn:aws:sagemaker:us-east-1:222222222222:model-package/models/1"
+    target_arn = (
+        f"arn:aws:sagemaker:us-east-1:111111111111:model-package/{TARGET_GROUP}/1"
+    )
+
+    assert sync_index.lookup(dynamodb, TABLE_NAME, source_arn) is None
+    sync_index.record(dynamodb, TABLE_NAME, source_arn, target_arn, TARGET_GROUP)
+
+    assert sync_index.lookup(dynamodb, TABLE_NAME, source_arn) == target_arn
+
+
+@pytest.fixture
+def source_package(s3, sagemaker, monkeypatch):
+    monkeypatch.setattr(index, "s3_client", s3)
+    monkeypatch.setattr(index, "destination_bucket_name", "central-bucket")
+    monkeypatch.setattr(index, "replica_buckets", {})
+    s3.add_object("dev-bucket", "model/model.tar.gz", 1024)
+    return sagemaker.add_model_package(
+        "models",
+        account_id="222222222222",
+        InferenceSpecification={
+            "Containers": [
+                {
+                    "Image": "xgboost:1",
+                    "ModelDataUrl": "s3://dev-bucket/model/model.tar.gz",
+                }
+            ]
+        },
+    )
+
+
+def test_index_errors_do_not_register_the_package_again(
+    dynamodb, sagemaker, source_package, monkeypatch
+):
+    index.sync_model_package(source_package)
+
+    def throttled_get_item(**kwargs):
+        raise client_error("ProvisionedThroughputExceededException", "GetItem")
+
+    monkeypatch.setattr(dynamodb, "get_item", throttled_get_item)
+
+    with pytest.raises(index.ClientError):
+        index.sync_model_package(source_package)
+    assert sagemaker.calls["CreateModelPackage"] == 1
+    assert sagemaker.calls["CreateModelPackageGroup"] == 1
+
+
+def test_sync_interrupted_after_the_registration_is_not_registered_again(
+    dynamodb, sagemaker, source_package, monkeypatch
+):
+    # the group is indexed, so a retry is answered by the index alone
+    sagemaker.create_model_package_group(ModelPackageGroupName=TARGET_GROUP)
+    sync_index.rebuild(dynamodb, sagemaker, TABLE_NAME, TARGET_GROUP)
+
+    def interrupted_record(*args):
+        raise TimeoutError("Task timed out")
+
+    with monkeypatch.context() as m:
+        m.setattr(sync_index, "record", interrupted_record)
+        with pytest.raises(TimeoutError):
+            index.sync_model_package(source_package)
+
+    # a retry while the claim may still be held by a running sync waits
+    with pytest.raises(sync_index.SyncInProgressError):
+        index.sync_model_package(source_package)
+
+    claim = dynamodb.tables[TABLE_NAME][source_package]
+    claim["ClaimedAt"] = {
+        "N": str(int(claim["ClaimedAt"]["N"]) - sync_index.CLAIM_TIMEOUT_SECONDS)
+    }
+    assert "already exists" in index.sync_model_package(source_package)
+    assert sagemaker.calls["CreateModelPackage"] == 1
+    assert sync_index.lookup(dynamodb, TABLE_NAME, source_package) is not None
@@ -48,6 +48,7 @@ class DeployPipelineConstruct(Construct):
         deployment_region: str,
         create_model_event_rule: bool,
         deployment: s3deploy.BucketDeployment ,
+        multi_model: bool = False,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -107,6 +108,44 @@ class DeployPipelineConstruct(Construct):
             ),
         )
 
+        if multi_model:
+            # model_package_group_name lists the groups packed behind the multi-model
+            # endpoint, whose artifacts are staged in the pipeline bucket at synth time
+            model_package_group_names = Fn.split(",", model_package_group_name)
+            cdk_synth_build_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=["sagemaker:DescribeModelPackage"],
+                    resources=[
+                        f"arn:{Aws.PARTITION}:sagemaker:{Aws.REGION}:{Aws.ACCOUNT_ID}:model-package/*",
+                    ],
+                )
+            )
+            cdk_synth_build_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=["s3:GetObject"],
+                    resources=[f"arn:{Aws.PARTITION}:s3:::*/*"],
+                    conditions={"StringEquals": {"s3:ResourceAccount": Aws.ACCOUNT_ID}},
+                )
+            )
+            pipeline_artifact_bucket.grant_read_write(
+                cdk_synth_build_role, "multi-model/*"
+            )
+            model_package_group_variables = {
+                "MODEL_PACKAGE_GROUP_NAMES": codebuild.BuildEnvironmentVariable(
+                    value=model_package_group_name
+                ),
+                "MODEL_STAGING_BUCKET": codebuild.BuildEnvironmentVariable(
+                    value=pipeline_artifact_bucket.bucket_name
+                ),
+            }
+        else:
+            model_package_group_names = [model_package_group_name]
+            model_package_group_variables = {
+                "MODEL_PACKAGE_GROUP_NAME": codebuild.BuildEnvironmentVariable(
+                    value=model_package_group_name
+                ),
+            }
+
         cdk_synth_build = codebuild.PipelineProject(
             self,
             "CDKSynthBuild",
@@ -116,9 +155,7 @@ class DeployPipelineConstruct(Construct):
             environment=codebuild.BuildEnvironment(
                 build_image=codebuild.LinuxArmBuildImage.AMAZON_LINUX_2_STANDARD_3_0,
                 environment_variables={
-                    "MODEL_PACKAGE_GROUP_NAME": codebuild.BuildEnvironmentVariable(
-                        value=model_package_group_name
-                    ),
+                    **model_package_group_variables,
                     "PROJECT_ID": codebuild.BuildEnvironmentVariable(value=project_id),
                     "PROJECT_NAME": codebuild.BuildEnvironmentVariable(
                         value=project_name
@@ -154,157 +191,14 @@ class DeployPipelineConstruct(Construct):
             timeout=aws_cdk.Duration.minutes(14)
         )
 
-        seedcode_checkin_trigger_lambda = aws_lambda.Function(
-            self,
-            'GitSeedCodeCheckinProjectTriggerLambda',
-            description='To trigger the codebuild project for the seedcode checkin',
-            runtime=aws_lambda.Runtime.PYTHON_3_12,
-            function_name=f"sagemaker-{project_id}-git-seedcodecheckin",
-            timeout=aws_cdk.Duration.seconds(900),
-            handler='index.lambda_handler',
-            role=iam.Role.from_role_arn(self, 'LambdaRole', f"arn:{Aws.PARTITION}:iam::{Aws.ACCOUNT_ID}:role/MLOpsServiceCatalogProductsLambdaRole"),
-            code=aws_lambda.Code.from_inline("""
-import boto3
-import cfnresponse
-import os
-import time
-
-
-# This function should be triggered by the custom resource in the cfn template, Called along with the
-# seedcode information (what code needs to be populated), the git repository information (where it
-# needs to be populated) and the git codestar connection information. This would inturn trigger
-# the codebuild which does the population of the seedcode
-def lambda_handler(event, context):
-    responseData = {}
-    if event["RequestType"] == "Create":
-        client = boto3.client("codebuild")
-        response = client.start_build(
-            projectName=os.environ["CodeBuildProjectName"],
-            environmentVariablesOverride=get_build_environment_variables_override(
-                event
-            ),
-            secondarySourcesOverride=get_secondary_sources_override(event),
-        )
-        poll_timeout = (
-            840  # This Value is assigned based on the codebuild project timeout value
-        )
-        max_poll_time = time.time() + poll_timeout
-        build_status = poll_and_get_build_status(
-            client, response["build"]["id"], max_poll_time
-        )
-        if build_status != "SUCCEEDED":
-            if time.time() > max_poll_time and build_status == "IN_PROGRESS":
-                failure_reason = (
-                    "Codebuild to checkin seedcode did not complete within "
-                    + poll_timeout
-                    + " seconds"
-                )
-            else:
-                failure_reason = (
-                    "Codebuild to checkin seedcode has status " + build_status
-                )
-                cfnresponse.send(
-                    event,
-                    context,
-                    cfnresponse.FAILED,
-                    responseData,
-                    reason=failure_reason,
-                )
-        else:
-            responseData["url"] = get_repository_url(event)
-            cfnresponse.send(event, context, cfnresponse.SUCCESS, responseData)
-    else:
-        cfnresponse.send(event, context, cfnresponse.SUCCESS, responseData)
-
-
-def get_build_environment_variables_override(event):
-    return [
-        {
-            "name": "GIT_REPOSITORY_BRANCH",
-            "value": event["ResourceProperties"]["GIT_REPOSITORY_BRANCH"],
-            "type": "PLAINTEXT",
-        },
-        {
-            "name": "GIT_REPOSITORY_URL",
-            "value": get_repository_url(event),
-            "type": "PLAINTEXT",
-        },
-    ]
-
-
-def get_secondary_sources_override(event):
-    return [
-        {
-            "location": "{}/{}".format(
-                event["ResourceProperties"]["SEEDCODE_BUCKET_NAME"],
-                event["ResourceProperties"]["SEEDCODE_BUCKET_KEY"],
-            ),
-            "type": "S3",
-            "sourceIdentifier": "source",
-        }
-    ]
-
-
-def get_repository_url(event):
-    parsed_connection_arn = parse_arn(
-        event["ResourceProperties"]["GIT_REPOSITORY_CONNECTION_ARN"]
-    )
-    url_prefix = "codeconnections"
-    if "codestar-connections" in parsed_connection_arn["service"]:
-        url_prefix = "codestar-connections"
-    return "https://{}.{}.amazonaws.com/git-http/{}/{}/{}/{}.git".format(
-        url_prefix,
-        parsed_connection_arn["region"],
-        parsed_connection_arn["account"],
-        parsed_connection_arn["region"],
-        parsed_connection_arn["resource"],
-        event["ResourceProperties"]["GIT_REPOSITORY_FULL_NAME"],
-    )
-
-
-def parse_arn(arn):
-    # http://docs.aws.amazon.com/general/latest/gr/aws-arns-and-namespaces.html
-    elements = arn.split(":", 5)
-    result = {
-        "arn": elements[0],
-        "partition": elements[1],
-        "service": elements[2],
-        "region": elements[3],
-        "account": elements[4],
-        "resource": elements[5],
-        "resource_type": None,
-    }
-    if "/" in result["resource"]:
-        result["resource_type"], result["resource"] = result["resource"].split("/", 1)
-    elif ":" in result["resource"]:
-        result["resource_type"], result["resource"] = result["resource"].split(":", 1)
-    return result
-
-
-def poll_and_get_build_status(client, build_id, max_poll_time):
-    # usually it takes around 70 to 85 seconds for initializing the codebuild                    and
-    # for the seedcode to get checked in
-    initial_poll_interval = 60
-    poll_interval = 15
-    time.sleep(initial_poll_interval)
-    build_status = "IN_PROGRESS"
-    while build_status == "IN_PROGRESS" and time.time() < max_poll_time:
-        build_status = client.batch_get_builds(ids=[build_id])["builds"][0][
-            "buildStatus"
-        ]
-        time.sleep(poll_interval)
-    return build_status"""),
-            environment={
-                'CodeBuildProjectName': seedcode_checkin_project.project_name
-            }
-        )
-
         sagemaker_seed_code_checkin_project_trigger_lambda_invoker = aws_cdk.CustomResource(
             self,
             'SageMakerSeedCodeCheckinProjectTriggerLambdaInvoker',
             resource_type="Custom::LambdaInvoker",
-            service_token=seedcode_checkin_trigger_lambda.function_arn,
+            # provided by the seedcode checkin function shared by the projects of the account
+            service_token=f"arn:{Aws.PARTITION}:lambda:{Aws.REGION}:{Aws.ACCOUNT_ID}:function:mlops-seedcode-checkin",
             properties={
+                'CODEBUILD_PROJECT_NAME': seedcode_checkin_project.project_name,
                 'SEEDCODE_BUCKET_NAME': deployment.deployed_bucket.bucket_name,
                 'SEEDCODE_BUCKET_KEY': f"seedcode/{Fn.select(0, deployment.object_keys)}",
                 'GIT_REPOSITORY_FULL_NAME': f"{owner}/{repository}",
@@ -497,9 +391,10 @@ def poll_and_get_build_status(client, build_id, max_poll_time):
             ],
         )
 
-        if create_model_event_rule:
-            # CloudWatch rule to trigger model pipeline when a status change event
-            # happens to the model package group
+        if create_model_event_rule and multi_model:
+            # CloudWatch rule to trigger the deploy CodePipeline when a status change
+            # event happens to one of the model package groups, the pointer of the
+            # project only references a single group
             _ = events.Rule(
                 self,
                 "ModelEventRule",
@@ -507,12 +402,48 @@ def poll_and_get_build_status(client, build_id, max_poll_time):
                     source=["aws.sagemaker"],
                     detail_type=["SageMaker Model Package State Change"],
                     detail={
-                        "ModelPackageGroupName": [model_package_group_name],
+                        "ModelPackageGroupName": model_package_group_names,
                         "ModelApprovalStatus": ["Approved", "Rejected"],
                     },
                 ),
                 targets=[targets.CodePipeline(deploy_code_pipeline)],
             )
+        elif create_model_event_rule:
+            # CloudWatch rule to update the latest approved model package of the
+            # project when a status change event happens to the model package group,
+            # the function shared by the projects of the account then triggers the
+            # model pipeline
+            approved_model_pointer_function = aws_lambda.Function.from_function_attributes(
+                self,
+                "ApprovedModelPointerFunction",
+                function_arn=f"arn:{Aws.PARTITION}:lambda:{Aws.REGION}:{Aws.ACCOUNT_ID}:function:mlops-approved-model-pointer",
+                # the function allows the rules of the account to invoke it
+                skip_permissions=True,
+            )
+            _ = events.Rule(
+                self,
+                "ModelEventRule",
+                event_pattern=events.EventPattern(
+                    source=["aws.sagemaker"],
+                    detail_type=["SageMaker Model Package State Change"],
+                    detail={
+                        "ModelPackageGroupName": model_package_group_names,
+                        "ModelApprovalStatus": ["Approved", "Rejected"],
+                    },
+                ),
+                targets=[
+                    targets.LambdaFunction(
+                        approved_model_pointer_function,
+                        event=events.RuleTargetInput.from_object(
+                            {
+                                "ProjectName": project_name,
+                                "PipelineName": deploy_code_pipeline.pipeline_name,
+                                "detail": events.EventField.from_path("$.detail"),
+                            }
+                        ),
+                    )
+                ],
+            )
         else:
             # CloudWatch rule to trigger the deploy CodePipeline when the build
             # CodePipeline has succeeded
@@ -0,0 +1,194 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+
+import aws_cdk as cdk
+import aws_cdk.aws_servicecatalog as sc
+from aws_cdk import Aws, CfnParameter, Tags
+from aws_cdk import aws_iam as iam
+from aws_cdk import aws_s3 as s3
+from aws_cdk import aws_s3_deployment as s3deploy
+from aws_cdk import aws_ssm as ssm
+from constructs import Construct
+from service_catalog.sm_projects_products.deploy.constructs.deploy_pipeline_construct import (
+    DeployPipelineConstruct,
+)
+from service_catalog.sm_projects_products.deploy.constructs.ssm_construct import SSMConstruct
+
+BASE_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# the seed code of the real-time product deploys a multi-model endpoint when given a list of groups
+SEED_CODE_DIR = os.path.join(BASE_DIR, "..", "real_time", "seed_code")
+
+
+class MLOpsStack(sc.ProductStack):
+    DESCRIPTION: str = (
+        "This template deploys a SageMaker multi-model endpoint cross-account, serving "
+        "the latest approved model package of many groups of a pre-existing SageModel "
+        "Registry with a single container. The artifacts of the model packages are "
+        "staged under a shared prefix of the pipeline bucket by the deploy pipeline, "
+        "which creates preprod and production endpoints as infrastructure as code. The "
+        "model packages must use the same inference image, such as the built-in XGBoost "
+        "image. The PREPROD/PROD accounts need to be cdk bootstrapped in advance to have "
+        "the right CloudFormation execution cross account roles."
+    )
+
+    TEMPLATE_NAME: str = (
+        "Deploy multi-model endpoint from ModelRegistry - Cross account, test and prod"
+    )
+
+    @classmethod
+    def get_description(cls) -> str:
+        return cls.DESCRIPTION
+
+    @classmethod
+    def get_template_name(cls) -> str:
+        return cls.TEMPLATE_NAME
+
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        asset_bucket: s3.Bucket | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(scope, construct_id, asset_bucket=asset_bucket, **kwargs)
+
+        # Define required parameters
+        project_name = cdk.CfnParameter(
+            self,
+            "SageMakerProjectName",
+            type="String",
+            description="The name of the Deployment SageMaker project.",
+            allowed_pattern="^[a-zA-Z0-9](-*[a-zA-Z0-9]){0,31}",
+        ).value_as_string
+
+        project_id = cdk.CfnParameter(
+            self,
+            "SageMakerProjectId",
+            type="String",
+            min_length=1,
+            max_length=20,
+            allowed_pattern="^[a-zA-Z0-9](-*[a-zA-Z0-9])*",
+            description="Service generated Id of the project.",
+        ).value_as_string
+
+        preprod_account = cdk.CfnParameter(
+            self,
+            "PreProdAccount",
+            type="String",
+            description="Id of preprod account.",
+            allowed_pattern="^\\d{12}$",
+        ).value_as_string
+
+        prod_account = cdk.CfnParameter(
+            self,
+            "ProdAccount",
+            type="String",
+            allowed_pattern="^\\d{12}$",
+            description="Id of prod account.",
+        ).value_as_string
+
+        owner = cdk.CfnParameter(
+            self,
+            "RepoOwner",
+            type="String",
+            min_length=1,
+            max_length=50,
+            description="The owner or organization of your repository",
+        ).value_as_string
+
+        repository = cdk.CfnParameter(
+            self,
+            "Repo",
+            type="String",
+            min_length=1,
+            max_length=100,
+            description="The name of your repository",
+        ).value_as_string
+
+        connection_arn = ssm.StringParameter.from_string_parameter_name(
+            self, id="CodeConnectionArn", string_parameter_name="/codeconnection/arn"
+        ).string_value
+
+        model_package_group_names = CfnParameter(
+            self,
+            "SageMakerModelPackageGroupNames",
+            type="String",
+            description="Comma-separated names of the SageMaker Model Package Groups served by the multi-model endpoint",
+            min_length=1,
+            max_length=4096,
+            allowed_pattern="^[a-zA-Z0-9](-*[a-zA-Z0-9])*(,[a-zA-Z0-9](-*[a-zA-Z0-9])*)*$",
+        ).value_as_string
+
+        Tags.of(self).add("sagemaker:project-id", project_id)
+        Tags.of(self).add("sagemaker:project-name", project_name)
+
+        SSMConstruct(
+            self,
+            "MLOpsSSM",
+            project_name=project_name,
+            preprod_account=preprod_account,
+            prod_account=prod_account,
+            deployment_region=cdk.Aws.REGION,  # Modify when x-region is enabled
+        )
+
+        # Pipeline artifact bucket with X-account resource policies, the staged model
+        # artifacts are read from it by the endpoints of the preprod and prod accounts
+        pipeline_artifact_bucket = s3.Bucket(
+            self,
+            "PipelineBucket",
+            bucket_name=f"pipeline-{project_id}-{Aws.ACCOUNT_ID}",
+            versioned=False,
+            encryption=s3.BucketEncryption.KMS,
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            enforce_ssl=True,
+        )
+        pipeline_artifact_bucket.grant_read(
+            identity=iam.AccountPrincipal(preprod_account)
+        )
+        pipeline_artifact_bucket.grant_read(identity=iam.AccountPrincipal(prod_account))
+
+        deployment = s3deploy.BucketDeployment(
+            self,
+            "DeploySeedcode",
+            sources=[s3deploy.Source.asset(SEED_CODE_DIR)],
+            destination_bucket=pipeline_artifact_bucket,
+            destination_key_prefix="seedcode",
+            extract=False,
+        )
+
+        # the endpoints are created from the staged artifacts rather than from the model
+        # packages, so the groups need no cross account policy
+        DeployPipelineConstruct(
+            self,
+            "deploy",
+            project_name=project_name,
+            project_id=project_id,
+            pipeline_artifact_bucket=pipeline_artifact_bucket,
+            model_package_group_name=model_package_group_names,
+            owner=owner,
+            repository=repository,
+            connection_arn=connection_arn,
+            preprod_account=preprod_account,
+            prod_account=prod_account,
+            deployment_region=cdk.Aws.REGION,
+            create_model_event_rule=True,
+            deployment=deployment,
+            multi_model=True,
+        )
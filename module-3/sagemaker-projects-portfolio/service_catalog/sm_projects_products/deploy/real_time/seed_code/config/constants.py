@@ -15,22 +15,30 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-import boto3
 import os
 
-ssm_client = boto3.client("ssm")
+from config.parameters import load_parameters
 
 PROJECT_NAME = os.getenv("PROJECT_NAME", "")
 PROJECT_ID = os.getenv("PROJECT_ID", "")
 MODEL_PACKAGE_GROUP_NAME = os.getenv("MODEL_PACKAGE_GROUP_NAME", "")
+# model package groups packed behind one multi-model endpoint, comma-separated, instead of MODEL_PACKAGE_GROUP_NAME
+MODEL_PACKAGE_GROUP_NAMES = [name for name in os.getenv("MODEL_PACKAGE_GROUP_NAMES", "").split(",") if name]
+# bucket the artifacts of the multi-model endpoint are staged in, readable from the deployment accounts
+MODEL_STAGING_BUCKET = os.getenv("MODEL_STAGING_BUCKET", "")
 MODEL_BUCKET_ARN = os.getenv("MODEL_BUCKET_ARN", "arn:aws:s3:::*mlops*")
 ECR_REPO_ARN = os.getenv("ECR_REPO_ARN", None)
+# time the synth waits for the deferred replication of the artifacts of the approved model package
+ARTIFACT_WAIT_SECONDS = int(os.getenv("ARTIFACT_WAIT_SECONDS", "300"))
 
-DEV_ACCOUNT = ssm_client.get_parameter(Name=f"/mlops/{PROJECT_NAME}/dev/account_id")["Parameter"]["Value"]
-DEFAULT_DEPLOYMENT_REGION = ssm_client.get_parameter(Name=f"/mlops/{PROJECT_NAME}/dev/region")["Parameter"]["Value"]
+# the whole /mlops/{PROJECT_NAME}/ hierarchy, read in one pass and cached between synths
+PARAMETERS = load_parameters(PROJECT_NAME)
 
-PREPROD_ACCOUNT = ssm_client.get_parameter(Name=f"/mlops/{PROJECT_NAME}/preprod/account_id")["Parameter"]["Value"]
-PREPROD_REGION = ssm_client.get_parameter(Name=f"/mlops/{PROJECT_NAME}/preprod/region")["Parameter"]["Value"]
+DEV_ACCOUNT = PARAMETERS["dev/account_id"]
+DEFAULT_DEPLOYMENT_REGION = PARAMETERS["dev/region"]
 
-PROD_ACCOUNT = ssm_client.get_parameter(Name=f"/mlops/{PROJECT_NAME}/prod/account_id")["Parameter"]["Value"]
-PROD_REGION = ssm_client.get_parameter(Name=f"/mlops/{PROJECT_NAME}/prod/region")["Parameter"]["Value"]
+PREPROD_ACCOUNT = PARAMETERS["preprod/account_id"]
+PREPROD_REGION = PARAMETERS["preprod/region"]
+
+PROD_ACCOUNT = PARAMETERS["prod/account_id"]
+PROD_REGION = PARAMETERS["prod/region"]
@@ -0,0 +1,112 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import boto3
+
+# parameters of the project, as a JSON object keyed on the names relative to the project path,
+# such as {"dev/account_id": "111111111111"}, to synthesize without access to SSM
+PARAMETERS_OVERRIDE_VARIABLE = "MLOPS_PARAMETERS"
+# how long the parameters read from SSM are reused by the following synths, 0 to disable the cache
+DEFAULT_CACHE_TTL = int(os.getenv("MLOPS_PARAMETERS_CACHE_TTL", "300"))
+DEFAULT_CACHE_DIR = Path(os.getenv("MLOPS_PARAMETERS_CACHE_DIR", Path(tempfile.gettempdir(), "mlops-parameters")))
+
+
+def parameters_path(project_name: str) -> str:
+    return f"/mlops/{project_name}/"
+
+
+def fetch_parameters(project_name: str, ssm_client=None) -> Dict[str, str]:
+    """Reads the parameters of a project from SSM.
+    The whole hierarchy of the project is read with paginated GetParametersByPath calls,
+    instead of a GetParameter call per parameter.
+    Args:
+        project_name: The name of the SageMaker project.
+        ssm_client: The boto3 SSM client, created if not given.
+    Returns:
+        The value of each parameter, keyed on its name relative to the project path.
+    """
+    ssm_client = ssm_client or boto3.client("ssm")
+    path = parameters_path(project_name)
+    paginator = ssm_client.get_paginator("get_parameters_by_path")
+    return {
+        parameter["Name"].removeprefix(path): parameter["Value"]
+        for page in paginator.paginate(Path=path, Recursive=True)
+        for parameter in page["Parameters"]
+    }
+
+
+def cache_file_name(project_name: str, ssm_client, sts_client=None) -> str:
+    """Name of the cache file of a project, in the account and region of the SSM client,
+    so the cache of another account is never read after switching profiles.
+    """
+    region = ssm_client.meta.region_name
+    sts_client = sts_client or boto3.client("sts", region_name=region)
+    account_id = sts_client.get_caller_identity()["Account"]
+    return f"{account_id}-{region}-{project_name or 'default'}.json"
+
+
+def load_parameters(
+    project_name: str,
+    ssm_client=None,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    ttl: int = DEFAULT_CACHE_TTL,
+    sts_client=None,
+) -> Dict[str, str]:
+    """Loads the parameters of a project, from the environment, the cache on disk or SSM.
+    Args:
+        project_name: The name of the SageMaker project.
+        ssm_client: The boto3 SSM client, created if the parameters are not in the environment.
+        cache_dir: The directory of the cache of the parameters read from SSM.
+        ttl: The time in seconds the cached parameters are used for.
+        sts_client: The boto3 STS client, created to find the account of the cached parameters.
+    Returns:
+        The value of each parameter, keyed on its name relative to the project path.
+    """
+    if override := os.getenv(PARAMETERS_OVERRIDE_VARIABLE):
+        return json.loads(override)
+
+    ssm_client = ssm_client or boto3.client("ssm")
+    if ttl <= 0:
+        return fetch_parameters(project_name, ssm_client)
+
+    cache_file = cache_dir.joinpath(cache_file_name(project_name, ssm_client, sts_client))
+    if parameters := read_cache(cache_file, ttl):
+        return parameters
+
+    parameters = fetch_parameters(project_name, ssm_client)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # written then renamed, so concurrent synths never read a partial file
+    temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    temp_file.write_text(json.dumps(parameters))
+    temp_file.replace(cache_file)
+    return parameters
+
+
+def read_cache(cache_file: Path, ttl: int) -> Optional[Dict[str, str]]:
+    try:
+        if time.time() - cache_file.stat().st_mtime < ttl:
+            return json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
@@ -15,27 +15,55 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-from dataclasses import dataclass
+import json
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import List, Optional
 
 from aws_cdk import Aws, CfnParameter, Stack, Tags
+from aws_cdk import aws_applicationautoscaling as appscaling
+from aws_cdk import aws_cloudwatch as cloudwatch
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_kms as kms
+from aws_cdk import aws_s3 as s3
 from aws_cdk import aws_sagemaker as sagemaker
+from aws_cdk import aws_ssm as ssm
 from config.config_mux import StageYamlDataClassConfig
 from config.constants import (
     DEV_ACCOUNT,
     ECR_REPO_ARN,
     MODEL_BUCKET_ARN,
     MODEL_PACKAGE_GROUP_NAME,
+    MODEL_PACKAGE_GROUP_NAMES,
+    MODEL_STAGING_BUCKET,
     PROJECT_ID,
     PROJECT_NAME,
 )
 from constructs import Construct
 from yamldataclassconfig import create_file_path_field
 
-from .get_approved_package import get_approved_package
+from .get_approved_package import get_approved_package, get_regional_package
+from .multi_model import MULTI_MODEL_PREFIX, get_multi_model_artifacts
+from .multi_model_router import target_models_parameter
+
+INFERENCE_MODES = ("instance", "serverless", "async")
+
+# metrics the endpoint variant can be scaled on, see EndpointAutoscalingConfig.target_metric,
+# with the dimensions of each metric
+TARGET_METRICS = {
+    "cpu": (
+        "CPUUtilization",
+        "/aws/sagemaker/Endpoints",
+        ("EndpointName", "VariantName"),
+    ),
+    "latency": ("ModelLatency", "AWS/SageMaker", ("EndpointName", "VariantName")),
+    "backlog": (
+        "ApproximateBacklogSizePerInstance",
+        "AWS/SageMaker",
+        ("EndpointName",),
+    ),
+}
 
 
 @dataclass
@@ -45,26 +73,60 @@ class EndpointConfigProductionVariant(StageYamlDataClassConfig):
     a dataclass to handle mapping yml file configs to python class for endpoint configs
     """
 
-    initial_instance_count: float = 1
+    initial_instance_count: int = 1
     initial_variant_weight: float = 1
     instance_type: str = "ml.m5.2xlarge"
     variant_name: str = "AllTraffic"
+    # instance: real-time endpoint backed by instances
+    # serverless: real-time endpoint billed per request, see the serverless_* fields
+    # async: asynchronous endpoint backed by instances, see the async_* fields
+    inference_mode: str = "instance"
+    serverless_memory_size: int = 2048
+    serverless_max_concurrency: int = 5
+    serverless_provisioned_concurrency: Optional[int] = None
+    # S3 URI of the results of the asynchronous requests, a bucket is created if not set
+    async_output_path: Optional[str] = None
+    async_max_concurrent_invocations_per_instance: Optional[int] = None
+    # scale in to zero instances when there are no requests, requires the autoscaling of the stage
+    async_scale_to_zero: bool = False
 
     FILE_PATH: Path = create_file_path_field(
         "endpoint-config.yml", path_is_absolute=True
     )
 
+    def validate(self):
+        if self.inference_mode not in INFERENCE_MODES:
+            raise ValueError(
+                f"Unknown inference_mode {self.inference_mode}, use one of {', '.join(INFERENCE_MODES)}"
+            )
+        if self.async_scale_to_zero and self.inference_mode != "async":
+            raise ValueError("async_scale_to_zero requires the async inference_mode")
+
     def get_endpoint_config_production_variant(self, model_name):
         """
-        Function to handle creation of cdk glue job. It use the class fields for the job parameters.
+        Function to handle creation of the production variant of the endpoint config. It use the class fields for the variant parameters.
 
         Parameters:
             model_name: name of the sagemaker model resource the sagemaker endpoint would use
 
         Returns:
-            CfnEndpointConfig: CDK SageMaker CFN Endpoint Config resource
+            ProductionVariantProperty: CDK SageMaker CFN Endpoint Config production variant
         """
 
+        self.validate()
+
+        if self.inference_mode == "serverless":
+            return sagemaker.CfnEndpointConfig.ProductionVariantProperty(
+                initial_variant_weight=self.initial_variant_weight,
+                variant_name=self.variant_name,
+                model_name=model_name,
+                serverless_config=sagemaker.CfnEndpointConfig.ServerlessConfigProperty(
+                    memory_size_in_mb=self.serverless_memory_size,
+                    max_concurrency=self.serverless_max_concurrency,
+                    provisioned_concurrency=self.serverless_provisioned_concurrency,
+                ),
+            )
+
         production_variant = sagemaker.CfnEndpointConfig.ProductionVariantProperty(
             initial_instance_count=self.initial_instance_count,
             initial_variant_weight=self.initial_variant_weight,
@@ -75,6 +137,278 @@ class EndpointConfigProductionVariant(StageYamlDataClassConfig):
 
         return production_variant
 
+    def get_async_inference_config(self, output_path, kms_key_id):
+        """
+        Function to handle creation of the asynchronous inference config of the endpoint config.
+
+        Parameters:
+            output_path: S3 URI of the results of the asynchronous requests
+            kms_key_id: KMS key the results are encrypted with
+
+        Returns:
+            AsyncInferenceConfigProperty: CDK SageMaker CFN Endpoint Config async config, None unless the mode is async
+        """
+
+        if self.inference_mode != "async":
+            return None
+
+        client_config = None
+        if self.async_max_concurrent_invocations_per_instance:
+            client_config = sagemaker.CfnEndpointConfig.AsyncInferenceClientConfigProperty(
+                max_concurrent_invocations_per_instance=self.async_max_concurrent_invocations_per_instance
+            )
+
+        return sagemaker.CfnEndpointConfig.AsyncInferenceConfigProperty(
+            output_config=sagemaker.CfnEndpointConfig.AsyncInferenceOutputConfigProperty(
+                s3_output_path=output_path,
+                kms_key_id=kms_key_id,
+            ),
+            client_config=client_config,
+        )
+
+
+@dataclass
+class ScheduledScalingAction:
+    """
+    Scheduled Scaling Action Dataclass
+    a dataclass to handle mapping yml file configs to a scheduled change of the capacity of an endpoint variant
+    """
+
+    name: str
+    # at(...), rate(...) or cron(...) expression, in UTC unless a time zone is given
+    schedule: str
+    min_capacity: Optional[int] = None
+    max_capacity: Optional[int] = None
+    time_zone: Optional[str] = None
+
+
+@dataclass
+class EndpointAutoscalingConfig(StageYamlDataClassConfig):
+    """
+    Endpoint Autoscaling Config Dataclass
+    a dataclass to handle mapping yml file configs to python class for the autoscaling of the endpoint variant
+    """
+
+    enabled: bool = False
+    min_capacity: int = 1
+    max_capacity: int = 1
+    # invocations: invocations per instance per minute
+    # cpu: average CPU utilization of the instances, in percent of one core
+    # latency: average model latency, in microseconds
+    # backlog: queued requests per instance, of an asynchronous endpoint
+    target_metric: str = "invocations"
+    target_value: float = 100
+    scale_in_cooldown: int = 300
+    scale_out_cooldown: int = 60
+    scheduled_actions: List[ScheduledScalingAction] = field(default_factory=list)
+
+    FILE_PATH: Path = create_file_path_field(
+        "autoscaling-config.yml", path_is_absolute=True
+    )
+
+    def validate(
+        self,
+        inference_mode="instance",
+        initial_instance_count=None,
+        scale_to_zero=False,
+    ):
+        if inference_mode == "serverless":
+            raise ValueError(
+                "Serverless endpoints scale with their requests, disable the autoscaling of the stage"
+            )
+        if not 1 <= self.min_capacity <= self.max_capacity:
+            raise ValueError(
+                f"Autoscaling capacity must be 1 <= min_capacity <= max_capacity, got {self.min_capacity} and {self.max_capacity}"
+            )
+        # the variant would be resized as soon as it is registered, or fail to register
+        if initial_instance_count is not None and not (
+            self.min_capacity <= initial_instance_count <= self.max_capacity
+        ):
+            raise ValueError(
+                f"initial_instance_count must be between min_capacity and max_capacity, got {initial_instance_count} not in [{self.min_capacity}, {self.max_capacity}]"
+            )
+        if (
+            self.target_metric != "invocations"
+            and self.target_metric not in TARGET_METRICS
+        ):
+            raise ValueError(
+                f"Unknown autoscaling target_metric {self.target_metric}, use one of invocations, {', '.join(TARGET_METRICS)}"
+            )
+        # the other metrics have no data without instances, the variant would only scale out
+        if scale_to_zero and self.target_metric != "backlog":
+            raise ValueError(
+                f"async_scale_to_zero requires the backlog autoscaling target_metric, got {self.target_metric}"
+            )
+
+    def get_target_tracking_configuration(self, endpoint_name, variant_name):
+        """
+        Function to handle creation of the target tracking configuration of the scaling policy.
+
+        Parameters:
+            endpoint_name: name of the sagemaker endpoint
+            variant_name: name of the production variant of the endpoint
+
+        Returns:
+            TargetTrackingScalingPolicyConfigurationProperty: CDK Application Auto Scaling target tracking configuration
+        """
+
+        predefined_metric = None
+        customized_metric = None
+        if self.target_metric == "invocations":
+            predefined_metric = (
+                appscaling.CfnScalingPolicy.PredefinedMetricSpecificationProperty(
+                    predefined_metric_type="SageMakerVariantInvocationsPerInstance"
+                )
+            )
+        else:
+            metric_name, namespace, dimension_names = TARGET_METRICS[self.target_metric]
+            dimensions = {"EndpointName": endpoint_name, "VariantName": variant_name}
+            customized_metric = (
+                appscaling.CfnScalingPolicy.CustomizedMetricSpecificationProperty(
+                    metric_name=metric_name,
+                    namespace=namespace,
+                    statistic="Average",
+                    dimensions=[
+                        appscaling.CfnScalingPolicy.MetricDimensionProperty(
+                            name=name, value=dimensions[name]
+                        )
+                        for name in dimension_names
+                    ],
+                )
+            )
+
+        return appscaling.CfnScalingPolicy.TargetTrackingScalingPolicyConfigurationProperty(
+            target_value=self.target_value,
+            predefined_metric_specification=predefined_metric,
+            customized_metric_specification=customized_metric,
+            scale_in_cooldown=self.scale_in_cooldown,
+            scale_out_cooldown=self.scale_out_cooldown,
+        )
+
+    def get_scheduled_actions(self):
+        return [
+            appscaling.CfnScalableTarget.ScheduledActionProperty(
+                scheduled_action_name=action.name,
+                schedule=action.schedule,
+                timezone=action.time_zone,
+                scalable_target_action=appscaling.CfnScalableTarget.ScalableTargetActionProperty(
+                    min_capacity=action.min_capacity,
+                    max_capacity=action.max_capacity,
+                ),
+            )
+            for action in self.scheduled_actions
+        ]
+
+    def add_autoscaling(
+        self,
+        scope,
+        endpoint,
+        variant_name,
+        inference_mode="instance",
+        scale_to_zero=False,
+        initial_instance_count=None,
+    ):
+        """
+        Function to handle creation of the Application Auto Scaling resources of an endpoint variant.
+
+        Parameters:
+            scope: construct the resources are created in
+            endpoint: sagemaker endpoint resource whose variant is scaled
+            variant_name: name of the production variant of the endpoint
+            inference_mode: inference mode of the endpoint variant
+            scale_to_zero: whether an asynchronous endpoint scales in to zero instances
+            initial_instance_count: number of instances the variant is created with, checked against the capacity
+
+        Returns:
+            CfnScalableTarget: CDK Application Auto Scaling CFN Scalable Target resource, None if autoscaling is disabled
+        """
+
+        if not self.enabled:
+            if scale_to_zero:
+                raise ValueError(
+                    "async_scale_to_zero requires the autoscaling of the stage to be enabled"
+                )
+            return None
+        self.validate(inference_mode, initial_instance_count, scale_to_zero)
+
+        # registered without a role, so the service-linked role of Application Auto Scaling is used
+        scalable_target = appscaling.CfnScalableTarget(
+            scope,
+            "EndpointScalableTarget",
+            service_namespace="sagemaker",
+            resource_id=f"endpoint/{endpoint.attr_endpoint_name}/variant/{variant_name}",
+            scalable_dimension="sagemaker:variant:DesiredInstanceCount",
+            min_capacity=0 if scale_to_zero else self.min_capacity,
+            max_capacity=self.max_capacity,
+            scheduled_actions=self.get_scheduled_actions() or None,
+        )
+        scalable_target.add_dependency(endpoint)
+
+        if scale_to_zero:
+            self.add_scale_out_from_zero(scope, scalable_target, endpoint)
+
+        appscaling.CfnScalingPolicy(
+            scope,
+            "EndpointScalingPolicy",
+            policy_name=f"{self.target_metric}-target-tracking",
+            policy_type="TargetTrackingScaling",
+            scaling_target_id=scalable_target.ref,
+            target_tracking_scaling_policy_configuration=self.get_target_tracking_configuration(
+                endpoint.attr_endpoint_name, variant_name
+            ),
+        )
+
+        return scalable_target
+
+    def add_scale_out_from_zero(self, scope, scalable_target, endpoint):
+        """
+        Function to handle creation of the step scaling policy adding an instance to an asynchronous endpoint
+        scaled in to zero instances when requests are queued. Target tracking policies do not scale out from zero.
+
+        Parameters:
+            scope: construct the resources are created in
+            scalable_target: scalable target of the endpoint variant
+            endpoint: sagemaker endpoint resource whose variant is scaled
+        """
+
+        scale_out_policy = appscaling.CfnScalingPolicy(
+            scope,
+            "EndpointScaleOutFromZeroPolicy",
+            policy_name="backlog-without-capacity-step-scaling",
+            policy_type="StepScaling",
+            scaling_target_id=scalable_target.ref,
+            step_scaling_policy_configuration=appscaling.CfnScalingPolicy.StepScalingPolicyConfigurationProperty(
+                adjustment_type="ChangeInCapacity",
+                metric_aggregation_type="Average",
+                cooldown=self.scale_out_cooldown,
+                step_adjustments=[
+                    appscaling.CfnScalingPolicy.StepAdjustmentProperty(
+                        metric_interval_lower_bound=0, scaling_adjustment=1
+                    )
+                ],
+            ),
+        )
+
+        cloudwatch.CfnAlarm(
+            scope,
+            "EndpointBacklogWithoutCapacityAlarm",
+            alarm_description="Requests are queued on the asynchronous endpoint without any instance",
+            namespace="AWS/SageMaker",
+            metric_name="HasBacklogWithoutCapacity",
+            dimensions=[
+                cloudwatch.CfnAlarm.DimensionProperty(
+                    name="EndpointName", value=endpoint.attr_endpoint_name
+                )
+            ],
+            statistic="Average",
+            period=60,
+            evaluation_periods=2,
+            threshold=1,
+            comparison_operator="GreaterThanOrEqualToThreshold",
+            treat_missing_data="missing",
+            alarm_actions=[scale_out_policy.ref],
+        )
+
 
 class DeployEndpointStack(Stack):
     """
@@ -166,37 +500,76 @@ class DeployEndpointStack(Stack):
 
         timestamp = now.strftime("%Y%m%d%H%M%S")
 
-        # get latest approved model package from the model registry (only from a specific model package group)
-        latest_approved_model_package = get_approved_package()
+        endpoint_config_production_variant = EndpointConfigProductionVariant()
+
+        endpoint_config_production_variant.load_for_stack(self)
+
+        inference_mode = endpoint_config_production_variant.inference_mode
+
+        multi_model_artifacts = None
+        if MODEL_PACKAGE_GROUP_NAMES:
+            # latest approved model package of many groups packed behind one multi-model endpoint,
+            # their artifacts staged under a shared prefix and served by a single container
+            if inference_mode != "instance":
+                raise ValueError(
+                    "Multi-model endpoints are backed by instances, use the instance inference_mode"
+                )
+            multi_model_artifacts = get_multi_model_artifacts(
+                tuple(MODEL_PACKAGE_GROUP_NAMES), MODEL_STAGING_BUCKET
+            )
+            model_execution_policy.add_statements(
+                iam.PolicyStatement(
+                    actions=["s3:GetObject", "s3:ListBucket"],
+                    effect=iam.Effect.ALLOW,
+                    resources=[
+                        f"arn:aws:s3:::{MODEL_STAGING_BUCKET}",
+                        f"arn:aws:s3:::{MODEL_STAGING_BUCKET}/{MULTI_MODEL_PREFIX}/*",
+                    ],
+                )
+            )
+            name_prefix = f"{PROJECT_NAME}-mme"
+            container = sagemaker.CfnModel.ContainerDefinitionProperty(
+                image=multi_model_artifacts.image,
+                mode="MultiModel",
+                model_data_url=multi_model_artifacts.model_data_url,
+                environment=multi_model_artifacts.environment or None,
+            )
+        else:
+            # get latest approved model package from the model registry (only from a specific model package group)
+            # prefer the replica of the model package in the region of the endpoint
+            latest_approved_model_package = get_regional_package(
+                get_approved_package(), self.region
+            )
+            name_prefix = MODEL_PACKAGE_GROUP_NAME
+            container = sagemaker.CfnModel.ContainerDefinitionProperty(
+                model_package_name=latest_approved_model_package
+            )
 
         # Sagemaker Model
-        model_name = f"{MODEL_PACKAGE_GROUP_NAME}-{timestamp}"
+        model_name = f"{name_prefix}-{timestamp}"
 
         model = sagemaker.CfnModel(
             self,
             "Model",
             execution_role_arn=model_execution_role.role_arn,
             model_name=model_name,
-            containers=[
-                sagemaker.CfnModel.ContainerDefinitionProperty(
-                    model_package_name=latest_approved_model_package
+            containers=[container],
+            # serverless endpoints do not run in a VPC
+            vpc_config=(
+                sagemaker.CfnModel.VpcConfigProperty(
+                    security_group_ids=[sg_id],
+                    subnets=app_subnet_ids,
                 )
-            ],
-            vpc_config=sagemaker.CfnModel.VpcConfigProperty(
-                security_group_ids=[sg_id],
-                subnets=app_subnet_ids,
+                if inference_mode != "serverless"
+                else None
             ),
         )
 
         # Sagemaker Endpoint Config
-        endpoint_config_name = f"{MODEL_PACKAGE_GROUP_NAME}-ec-{timestamp}"
+        endpoint_config_name = f"{name_prefix}-ec-{timestamp}"
         if len(endpoint_config_name) > 63:
             endpoint_config_name = endpoint_config_name[:62]
 
-        endpoint_config_production_variant = EndpointConfigProductionVariant()
-
-        endpoint_config_production_variant.load_for_stack(self)
-
         # create kms key to be used by the assets bucket
         kms_key = kms.Key(
             self,
@@ -215,22 +588,43 @@ class DeployEndpointStack(Stack):
             ),
         )
 
+        # results of the asynchronous requests
+        async_output_path = endpoint_config_production_variant.async_output_path
+        if inference_mode == "async":
+            # the results are encrypted with the key of the stack, in any bucket
+            kms_key.grant_encrypt_decrypt(model_execution_role)
+        if inference_mode == "async" and not async_output_path:
+            async_output_bucket = s3.Bucket(
+                self,
+                "AsyncInferenceOutputBucket",
+                encryption=s3.BucketEncryption.KMS,
+                encryption_key=kms_key,
+                block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+                enforce_ssl=True,
+            )
+            async_output_bucket.grant_read_write(model_execution_role)
+            async_output_path = async_output_bucket.s3_url_for_object("output")
+
         endpoint_config = sagemaker.CfnEndpointConfig(
             self,
             "EndpointConfig",
             endpoint_config_name=endpoint_config_name,
-            kms_key_id=kms_key.key_id,
+            # serverless endpoints have no storage volume to encrypt
+            kms_key_id=kms_key.key_id if inference_mode != "serverless" else None,
             production_variants=[
                 endpoint_config_production_variant.get_endpoint_config_production_variant(
                     model.model_name
                 )
             ],
+            async_inference_config=endpoint_config_production_variant.get_async_inference_config(
+                async_output_path, kms_key.key_arn
+            ),
         )
 
         endpoint_config.add_depends_on(model)
 
         # Sagemaker Endpoint
-        endpoint_name = f"{MODEL_PACKAGE_GROUP_NAME}-e"
+        endpoint_name = f"{name_prefix}-e"
 
         endpoint = sagemaker.CfnEndpoint(
             self,
@@ -241,4 +635,34 @@ class DeployEndpointStack(Stack):
 
         endpoint.add_depends_on(endpoint_config)
 
+        if multi_model_artifacts:
+            # routes of the model package groups, read by the MultiModelRouter of the callers
+            ssm.StringParameter(
+                self,
+                "TargetModelsParameter",
+                parameter_name=target_models_parameter(PROJECT_NAME),
+                string_value=json.dumps(
+                    {
+                        "EndpointName": endpoint_name,
+                        "TargetModels": multi_model_artifacts.target_models,
+                    }
+                ),
+                # the routes of dozens of groups can exceed a standard parameter
+                tier=ssm.ParameterTier.INTELLIGENT_TIERING,
+            )
+
+        # Application Auto Scaling of the endpoint variant, disabled unless configured for the stage
+        endpoint_autoscaling = EndpointAutoscalingConfig()
+
+        endpoint_autoscaling.load_for_stack(self)
+
+        endpoint_autoscaling.add_autoscaling(
+            self,
+            endpoint,
+            endpoint_config_production_variant.variant_name,
+            inference_mode=inference_mode,
+            scale_to_zero=endpoint_config_production_variant.async_scale_to_zero,
+            initial_instance_count=endpoint_config_production_variant.initial_instance_count,
+        )
+
         self.endpoint = endpoint
@@ -15,16 +15,46 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import json
+import time
+from functools import lru_cache
+
 import boto3
 from botocore.exceptions import ClientError
 from logging import Logger
-from config.constants import DEFAULT_DEPLOYMENT_REGION, MODEL_PACKAGE_GROUP_NAME
+from config.constants import (
+    ARTIFACT_WAIT_SECONDS,
+    DEFAULT_DEPLOYMENT_REGION,
+    MODEL_PACKAGE_GROUP_NAME,
+    PROJECT_NAME,
+)
 
 """Initialise Logger class"""
 logger = Logger(name="deploy_stack")
 
+"""Interval between two checks of the artifacts of a model package being replicated"""
+ARTIFACT_POLL_SECONDS = 15
+
 """Initialise boto3 SDK resources"""
 sm_client = boto3.client("sagemaker", region_name=DEFAULT_DEPLOYMENT_REGION)
+ssm_client = boto3.client("ssm", region_name=DEFAULT_DEPLOYMENT_REGION)
+
+
+@lru_cache(maxsize=None)
+def get_approved_package_pointer():
+    """Gets the latest approved model package from the pointer of the project.
+    The pointer is kept in the /mlops/<project name>/model/latest_approved SSM parameter
+    by the approval events of the model package group, with the ArtifactStatus and the
+    replicas of the package, so it is read in a single call however many packages the
+    group has, and once per synth.
+    Returns:
+        The value of the pointer, or None if the project has no pointer yet.
+    """
+    try:
+        parameter = ssm_client.get_parameter(Name=f"/mlops/{PROJECT_NAME}/model/latest_approved")
+    except ssm_client.exceptions.ParameterNotFound:
+        return None
+    return json.loads(parameter["Parameter"]["Value"])
 
 
 def get_approved_package():
@@ -32,12 +62,44 @@ def get_approved_package():
     Returns:
         The SageMaker Model Package ARN.
     """
+    if pointer := get_approved_package_pointer():
+        model_package_arn = pointer["ModelPackageArn"]
+        logger.info(f"Identified the latest approved model package from the pointer: {model_package_arn}")
+        # pointers written before the ArtifactStatus was recorded are checked in the registry
+        if pointer.get("ArtifactStatus") != "Available":
+            check_artifacts_available(model_package_arn)
+        return model_package_arn
+    # No pointer yet, get the latest approved model package from the registry
+    return get_latest_approved_package(MODEL_PACKAGE_GROUP_NAME)
+
+
+def get_approved_packages(model_package_group_names):
+    """Gets the latest approved model package of each of the model package groups of a multi-model endpoint.
+    The pointer of the project references a single group, so the registry is listed for each group.
+    Args:
+        model_package_group_names: The names of the model package groups.
+    Returns:
+        The SageMaker Model Package ARN, keyed on the name of its group.
+    """
+    return {
+        model_package_group_name: get_latest_approved_package(model_package_group_name)
+        for model_package_group_name in model_package_group_names
+    }
+
+
+def get_latest_approved_package(model_package_group_name):
+    """Gets the latest approved model package of a model package group from the registry.
+    Args:
+        model_package_group_name: The name of the model package group.
+    Returns:
+        The SageMaker Model Package ARN.
+    """
     try:
-        # Get the latest approved model package
         response = sm_client.list_model_packages(
-            ModelPackageGroupName=MODEL_PACKAGE_GROUP_NAME,
+            ModelPackageGroupName=model_package_group_name,
             ModelApprovalStatus="Approved",
             SortBy="CreationTime",
+            SortOrder="Descending",
             MaxResults=100,
         )
         approved_packages = response["ModelPackageSummaryList"]
@@ -45,23 +107,92 @@ def get_approved_package():
         while len(approved_packages) == 0 and "NextToken" in response:
             logger.debug(f"Getting more packages for token: {response['NextToken']}")
             response = sm_client.list_model_packages(
-                ModelPackageGroupName=MODEL_PACKAGE_GROUP_NAME,
+                ModelPackageGroupName=model_package_group_name,
                 ModelApprovalStatus="Approved",
                 SortBy="CreationTime",
+                SortOrder="Descending",
                 MaxResults=100,
                 NextToken=response["NextToken"],
             )
             approved_packages.extend(response["ModelPackageSummaryList"])
         # Return error if no packages found
         if len(approved_packages) == 0:
-            error_message = f"No approved ModelPackage found for ModelPackageGroup: {MODEL_PACKAGE_GROUP_NAME}"
+            error_message = f"No approved ModelPackage found for ModelPackageGroup: {model_package_group_name}"
             logger.error(error_message)
             raise Exception(error_message)
         # Return the model package arn
         model_package_arn = approved_packages[0]["ModelPackageArn"]
         logger.info(f"Identified the latest approved model package: {model_package_arn}")
+        check_artifacts_available(model_package_arn)
         return model_package_arn
     except ClientError as e:
         error_message = e.response["Error"]["Message"]
         logger.error(error_message)
         raise Exception(error_message)
+
+
+def check_artifacts_available(model_package_arn):
+    """Waits for the artifacts of a model package to be available.
+    Model packages synced to the central registry with deferred replication are
+    registered before their artifacts are copied, with the ArtifactStatus metadata
+    property set to Pending until the copy completes. The copy is started by the
+    sync function, right after the registration in the background mode, or when
+    the central package is approved in the on-demand mode. The synth does not start
+    it: it waits up to ARTIFACT_WAIT_SECONDS for the copy to complete, then fails
+    with a hint to retry the deployment, so it never holds the pipeline for long.
+    Args:
+        model_package_arn: The SageMaker Model Package ARN.
+    """
+    deadline = time.monotonic() + ARTIFACT_WAIT_SECONDS
+    while get_artifact_status(model_package_arn) == "Pending":
+        if time.monotonic() >= deadline:
+            error_message = (
+                f"Artifacts of {model_package_arn} are still being replicated after {ARTIFACT_WAIT_SECONDS} seconds, "
+                "retry the deployment once their ArtifactStatus is Available"
+            )
+            logger.error(error_message)
+            raise Exception(error_message)
+        logger.info(f"Waiting for the artifacts of {model_package_arn} to be replicated")
+        time.sleep(ARTIFACT_POLL_SECONDS)
+
+
+def get_artifact_status(model_package_arn):
+    """Gets the ArtifactStatus of a model package, Available unless it was synced with deferred replication.
+    Args:
+        model_package_arn: The SageMaker Model Package ARN.
+    Returns:
+        Pending or Available.
+    """
+    metadata = sm_client.describe_model_package(ModelPackageName=model_package_arn).get(
+        "CustomerMetadataProperties", {}
+    )
+    return metadata.get("ArtifactStatus", "Available")
+
+
+def get_regional_package(model_package_arn, region):
+    """Gets the replica of a model package in the region of a deployment.
+    Model packages synced to the central registry can be replicated to other
+    regions, with the ARN of each replica recorded in the ReplicaArn.<region>
+    metadata property. Deployments use the replica of their region when there is
+    one, so the model data is read from the same region. The replicas of the package
+    of the pointer are read from the pointer.
+    Args:
+        model_package_arn: The SageMaker Model Package ARN.
+        region: The region of the deployment.
+    Returns:
+        The SageMaker Model Package ARN of the replica, or the given ARN.
+    """
+    if model_package_arn.split(":")[3] == region:
+        return model_package_arn
+    pointer = get_approved_package_pointer()
+    if pointer and pointer["ModelPackageArn"] == model_package_arn and "ReplicaArns" in pointer:
+        replica_arn = pointer["ReplicaArns"].get(region)
+    else:
+        metadata = sm_client.describe_model_package(ModelPackageName=model_package_arn).get(
+            "CustomerMetadataProperties", {}
+        )
+        replica_arn = metadata.get(f"ReplicaArn.{region}")
+    if replica_arn:
+        logger.info(f"Using the replica {replica_arn} of {model_package_arn} in {region}")
+        return replica_arn
+    return model_package_arn
@@ -0,0 +1,132 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+from .get_approved_package import get_approved_packages, logger, sm_client
+
+# prefix of the artifacts of the multi-model endpoints in the staging bucket
+MULTI_MODEL_PREFIX = "multi-model"
+
+
+@dataclass
+class MultiModelArtifacts:
+    """
+    Multi Model Artifacts Dataclass
+    a dataclass to handle the container and the staged artifacts of a multi-model endpoint
+    """
+
+    image: str
+    environment: Dict[str, str]
+    # S3 prefix of the artifacts, the ModelDataUrl of the multi-model container
+    model_data_url: str
+    # TargetModel of the latest approved model package of each group, relative to model_data_url
+    target_models: Dict[str, str]
+
+
+def split_s3_uri(s3_uri: str) -> Tuple[str, str]:
+    bucket, _, key = s3_uri.removeprefix("s3://").partition("/")
+    return bucket, key
+
+
+def get_container(model_package: dict) -> dict:
+    """Gets the container of a model package packed behind a multi-model endpoint.
+    Args:
+        model_package: The model package, as returned by DescribeModelPackage.
+    Returns:
+        The inference container of the model package.
+    """
+    containers = model_package["InferenceSpecification"]["Containers"]
+    if len(containers) != 1 or not containers[0].get("ModelDataUrl", "").endswith(".tar.gz"):
+        raise ValueError(
+            f"{model_package['ModelPackageArn']} must have a single container with a model.tar.gz artifact "
+            "to be served by a multi-model endpoint"
+        )
+    return containers[0]
+
+
+def get_target_model(model_package: dict) -> str:
+    # versioned, as the endpoint keeps serving a model it loaded until the model is evicted
+    return f"{model_package['ModelPackageGroupName']}/{model_package['ModelPackageVersion']}/model.tar.gz"
+
+
+def stage_model_artifacts(
+    model_packages: List[dict], bucket: str, prefix: str = MULTI_MODEL_PREFIX, s3_client=None
+) -> MultiModelArtifacts:
+    """Stages the artifacts of model packages under the shared prefix of a multi-model endpoint.
+    The packages are served by a single container, so they must all use the same image and environment.
+    Artifacts already staged by a previous synth are not copied again.
+    Args:
+        model_packages: The model packages, as returned by DescribeModelPackage.
+        bucket: The name of the staging bucket.
+        prefix: The prefix of the artifacts in the staging bucket.
+        s3_client: The boto3 S3 client, created if not given.
+    Returns:
+        The container and the staged artifacts of the multi-model endpoint.
+    """
+    s3_client = s3_client or boto3.client("s3")
+    containers = [get_container(model_package) for model_package in model_packages]
+    images = {container["Image"] for container in containers}
+    environments = {tuple(sorted(container.get("Environment", {}).items())) for container in containers}
+    if len(images) != 1 or len(environments) != 1:
+        raise ValueError(
+            f"The model packages use {len(images)} images and {len(environments)} environments, "
+            "a multi-model endpoint serves them with a single container"
+        )
+
+    target_models = {}
+    for model_package, container in zip(model_packages, containers):
+        target_model = get_target_model(model_package)
+        key = f"{prefix}/{target_model}"
+        try:
+            s3_client.head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("404", "NoSuchKey"):
+                raise
+            source_bucket, source_key = split_s3_uri(container["ModelDataUrl"])
+            logger.info(f"Staging {container['ModelDataUrl']} to s3://{bucket}/{key}")
+            s3_client.copy({"Bucket": source_bucket, "Key": source_key}, bucket, key)
+        target_models[model_package["ModelPackageGroupName"]] = target_model
+
+    return MultiModelArtifacts(
+        image=images.pop(),
+        environment=containers[0].get("Environment", {}),
+        model_data_url=f"s3://{bucket}/{prefix}/",
+        target_models=target_models,
+    )
+
+
+@lru_cache
+def get_multi_model_artifacts(model_package_group_names: Tuple[str, ...], bucket: str) -> MultiModelArtifacts:
+    """Stages the latest approved model package of each group for a multi-model endpoint.
+    Cached, so the stacks of the stages synthesized together deploy the same versions.
+    Args:
+        model_package_group_names: The names of the model package groups.
+        bucket: The name of the staging bucket.
+    Returns:
+        The container and the staged artifacts of the multi-model endpoint.
+    """
+    model_packages = [
+        sm_client.describe_model_package(ModelPackageName=model_package_arn)
+        for model_package_arn in get_approved_packages(model_package_group_names).values()
+    ]
+    return stage_model_artifacts(model_packages, bucket)
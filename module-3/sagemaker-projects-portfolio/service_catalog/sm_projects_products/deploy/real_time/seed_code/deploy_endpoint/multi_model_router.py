@@ -0,0 +1,88 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+import boto3
+
+# written by the deploy stack in each account with the routes of the multi-model endpoint of the project
+TARGET_MODELS_PARAMETER = "/mlops/{project_name}/endpoint/target_models"
+
+
+def target_models_parameter(project_name: str) -> str:
+    return TARGET_MODELS_PARAMETER.format(project_name=project_name)
+
+
+class MultiModelRouter:
+    """
+    Multi Model Router
+    Routes the requests for a model package group to its latest approved model package on the multi-model
+    endpoint of a project. The routes are read from SSM, and reloaded after ttl seconds to follow the
+    deployments of new versions.
+
+    Example:
+        router = MultiModelRouter("my-project")
+        response = router.invoke("bank-marketing", body="1,2,3")
+    """
+
+    def __init__(self, project_name: str, ttl: int = 300, ssm_client=None, sagemaker_runtime_client=None):
+        self.project_name = project_name
+        self.ttl = ttl
+        self.ssm_client = ssm_client or boto3.client("ssm")
+        self.sagemaker_runtime_client = sagemaker_runtime_client or boto3.client("sagemaker-runtime")
+        self._routes: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+
+    def get_routes(self) -> Dict[str, Any]:
+        if self._routes is None or time.monotonic() - self._loaded_at >= self.ttl:
+            parameter = self.ssm_client.get_parameter(Name=target_models_parameter(self.project_name))
+            self._routes = json.loads(parameter["Parameter"]["Value"])
+            self._loaded_at = time.monotonic()
+        return self._routes
+
+    @property
+    def endpoint_name(self) -> str:
+        return self.get_routes()["EndpointName"]
+
+    def get_target_model(self, model_package_group_name: str) -> str:
+        target_models = self.get_routes()["TargetModels"]
+        if model_package_group_name not in target_models:
+            raise KeyError(
+                f"{model_package_group_name} is not deployed on the multi-model endpoint {self.endpoint_name}, "
+                f"use one of {', '.join(target_models)}"
+            )
+        return target_models[model_package_group_name]
+
+    def invoke(self, model_package_group_name: str, body, content_type: str = "text/csv", **kwargs) -> Dict[str, Any]:
+        """Invokes the model of a model package group on the multi-model endpoint.
+        Args:
+            model_package_group_name: The name of the model package group.
+            body: The payload of the request.
+            content_type: The MIME type of the payload.
+            kwargs: Other arguments of InvokeEndpoint, such as Accept.
+        Returns:
+            The response of InvokeEndpoint.
+        """
+        return self.sagemaker_runtime_client.invoke_endpoint(
+            EndpointName=self.endpoint_name,
+            TargetModel=self.get_target_model(model_package_group_name),
+            ContentType=content_type,
+            Body=body,
+            **kwargs,
+        )
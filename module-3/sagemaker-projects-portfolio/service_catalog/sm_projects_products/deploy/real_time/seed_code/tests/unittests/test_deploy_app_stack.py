@@ -18,15 +18,24 @@
 import aws_cdk as core
 import aws_cdk.assertions as assertions
 
+import deploy_endpoint.deploy_endpoint_stack as deploy_endpoint_stack
 from deploy_endpoint.deploy_endpoint_stack import DeployEndpointStack
 
+MODEL_PACKAGE_ARN = "arn:aws:sagemaker:eu-west-1:111111111111:model-package/models/1"
+
+
 # example tests. To run these tests, uncomment this file along with the example
 # resource in deploy_app/deploy_app_stack.py
-def test_sqs_queue_created():
+def test_sqs_queue_created(monkeypatch):
+    # the model package is resolved from the model registry, without access to SageMaker
+    monkeypatch.setattr(deploy_endpoint_stack, "get_approved_package", lambda: MODEL_PACKAGE_ARN)
+    monkeypatch.setattr(deploy_endpoint_stack, "get_regional_package", lambda arn, region: arn)
     app = core.App()
     stack = DeployEndpointStack(app, "deploy-app")
     template = assertions.Template.from_stack(stack)
 
+    template.has_resource_properties("AWS::SageMaker::Model", {"Containers": [{"ModelPackageName": MODEL_PACKAGE_ARN}]})
+
 
 #     template.has_resource_properties("AWS::SQS::Queue", {
 #         "VisibilityTimeout": 300
@@ -0,0 +1,97 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+from aws_cdk import aws_sagemaker as sagemaker
+
+from deploy_endpoint.deploy_endpoint_stack import EndpointAutoscalingConfig
+
+
+def synth_autoscaling(stack_name, initial_instance_count=None, **config):
+    app = core.App()
+    stack = core.Stack(app, stack_name)
+    endpoint = sagemaker.CfnEndpoint(stack, "Endpoint", endpoint_config_name="endpoint-config")
+    endpoint_autoscaling = EndpointAutoscalingConfig()
+    endpoint_autoscaling.load_for_stack(stack)
+    for name, value in config.items():
+        setattr(endpoint_autoscaling, name, value)
+    endpoint_autoscaling.add_autoscaling(stack, endpoint, "AllTraffic", initial_instance_count=initial_instance_count)
+    return assertions.Template.from_stack(stack)
+
+
+def test_prod_endpoint_scales_on_invocations_with_a_schedule():
+    template = synth_autoscaling("prod")
+
+    template.has_resource_properties(
+        "AWS::ApplicationAutoScaling::ScalableTarget",
+        {
+            "ScalableDimension": "sagemaker:variant:DesiredInstanceCount",
+            "MinCapacity": 1,
+            "MaxCapacity": 20,
+            "ScheduledActions": assertions.Match.array_with(
+                [assertions.Match.object_like({"ScheduledActionName": "daily-peak"})]
+            ),
+        },
+    )
+    template.has_resource_properties(
+        "AWS::ApplicationAutoScaling::ScalingPolicy",
+        {
+            "TargetTrackingScalingPolicyConfiguration": {
+                "PredefinedMetricSpecification": {"PredefinedMetricType": "SageMakerVariantInvocationsPerInstance"},
+                "TargetValue": 100,
+                "ScaleInCooldown": 300,
+                "ScaleOutCooldown": 60,
+            }
+        },
+    )
+
+
+def test_endpoint_scales_on_latency():
+    template = synth_autoscaling("prod", target_metric="latency", target_value=200000)
+
+    template.has_resource_properties(
+        "AWS::ApplicationAutoScaling::ScalingPolicy",
+        {
+            "TargetTrackingScalingPolicyConfiguration": assertions.Match.object_like(
+                {
+                    "CustomizedMetricSpecification": assertions.Match.object_like(
+                        {"MetricName": "ModelLatency", "Namespace": "AWS/SageMaker", "Statistic": "Average"}
+                    ),
+                    "TargetValue": 200000,
+                }
+            )
+        },
+    )
+
+
+def test_dev_endpoint_is_not_scaled():
+    template = synth_autoscaling("dev")
+
+    template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 0)
+
+
+def test_invalid_capacity_is_rejected():
+    with pytest.raises(ValueError):
+        synth_autoscaling("prod", min_capacity=4, max_capacity=2)
+
+
+@pytest.mark.parametrize("initial_instance_count", [0, 21])
+def test_initial_instance_count_outside_of_the_capacity_is_rejected(initial_instance_count):
+    with pytest.raises(ValueError, match="initial_instance_count"):
+        synth_autoscaling("prod", initial_instance_count=initial_instance_count)
@@ -0,0 +1,124 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+
+import pytest
+
+import deploy_endpoint.get_approved_package as get_approved_package
+
+MODEL_PACKAGE_ARN = "arn:aws:sagemaker:eu-west-1:111111111111:model-package/models/1"
+REPLICA_ARN = "arn:aws:sagemaker:us-east-1:111111111111:model-package/models/1"
+
+
+class FakeSageMaker:
+    def __init__(self, statuses):
+        # ArtifactStatus returned by each describe, the last one is repeated
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def describe_model_package(self, ModelPackageName):
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        return {"ModelPackageArn": ModelPackageName, "CustomerMetadataProperties": {"ArtifactStatus": status}}
+
+
+class FakeSSM:
+    class exceptions:
+        class ParameterNotFound(Exception):
+            pass
+
+    def __init__(self, pointer):
+        self.pointer = pointer
+        self.calls = 0
+
+    def get_parameter(self, Name):
+        self.calls += 1
+        return {"Parameter": {"Name": Name, "Value": json.dumps(self.pointer)}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(get_approved_package.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(get_approved_package.time, "sleep", clock.sleep)
+    monkeypatch.setattr(get_approved_package, "ARTIFACT_WAIT_SECONDS", 60)
+    return clock
+
+
+@pytest.fixture
+def pointer(monkeypatch):
+    def set_pointer(**value):
+        ssm = FakeSSM({"ModelPackageArn": MODEL_PACKAGE_ARN, "ModelPackageVersion": 1, **value})
+        monkeypatch.setattr(get_approved_package, "ssm_client", ssm)
+        return ssm
+
+    get_approved_package.get_approved_package_pointer.cache_clear()
+    yield set_pointer
+    get_approved_package.get_approved_package_pointer.cache_clear()
+
+
+def test_deployment_reads_only_the_pointer(pointer, monkeypatch):
+    sagemaker = FakeSageMaker(["Pending"])
+    monkeypatch.setattr(get_approved_package, "sm_client", sagemaker)
+    ssm = pointer(ArtifactStatus="Available", ReplicaArns={"us-east-1": REPLICA_ARN})
+
+    model_package_arn = get_approved_package.get_approved_package()
+
+    assert model_package_arn == MODEL_PACKAGE_ARN
+    assert get_approved_package.get_regional_package(model_package_arn, "us-east-1") == REPLICA_ARN
+    assert get_approved_package.get_regional_package(model_package_arn, "eu-central-1") == MODEL_PACKAGE_ARN
+    assert sagemaker.calls == 0
+    assert ssm.calls == 1
+
+
+def test_deployment_waits_for_the_artifacts_pending_in_the_pointer(pointer, clock, monkeypatch):
+    sagemaker = FakeSageMaker(["Pending", "Available"])
+    monkeypatch.setattr(get_approved_package, "sm_client", sagemaker)
+    pointer(ArtifactStatus="Pending", ReplicaArns={})
+
+    assert get_approved_package.get_approved_package() == MODEL_PACKAGE_ARN
+    assert sagemaker.calls == 2
+
+
+def test_deployment_waits_for_the_replication_of_the_artifacts(clock, monkeypatch):
+    sagemaker = FakeSageMaker(["Pending", "Pending", "Available"])
+    monkeypatch.setattr(get_approved_package, "sm_client", sagemaker)
+
+    get_approved_package.check_artifacts_available(MODEL_PACKAGE_ARN)
+
+    assert sagemaker.calls == 3
+    assert clock.now == 2 * get_approved_package.ARTIFACT_POLL_SECONDS
+
+
+def test_deployment_fails_with_a_retry_hint_after_the_wait(clock, monkeypatch):
+    monkeypatch.setattr(get_approved_package, "sm_client", FakeSageMaker(["Pending"]))
+
+    with pytest.raises(Exception, match="retry the deployment"):
+        get_approved_package.check_artifacts_available(MODEL_PACKAGE_ARN)
+    assert clock.now <= 60 + get_approved_package.ARTIFACT_POLL_SECONDS
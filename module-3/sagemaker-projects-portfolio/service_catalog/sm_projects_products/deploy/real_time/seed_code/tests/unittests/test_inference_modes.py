@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+from aws_cdk import aws_sagemaker as sagemaker
+
+from deploy_endpoint.deploy_endpoint_stack import EndpointAutoscalingConfig, EndpointConfigProductionVariant
+
+
+def load_for_stack(config_class, stack, **config):
+    loaded_config = config_class()
+    loaded_config.load_for_stack(stack)
+    for name, value in config.items():
+        setattr(loaded_config, name, value)
+    return loaded_config
+
+
+def synth_endpoint_config(**config):
+    app = core.App()
+    stack = core.Stack(app, "dev")
+    production_variant = load_for_stack(EndpointConfigProductionVariant, stack, **config)
+    sagemaker.CfnEndpointConfig(
+        stack,
+        "EndpointConfig",
+        production_variants=[production_variant.get_endpoint_config_production_variant("model")],
+        async_inference_config=production_variant.get_async_inference_config("s3://bucket/output", "key"),
+    )
+    return assertions.Template.from_stack(stack)
+
+
+def test_serverless_variant_has_no_instances():
+    template = synth_endpoint_config(
+        inference_mode="serverless", serverless_memory_size=4096, serverless_provisioned_concurrency=1
+    )
+
+    template.has_resource_properties(
+        "AWS::SageMaker::EndpointConfig",
+        {
+            "ProductionVariants": [
+                {
+                    "ModelName": "model",
+                    "VariantName": "AllTraffic",
+                    "InitialVariantWeight": 1,
+                    "ServerlessConfig": {"MemorySizeInMB": 4096, "MaxConcurrency": 5, "ProvisionedConcurrency": 1},
+                }
+            ],
+            "AsyncInferenceConfig": assertions.Match.absent(),
+        },
+    )
+
+
+def test_async_endpoint_config_writes_its_results():
+    template = synth_endpoint_config(inference_mode="async", async_max_concurrent_invocations_per_instance=4)
+
+    template.has_resource_properties(
+        "AWS::SageMaker::EndpointConfig",
+        {
+            "ProductionVariants": [assertions.Match.object_like({"InstanceType": "ml.m5.large"})],
+            "AsyncInferenceConfig": {
+                "OutputConfig": {"S3OutputPath": "s3://bucket/output", "KmsKeyId": "key"},
+                "ClientConfig": {"MaxConcurrentInvocationsPerInstance": 4},
+            },
+        },
+    )
+
+
+def test_unknown_inference_mode_is_rejected():
+    with pytest.raises(ValueError):
+        synth_endpoint_config(inference_mode="batch")
+
+
+def test_async_endpoint_scales_out_from_zero():
+    app = core.App()
+    stack = core.Stack(app, "dev")
+    endpoint = sagemaker.CfnEndpoint(stack, "Endpoint", endpoint_config_name="endpoint-config")
+    endpoint_autoscaling = load_for_stack(
+        EndpointAutoscalingConfig, stack, enabled=True, max_capacity=4, target_metric="backlog"
+    )
+
+    endpoint_autoscaling.add_autoscaling(stack, endpoint, "AllTraffic", inference_mode="async", scale_to_zero=True)
+
+    template = assertions.Template.from_stack(stack)
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {"MinCapacity": 0})
+    template.has_resource_properties(
+        "AWS::ApplicationAutoScaling::ScalingPolicy",
+        {
+            "TargetTrackingScalingPolicyConfiguration": assertions.Match.object_like(
+                {
+                    "CustomizedMetricSpecification": assertions.Match.object_like(
+                        {"MetricName": "ApproximateBacklogSizePerInstance"}
+                    )
+                }
+            )
+        },
+    )
+    template.has_resource_properties("AWS::CloudWatch::Alarm", {"MetricName": "HasBacklogWithoutCapacity"})
+
+
+@pytest.mark.parametrize("target_metric", ["invocations", "cpu"])
+def test_scale_to_zero_requires_the_backlog_metric(target_metric):
+    app = core.App()
+    stack = core.Stack(app, "dev")
+    endpoint = sagemaker.CfnEndpoint(stack, "Endpoint", endpoint_config_name="endpoint-config")
+    endpoint_autoscaling = load_for_stack(
+        EndpointAutoscalingConfig, stack, enabled=True, max_capacity=4, target_metric=target_metric
+    )
+
+    with pytest.raises(ValueError, match="backlog"):
+        endpoint_autoscaling.add_autoscaling(stack, endpoint, "AllTraffic", inference_mode="async", scale_to_zero=True)
+
+
+def test_serverless_endpoint_is_not_autoscaled():
+    app = core.App()
+    stack = core.Stack(app, "dev")
+    endpoint = sagemaker.CfnEndpoint(stack, "Endpoint", endpoint_config_name="endpoint-config")
+
+    with pytest.raises(ValueError):
+        load_for_stack(EndpointAutoscalingConfig, stack, enabled=True).add_autoscaling(
+            stack, endpoint, "AllTraffic", inference_mode="serverless"
+        )
@@ -0,0 +1,123 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from deploy_endpoint.multi_model import stage_model_artifacts
+from deploy_endpoint.multi_model_router import MultiModelRouter
+
+XGBOOST_IMAGE = "141502667606.dkr.ecr.eu-west-1.amazonaws.com/sagemaker-xgboost:1.7-1"
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+        self.copies = []
+
+    def head_object(self, Bucket, Key):
+        if f"s3://{Bucket}/{Key}" not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def copy(self, CopySource, Bucket, Key):
+        self.copies.append(f"s3://{Bucket}/{Key}")
+        self.objects.add(f"s3://{Bucket}/{Key}")
+
+
+class FakeSSM:
+    def __init__(self, parameters):
+        self.parameters = parameters
+        self.calls = 0
+
+    def get_parameter(self, Name):
+        self.calls += 1
+        return {"Parameter": {"Name": Name, "Value": self.parameters[Name]}}
+
+
+class FakeSageMakerRuntime:
+    def __init__(self):
+        self.invocations = []
+
+    def invoke_endpoint(self, **kwargs):
+        self.invocations.append(kwargs)
+        return {"Body": "0.5"}
+
+
+def model_package(group, version, image=XGBOOST_IMAGE):
+    return {
+        "ModelPackageArn": f"arn:aws:sagemaker:eu-west-1:111111111111:model-package/{group}/{version}",
+        "ModelPackageGroupName": group,
+        "ModelPackageVersion": version,
+        "InferenceSpecification": {
+            "Containers": [{"Image": image, "ModelDataUrl": f"s3://models/{group}/{version}/output/model.tar.gz"}]
+        },
+    }
+
+
+def test_artifacts_are_staged_under_a_shared_prefix():
+    s3_client = FakeS3({"s3://staging/multi-model/churn/2/model.tar.gz"})
+
+    artifacts = stage_model_artifacts(
+        [model_package("bank-marketing", 3), model_package("churn", 2)], "staging", s3_client=s3_client
+    )
+
+    assert artifacts.image == XGBOOST_IMAGE
+    assert artifacts.model_data_url == "s3://staging/multi-model/"
+    assert artifacts.target_models == {
+        "bank-marketing": "bank-marketing/3/model.tar.gz",
+        "churn": "churn/2/model.tar.gz",
+    }
+    # artifacts staged by a previous synth are not copied again
+    assert s3_client.copies == ["s3://staging/multi-model/bank-marketing/3/model.tar.gz"]
+
+
+def test_packages_of_different_images_are_rejected():
+    with pytest.raises(ValueError, match="single container"):
+        stage_model_artifacts(
+            [model_package("bank-marketing", 3), model_package("churn", 2, image="sklearn")],
+            "staging",
+            s3_client=FakeS3(set()),
+        )
+
+
+def test_router_invokes_the_target_model_of_a_group():
+    ssm_client = FakeSSM(
+        {
+            "/mlops/project/endpoint/target_models": json.dumps(
+                {"EndpointName": "project-mme-e", "TargetModels": {"bank-marketing": "bank-marketing/3/model.tar.gz"}}
+            )
+        }
+    )
+    runtime_client = FakeSageMakerRuntime()
+    router = MultiModelRouter("project", ssm_client=ssm_client, sagemaker_runtime_client=runtime_client)
+
+    router.invoke("bank-marketing", body="1,2,3")
+    router.invoke("bank-marketing", body="4,5,6")
+
+    assert runtime_client.invocations[0] == {
+        "EndpointName": "project-mme-e",
+        "TargetModel": "bank-marketing/3/model.tar.gz",
+        "ContentType": "text/csv",
+        "Body": "1,2,3",
+    }
+    # the routes are reused until they expire
+    assert ssm_client.calls == 1
+    with pytest.raises(KeyError, match="churn is not deployed"):
+        router.invoke("churn", body="1,2,3")
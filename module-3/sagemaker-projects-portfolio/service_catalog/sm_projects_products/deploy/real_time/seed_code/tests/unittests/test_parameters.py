@@ -0,0 +1,122 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# SPDX-License-Identifier: MIT-0
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this
+# software and associated documentation files (the "Software"), to deal in the Software
+# without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+# INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+import time
+from types import SimpleNamespace
+
+from config.parameters import PARAMETERS_OVERRIDE_VARIABLE, load_parameters
+
+
+class FakeSSM:
+    def __init__(self, parameters, page_size=2, region="eu-west-1"):
+        self.parameters = parameters
+        self.page_size = page_size
+        self.calls = 0
+        self.meta = SimpleNamespace(region_name=region)
+
+    def get_paginator(self, operation_name):
+        assert operation_name == "get_parameters_by_path"
+        return self
+
+    def paginate(self, Path, Recursive):
+        self.calls += 1
+        names = sorted(name for name in self.parameters if name.startswith(Path))
+        for i in range(0, len(names), self.page_size):
+            yield {
+                "Parameters": [{"Name": name, "Value": self.parameters[name]} for name in names[i : i + self.page_size]]
+            }
+
+
+class FakeSTS:
+    def __init__(self, account_id="111111111111"):
+        self.account_id = account_id
+
+    def get_caller_identity(self):
+        return {"Account": self.account_id}
+
+
+def test_parameters_are_read_by_path_and_cached(tmp_path, monkeypatch):
+    monkeypatch.delenv(PARAMETERS_OVERRIDE_VARIABLE, raising=False)
+    ssm_client = FakeSSM(
+        {
+            "/mlops/project/dev/account_id": "111111111111",
+            "/mlops/project/dev/region": "eu-west-1",
+            "/mlops/project/prod/account_id": "333333333333",
+            "/mlops/other/dev/account_id": "444444444444",
+        }
+    )
+
+    parameters = load_parameters("project", ssm_client, cache_dir=tmp_path, ttl=60, sts_client=FakeSTS())
+    cached_parameters = load_parameters("project", ssm_client, cache_dir=tmp_path, ttl=60, sts_client=FakeSTS())
+
+    assert parameters == {
+        "dev/account_id": "111111111111",
+        "dev/region": "eu-west-1",
+        "prod/account_id": "333333333333",
+    }
+    assert cached_parameters == parameters
+    assert ssm_client.calls == 1
+
+
+def test_expired_cache_is_refreshed(tmp_path, monkeypatch):
+    monkeypatch.delenv(PARAMETERS_OVERRIDE_VARIABLE, raising=False)
+    ssm_client = FakeSSM({"/mlops/project/dev/region": "eu-west-1"})
+    load_parameters("project", ssm_client, cache_dir=tmp_path, ttl=60, sts_client=FakeSTS())
+    # the cache was written longer than the TTL ago, and the parameter changed since
+    (cache_file,) = tmp_path.iterdir()
+    expired = time.time() - 61
+    os.utime(cache_file, (expired, expired))
+    ssm_client.parameters["/mlops/project/dev/region"] = "us-east-1"
+
+    parameters = load_parameters("project", ssm_client, cache_dir=tmp_path, ttl=60, sts_client=FakeSTS())
+
+    assert parameters == {"dev/region": "us-east-1"}
+    assert ssm_client.calls == 2
+
+
+def test_cache_is_disabled_with_a_zero_ttl(tmp_path, monkeypatch):
+    monkeypatch.delenv(PARAMETERS_OVERRIDE_VARIABLE, raising=False)
+    ssm_client = FakeSSM({"/mlops/project/dev/region": "eu-west-1"})
+
+    load_parameters("project", ssm_client, cache_dir=tmp_path, ttl=0)
+    load_parameters("project", ssm_client, cache_dir=tmp_path, ttl=0)
+
+    assert ssm_client.calls == 2
+    assert not any(tmp_path.iterdir())
+
+
+def test_cache_is_specific_to_the_account_and_region(tmp_path, monkeypatch):
+    monkeypatch.delenv(PARAMETERS_OVERRIDE_VARIABLE, raising=False)
+    dev = FakeSSM({"/mlops/project/dev/account_id": "111111111111"})
+    other_account = FakeSSM({"/mlops/project/dev/account_id": "444444444444"})
+    other_region = FakeSSM({"/mlops/project/dev/account_id": "555555555555"}, region="us-east-1")
+
+    load_parameters("project", dev, cache_dir=tmp_path, ttl=60, sts_client=FakeSTS())
+    parameters = load_parameters(
+        "project", other_account, cache_dir=tmp_path, ttl=60, sts_client=FakeSTS("444444444444")
+    )
+    regional_parameters = load_parameters("project", other_region, cache_dir=tmp_path, ttl=60, sts_client=FakeSTS())
+
+    assert parameters == {"dev/account_id": "444444444444"}
+    assert regional_parameters == {"dev/account_id": "555555555555"}
+
+
+def test_parameters_are_injected_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(PARAMETERS_OVERRIDE_VARIABLE, '{"dev/region": "us-east-1"}')
+
+    assert load_parameters("project", FakeSSM({}), cache_dir=tmp_path) == {"dev/region": "us-east-1"}
@@ -0,0 +1,51 @@
+import json
+import os
+
+import aws_cdk as cdk
+import aws_cdk.assertions as assertions
+from aws_cdk import aws_s3 as s3
+
+from service_catalog.sm_projects_products.deploy.multi_model.multi_model_deploy_product_stack import (
+    MLOpsStack,
+)
+
+
+def test_model_event_rule_matches_every_group_of_the_endpoint():
+    app = cdk.App()
+    portfolio = cdk.Stack(
+        app,
+        "Portfolio",
+        env=cdk.Environment(account="111111111111", region="eu-west-1"),
+    )
+    product = MLOpsStack(
+        portfolio,
+        "MultiModelDeploy",
+        asset_bucket=s3.Bucket(portfolio, "AssetBucket", bucket_name="assets"),
+    )
+    # the template of a product is written as an asset of the portfolio stack
+    assembly = app.synth()
+    with open(os.path.join(assembly.directory, product.template_file)) as f:
+        template = assertions.Template.from_json(json.load(f))
+
+    # the comma-separated parameter is split into the list of groups matched by the rule
+    template.has_resource_properties(
+        "AWS::Events::Rule",
+        {
+            "EventPattern": {
+                "source": ["aws.sagemaker"],
+                "detail-type": ["SageMaker Model Package State Change"],
+                "detail": {
+                    "ModelPackageGroupName": {
+                        "Fn::Split": [
+                            ",",
+                            {"Ref": "SageMakerModelPackageGroupNames"},
+                        ]
+                    },
+                    "ModelApprovalStatus": ["Approved", "Rejected"],
+                },
+            },
+            "Targets": [
+                assertions.Match.object_like({"Arn": assertions.Match.any_value()})
+            ],
+        },
+    )